@@ -0,0 +1,62 @@
+from . import common
+
+
+class EquityAnalytics(object):
+    "Single-ticker analytics over 1 to 35 years of history."
+
+    params = [1, 5, 35]
+    param_names = ["years"]
+
+    def setup(self, years):
+        self.equity = common.equity(years=years)
+        self.index = common.equity("SPY", years=years, seed=1).returns
+        self.equity.returns
+
+    def time_hist_vol(self, years):
+        self.equity.hist_vol(30)
+
+    def time_rolling_hist_vol(self, years):
+        self.equity.rolling_hist_vol(30)
+
+    def time_hist_vol_by_days(self, years):
+        self.equity.hist_vol_by_days()
+
+    def time_vwap(self, years):
+        self.equity.vwap()
+
+    def time_alpha_beta(self, years):
+        # A Series index is not memoized, so this times the regression.
+        self.equity.alpha_beta(self.index)
+
+    def peakmem_rolling_hist_vol(self, years):
+        self.equity.rolling_hist_vol(30)
+
+    def peakmem_hist_vol_by_days(self, years):
+        self.equity.hist_vol_by_days()
+
+
+class AsOfSweep(object):
+    "hist_vol and vwap as of every fifth date, by slicing and by AsOfIndex."
+
+    params = [1, 5, 35]
+    param_names = ["years"]
+    timeout = 600
+
+    def setup(self, years):
+        self.equity = common.equity(years=years)
+        self.equity.asof
+        self.dates = self.equity.returns.index[::5]
+
+    def time_sliced_hist_vol(self, years):
+        for date in self.dates:
+            self.equity.hist_vol(30, date)
+
+    def time_asof_hist_vol(self, years):
+        self.equity.asof.hist_vol(30, self.dates)
+
+    def time_asof_vwap(self, years):
+        self.equity.asof.vwap(self.dates, 30)
+
+    def time_asof_build(self, years):
+        self.equity._cache.invalidate("asof")
+        self.equity.asof
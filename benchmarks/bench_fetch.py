@@ -0,0 +1,75 @@
+from io import StringIO
+
+import requests
+
+from pandas_finance import Equity, EquityUniverse
+from pandas_finance.api import FixedYahooQuotesReader
+from pandas_finance.replay import YahooStandIn
+
+from . import common
+
+
+class QuoteParsing(object):
+    "Parsing quote endpoint responses without any HTTP."
+
+    params = [1, 100, 5000]
+    param_names = ["symbols"]
+
+    def setup(self, symbols):
+        self.payload = common.quote_payload(symbols)
+        self.reader = FixedYahooQuotesReader(
+            ["T0000"], session=requests.Session(), crumb="crumb"
+        )
+
+    def time_read_lines(self, symbols):
+        self.reader._read_lines(StringIO(self.payload))
+
+    def time_read_frame(self, symbols):
+        self.reader._read_frame(StringIO(self.payload))
+
+
+class StandInFetch(object):
+    """Fetch paths end to end against a local Yahoo stand-in.
+
+    Times request building, the HTTP round trip on localhost and parsing,
+    without network noise.
+    """
+
+    params = [1, 100, 1000]
+    param_names = ["tickers"]
+    timeout = 600
+
+    def setup(self, tickers):
+        self.standin = YahooStandIn().start()
+        self.session = self.standin.session()
+        self.tickers = ["T%04d" % i for i in range(tickers)]
+        # Generate the synthetic histories up front so only fetching is timed.
+        for ticker in self.tickers:
+            self.standin.history(ticker)
+
+    def teardown(self, tickers):
+        self.standin.stop()
+
+    def time_universe_quotes(self, tickers):
+        EquityUniverse(self.tickers, session=self.session).quotes
+
+    def peakmem_universe_quotes(self, tickers):
+        EquityUniverse(self.tickers, session=self.session).quotes
+
+
+class StandInEquityFetch(object):
+    "Single-ticker fetch paths against a local Yahoo stand-in."
+
+    def setup(self):
+        self.standin = YahooStandIn().start()
+        self.session = self.standin.session()
+        self.standin.history("AAPL")
+
+    def teardown(self):
+        self.standin.stop()
+
+    def time_trading_data(self):
+        Equity("AAPL", session=self.session).trading_data
+
+    def time_fundamentals(self):
+        Equity("AAPL", session=self.session).fundamentals
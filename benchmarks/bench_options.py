@@ -0,0 +1,35 @@
+import pandas as pd
+
+from . import common
+
+
+class OptionChainFiltering(object):
+    "Splitting a freshly downloaded chain into calls, puts and near strikes."
+
+    params = [[1, 12], [20, 200, 1000]]
+    param_names = ["expiries", "strikes"]
+
+    def setup(self, expiries, strikes):
+        self.data = common.option_chain(expiries, strikes)
+        self.chain = common.equity().options
+        self.chain.underlying._cache.set("quotes", pd.Series({"price": 100.0}))
+        dates = sorted(set(self.data.index.get_level_values("Expiry")))
+        self.chain._pdr._expiry_dates = [d.date() for d in dates]
+        self.chain._pdr.get_all_data = lambda: self.data
+
+    def time_calls_and_puts(self, expiries, strikes):
+        # Reload so the Type split is recomputed rather than served cached.
+        self.chain._load_all_data()
+        self.chain.calls
+        self.chain.puts
+
+    def time_near_calls_and_puts(self, expiries, strikes):
+        self.chain._load_all_data()
+        self.chain.near_calls
+        self.chain.near_puts
+
+    def time_analytics(self, expiries, strikes):
+        self.chain.analytics(valuation_date=common.END_DATE, data=self.data)
+
+    def peakmem_analytics(self, expiries, strikes):
+        self.chain.analytics(valuation_date=common.END_DATE, data=self.data)
@@ -0,0 +1,61 @@
+from . import common
+
+
+class UniverseAnalytics(object):
+    "Panel analytics for 1 to 5,000 tickers over 1 to 35 years."
+
+    params = [[1, 100, 1000, 5000], [1, 10, 35]]
+    param_names = ["tickers", "years"]
+    timeout = 600
+
+    def setup(self, tickers, years):
+        self.universe = common.universe(tickers, years)
+        self.index = common.equity("SPY", years=years, seed=1).returns
+
+    def time_hist_vol(self, tickers, years):
+        self.universe.hist_vol(30)
+
+    def time_rolling_hist_vol(self, tickers, years):
+        self.universe.rolling_hist_vol(30)
+
+    def time_hist_vol_by_days(self, tickers, years):
+        self.universe.hist_vol_by_days()
+
+    def time_vwap(self, tickers, years):
+        self.universe.vwap()
+
+    def time_alpha_beta(self, tickers, years):
+        self.universe.alpha_beta(self.index)
+
+    def peakmem_rolling_hist_vol(self, tickers, years):
+        self.universe.rolling_hist_vol(30)
+
+    def peakmem_alpha_beta(self, tickers, years):
+        self.universe.alpha_beta(self.index)
+
+
+class ParallelUniverseAnalytics(object):
+    "Panel analytics on a process pool, by worker count."
+
+    params = [[1, 2, 4, 8], [1000, 5000]]
+    param_names = ["processes", "tickers"]
+    timeout = 600
+
+    def setup(self, processes, tickers):
+        self.universe = common.universe(tickers, 35)
+        self.index = common.equity("SPY", years=35, seed=1).returns
+        self.pool = self.universe.parallel(processes)
+        # Start the workers before timing.
+        self.pool.hist_vol(30)
+
+    def teardown(self, processes, tickers):
+        self.pool.close()
+
+    def time_rolling_hist_vol(self, processes, tickers):
+        self.pool.rolling_hist_vol(30)
+
+    def time_hist_vol_by_days(self, processes, tickers):
+        self.pool.hist_vol_by_days()
+
+    def time_alpha_beta(self, processes, tickers):
+        self.pool.alpha_beta(self.index)
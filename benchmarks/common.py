@@ -0,0 +1,104 @@
+"""Synthetic inputs shared by the benchmarks.
+
+Nothing here touches the network: histories and chains are generated, and
+the fetch benchmarks talk to a local ``YahooStandIn``.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import requests
+
+from pandas_finance import Equity, EquityUniverse, pricing
+
+TRADING_DAYS = 252
+END_DATE = "2024-12-31"
+
+
+def history(years, seed=0):
+    "Daily bars shaped like ``yf.Ticker.history`` output, ending on END_DATE."
+    days = int(years * TRADING_DAYS)
+    rng = np.random.RandomState(seed)
+    index = pd.bdate_range(end=END_DATE, periods=days, name="Date")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Close": close,
+            "Adj Close": close,
+            "Volume": rng.randint(1000000, 5000000, days).astype(float),
+            "Dividends": 0.0,
+            "Stock Splits": 0.0,
+        },
+        index=index,
+    )
+
+
+def equity(ticker="AAPL", years=10, seed=0):
+    "An Equity whose history is already loaded and never expires."
+    result = Equity(ticker, session=requests.Session(), ttl=None, crumb="crumb")
+    # Quotes set by a benchmark must not expire mid-run either.
+    result._cache.ttls.clear()
+    result._prime_history(history(years, seed))
+    return result
+
+
+def universe(tickers, years):
+    "An EquityUniverse with returns, close and volume panels already loaded."
+    days = int(years * TRADING_DAYS)
+    symbols = ["T%04d" % i for i in range(tickers)]
+    rng = np.random.RandomState(0)
+    index = pd.bdate_range(end=END_DATE, periods=days, name="Date")
+    returns = rng.normal(0, 0.02, (days, tickers))
+    close = 100 * np.exp(np.cumsum(returns, axis=0))
+    volume = rng.randint(1000000, 5000000, (days, tickers)).astype(float)
+    result = EquityUniverse(symbols, session=requests.Session(), crumb="crumb")
+    for key, values in (("returns", returns), ("close", close), ("volume", volume)):
+        result._cache.set(key, pd.DataFrame(values, index=index, columns=symbols))
+    return result
+
+
+def option_chain(expiries, strikes, price=100.0, vol=0.3):
+    "Chain frame shaped like ``OptionChain.all_data``."
+    dates = pd.date_range(END_DATE, periods=expiries + 1, freq="WOM-3FRI")[1:]
+    strike = np.linspace(price * 0.5, price * 1.5, strikes)
+    index = pd.MultiIndex.from_product(
+        [strike, dates, ["calls", "puts"]], names=["Strike", "Expiry", "Type"]
+    )
+    tenor = pricing.tenors(index.get_level_values("Expiry"), END_DATE)
+    is_call = index.get_level_values("Type") == "calls"
+    last = pricing.black_scholes(
+        price, index.get_level_values("Strike"), tenor, vol, is_call=is_call
+    )
+    symbol = [
+        "AAPL%s%s%08d" % (e.strftime("%y%m%d"), t[0].upper(), k * 1000)
+        for k, e, t in index
+    ]
+    index = pd.MultiIndex.from_arrays(
+        [index.get_level_values(i) for i in range(3)] + [symbol],
+        names=["Strike", "Expiry", "Type", "Symbol"],
+    )
+    return pd.DataFrame(
+        {"Last": last, "Bid": last - 0.05, "Ask": last + 0.05, "Vol": 10.0},
+        index=index,
+    ).sort_index()
+
+
+def quote_payload(symbols):
+    "A v7 quote endpoint response body for ``symbols`` tickers."
+    result = [
+        {
+            "symbol": "T%04d" % i,
+            "regularMarketPrice": 100.0 + i,
+            "marketCap": 1e9,
+            "sharesOutstanding": 1000000,
+            "currency": "USD",
+            "longName": "T%04d Inc." % i,
+            "marketState": "CLOSED",
+        }
+        for i in range(symbols)
+    ]
+    return json.dumps({"quoteResponse": {"result": result, "error": None}})
@@ -1,3 +1,7 @@
 __version__ = version = '0.1.3'
 
 from .api import Equity, Option, OptionChain
+from .snapshot import QuoteSnapshot
+from .store import PriceStore
+from .universe import EquityUniverse
+from . import pricing
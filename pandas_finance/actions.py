@@ -0,0 +1,90 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+DIVIDEND = "DIVIDEND"
+SPLIT = "SPLIT"
+# Trailing window of trailing_annual_dividend.
+DIVIDEND_YEAR = datetime.timedelta(days=365)
+
+
+class CorporateActions(object):
+    """Dividends and splits of one ticker, read from its price history.
+
+    ``history`` is a frame like ``yf.Ticker.history(actions=True)``, whose
+    Dividends and Stock Splits columns are non-zero on ex-dates, so no
+    separate download is needed. ``adjust`` back-adjusts prices for them
+    the way Yahoo computes Adj Close.
+    """
+
+    def __init__(self, history):
+        # Only the last date is kept, so a compact history's index is not.
+        self.last = history.index[-1] if len(history.index) else None
+        self.tz = getattr(history.index, "tz", None)
+        self.dividends = self._events(history, "Dividends", "Dividends")
+        self.splits = self._events(history, "Stock Splits", "Splits")
+
+    @staticmethod
+    def _events(history, column, name):
+        if column not in history.columns:
+            return pd.Series([], index=history.index[:0], dtype=float, name=name)
+        values = history[column].astype(float)
+        return values[values.fillna(0) != 0].rename(name)
+
+    @property
+    def table(self):
+        """Every action as ``action`` (DIVIDEND or SPLIT) and ``value`` columns.
+
+        Newest first, as pandas-datareader's ``get_data_yahoo_actions``.
+        """
+        frames = [
+            pd.DataFrame({"action": action, "value": events})
+            for action, events in ((DIVIDEND, self.dividends), (SPLIT, self.splits))
+        ]
+        table = pd.concat(frames)[["action", "value"]]
+        return table.sort_index(ascending=False, kind="stable")
+
+    def trailing_annual_dividend(self, as_of=None):
+        "Sum of the dividends with ex-dates in the year up to as_of."
+        dividends = self.dividends
+        if as_of is None:
+            end = self.last
+        else:
+            end = pd.Timestamp(as_of)
+            if self.tz is not None and end.tz is None:
+                end = end.tz_localize(self.tz)
+        if end is None:
+            return 0.0
+        window = dividends[
+            (dividends.index > end - DIVIDEND_YEAR) & (dividends.index <= end)
+        ]
+        return float(window.sum())
+
+    def _factors(self, events, close, factor):
+        "Per-row multiplier: the product of factor(event) for later ex-dates."
+        per_row = np.ones(len(close))
+        positions = close.index.get_indexer(events.index)
+        keep = positions > 0
+        # An event on row p adjusts rows before p.
+        rows = positions[keep] - 1
+        factors = factor(events.to_numpy()[keep], rows)
+        # A missing close leaves its event unadjusted rather than NaN-ing history.
+        np.multiply.at(per_row, rows, np.where(np.isnan(factors), 1.0, factors))
+        return np.cumprod(per_row[::-1])[::-1]
+
+    def adjust(self, close, splits=False):
+        """Back-adjusts close for dividends, as Yahoo's Adj Close.
+
+        Yahoo's Close is already split-adjusted; pass ``splits=True`` to
+        adjust raw prices for splits too.
+        """
+        values = close.to_numpy(dtype=float)
+        multiplier = self._factors(
+            self.dividends, close, lambda amounts, rows: 1 - amounts / values[rows]
+        )
+        if splits:
+            multiplier = multiplier * self._factors(
+                self.splits, close, lambda ratios, rows: 1 / ratios
+            )
+        return pd.Series(values * multiplier, index=close.index, name="Adj Close")
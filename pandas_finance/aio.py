@@ -0,0 +1,80 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from .throttle import BACKOFF, HOST_RATE, RETRIES, TokenBucket
+from .universe import EquityUniverse
+
+CONCURRENCY = 8
+DEFAULT_FIELDS = ("quotes", "trading_data")
+# Host each field is served from, so rate limits apply per host.
+FIELD_HOSTS = {
+    "quotes": "query1.finance.yahoo.com",
+    "fundamentals": "query1.finance.yahoo.com",
+    "profile": "query1.finance.yahoo.com",
+    "trading_data": "query2.finance.yahoo.com",
+    "dividends": "query2.finance.yahoo.com",
+    "splits": "query2.finance.yahoo.com",
+    "options": "query1.finance.yahoo.com",
+}
+
+# requests, pandas-datareader and socket errors all derive from IOError.
+RETRY_EXCEPTIONS = (IOError,)
+
+
+def _load(target, field):
+    if field == "options":
+        return target.options.all_data
+    return getattr(target, field)
+
+
+async def aload(
+    tickers,
+    fields=DEFAULT_FIELDS,
+    concurrency=CONCURRENCY,
+    rate=HOST_RATE,
+    retries=RETRIES,
+    backoff=BACKOFF,
+    **kwargs
+):
+    """Loads ``fields`` for many tickers concurrently and returns the universe.
+
+    Fetches run in a thread pool, at most ``concurrency`` at a time and at
+    most ``rate`` requests per second per host, retrying failures with
+    exponential backoff. Results land in each Equity's memoized data, so the
+    regular properties read them afterwards without another request. Quotes
+    are fetched through the batched universe endpoint. ``tickers`` may be an
+    EquityUniverse; other keyword arguments are passed to EquityUniverse.
+    """
+    for field in fields:
+        if field not in FIELD_HOSTS:
+            raise ValueError("Cannot load field {0!r}".format(field))
+    if isinstance(tickers, EquityUniverse):
+        universe = tickers
+    else:
+        universe = EquityUniverse(tickers, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    buckets = dict((host, TokenBucket(rate)) for host in set(FIELD_HOSTS.values()))
+
+    async def fetch(target, field):
+        bucket = buckets[FIELD_HOSTS[field]]
+        for attempt in range(retries + 1):
+            async with semaphore:
+                await asyncio.sleep(bucket.reserve())
+                try:
+                    return await loop.run_in_executor(executor, _load, target, field)
+                except RETRY_EXCEPTIONS:
+                    if attempt == retries:
+                        raise
+            await asyncio.sleep(backoff * 2 ** attempt)
+
+    tasks = []
+    for field in fields:
+        if field == "quotes":
+            tasks.append(fetch(universe, field))
+        else:
+            tasks.extend(fetch(equity, field) for equity in universe)
+    with ThreadPoolExecutor(concurrency) as executor:
+        await asyncio.gather(*tasks)
+    return universe
@@ -0,0 +1,186 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+
+def trailing(frame, days, valid=None):
+    """frame with only the last ``days`` valid rows of each column kept.
+
+    ``valid`` (default: the non-NaN cells) marks each column's own bars, so
+    a column missing dates that others have, as in a panel of tickers,
+    still gets ``days`` of them, like ``iloc[-days:]`` on that column
+    alone. ``days == 0`` keeps every valid row.
+    """
+    valid = frame.notna() if valid is None else valid
+    if not days:
+        return frame.where(valid)
+    remaining = valid.iloc[::-1].cumsum().iloc[::-1]
+    return frame.where(valid & (remaining <= days))
+
+
+def rolling_hist_vol(returns, days):
+    """Annualized ``rolling(days)`` vol of each column over its own returns.
+
+    Columns with a gap after their first return are rolled over their
+    non-NaN rows only, as ``Equity.rolling_hist_vol`` rolls over its bars.
+    """
+    result = returns.rolling(days).std()
+    valid = returns.notna()
+    gapped = (valid.cummax() & ~valid).any().to_numpy()
+    for name in returns.columns[gapped]:
+        result[name] = returns[name].dropna().rolling(days).std()
+    return result * math.sqrt(TRADING_DAYS)
+
+
+def hist_vol_by_days(returns, min_days=10, max_days=600, skipna=False):
+    """Annualized vol of the trailing ``d`` returns for d in [min_days, max_days).
+
+    Matches ``returns[-d:].std() * sqrt(TRADING_DAYS)`` for every d, but does
+    a single pass over reversed cumulative sums of r and r**2. A DataFrame of
+    returns (one column per ticker) gives a days x ticker DataFrame. With
+    ``skipna`` each column's window is its last ``d`` non-NaN returns.
+    """
+    frame = returns if isinstance(returns, pd.DataFrame) else pd.DataFrame(returns)
+    values = frame.to_numpy(dtype=float)[::-1]
+    days = np.arange(int(min_days), int(max_days))
+
+    valid = ~np.isnan(values)
+    if skipna:
+        # Move each column's returns to the top, newest first.
+        order = np.argsort(~valid, axis=0, kind="stable")
+        values = np.take_along_axis(values, order, axis=0)
+        valid = np.take_along_axis(valid, order, axis=0)
+    count = np.cumsum(valid, axis=0)
+    # Centre each column before summing to limit cancellation in s2 - s1**2/n.
+    shift = np.nansum(values, axis=0) / np.maximum(valid.sum(axis=0), 1)
+    centred = np.where(valid, values - shift, 0.0)
+    s1 = np.cumsum(centred, axis=0)
+    s2 = np.cumsum(centred * centred, axis=0)
+
+    # returns[-0:] is the whole series, like returns[-d:] for d >= len.
+    rows = np.where(days == 0, len(values), np.minimum(days, len(values))) - 1
+    vol = np.full((len(days), values.shape[1]), np.nan)
+    if len(values):
+        take = rows >= 0
+        n = count[rows[take]]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = (s2[rows[take]] - s1[rows[take]] ** 2 / n) / (n - 1)
+        var = np.where(n > 1, np.maximum(var, 0), np.nan)
+        vol[take] = np.sqrt(var * TRADING_DAYS)
+
+    if isinstance(returns, pd.DataFrame):
+        return pd.DataFrame(vol, index=days, columns=returns.columns)
+    return pd.Series(vol[:, 0], index=days)
+
+
+class AsOfIndex(object):
+    """Windowed vol and VWAP as of any date, from prefix sums over history.
+
+    ``trading_data`` is a frame with Close, Volume and (optionally) Adj Close
+    columns on a sorted date index, like ``Equity.trading_data``; ``returns``
+    defaults to the Adj Close percent change on the same index. Cumulative
+    sums of returns, squared returns, close x volume and volume are built
+    once, so each query is a binary search for the end date plus a
+    difference of two sums.
+
+    ``end_date`` may be a date or an array of dates and ``days`` an int or
+    an array; array arguments return a Series. Results match the
+    ``Equity`` methods of the same name, which slice ``[:end_date]``.
+    """
+
+    def __init__(self, trading_data, returns=None):
+        self.index = trading_data.index
+        close = trading_data["Close"].to_numpy(dtype=float)
+        if returns is None:
+            adj_close = trading_data.get("Adj Close", trading_data["Close"])
+            returns = adj_close.pct_change() if len(adj_close) else adj_close
+        returns = np.asarray(returns, dtype=float)
+        volume = trading_data["Volume"].to_numpy(dtype=float)
+
+        valid = ~np.isnan(returns)
+        # Centre the returns before summing to limit cancellation, as in
+        # hist_vol_by_days.
+        shift = returns[valid].mean() if valid.any() else 0.0
+        centred = np.where(valid, returns - shift, 0.0)
+        self._count = self._cumsum(valid)
+        self._s1 = self._cumsum(centred)
+        self._s2 = self._cumsum(centred * centred)
+        traded = close * volume
+        self._pv = self._cumsum(np.where(np.isnan(traded), 0.0, traded))
+        self._volume = self._cumsum(np.where(np.isnan(volume), 0.0, volume))
+
+    @staticmethod
+    def _cumsum(values):
+        "Prefix sums with a leading zero, so rows [a, b) sum to s[b] - s[a]."
+        return np.concatenate([[0], np.cumsum(values)])
+
+    def __len__(self):
+        return len(self.index)
+
+    def positions(self, end_date=None):
+        "Number of rows on or before each end_date."
+        if end_date is None:
+            return np.array(len(self.index))
+        scalar = np.ndim(end_date) == 0
+        ends = pd.DatetimeIndex([end_date] if scalar else end_date)
+        tz = getattr(self.index, "tz", None)
+        if tz is not None and ends.tz is None:
+            ends = ends.tz_localize(tz)
+        elif tz is None and ends.tz is not None:
+            ends = ends.tz_localize(None)
+        positions = self.index.searchsorted(ends, side="right")
+        return positions[0] if scalar else positions
+
+    def _windows(self, days, end_date):
+        end = self.positions(end_date)
+        days = np.asarray(days, dtype=int)
+        # [-0:] is the whole history, like iloc[-days:] with days == 0.
+        start = np.where(days == 0, 0, np.maximum(end - days, 0))
+        return start, end
+
+    def _result(self, values, days, end_date):
+        if np.ndim(end_date) > 0:
+            return pd.Series(values, index=pd.DatetimeIndex(end_date))
+        if np.ndim(days) > 0:
+            return pd.Series(values, index=np.asarray(days))
+        return float(values)
+
+    def _vol(self, start, end, min_count=2):
+        n = self._count[end] - self._count[start]
+        s1 = self._s1[end] - self._s1[start]
+        s2 = self._s2[end] - self._s2[start]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = (s2 - s1**2 / n) / (n - 1)
+        var = np.where(n >= max(min_count, 2), np.maximum(var, 0), np.nan)
+        return np.sqrt(var * TRADING_DAYS)
+
+    def hist_vol(self, days, end_date=None):
+        "Annualized vol of the last ``days`` returns up to end_date."
+        start, end = self._windows(days, end_date)
+        return self._result(self._vol(start, end), days, end_date)
+
+    def rolling_hist_vol(self, days, end_date=None):
+        "hist_vol over ``days`` at every date, NaN until the window is full."
+        days = int(days)
+        end = np.arange(1, self.positions(end_date) + 1)
+        start = np.maximum(end - days, 0)
+        # Like rolling(days), a window with a missing return has no value.
+        vol = self._vol(start, end, min_count=days)
+        return pd.Series(vol, index=self.index[: len(end)])
+
+    def hist_vol_by_days(self, end_date=None, min_days=10, max_days=600):
+        "Returns the historical vol for a range of trading days ending on end_date."
+        days = np.arange(int(min_days), int(max_days))
+        return self.hist_vol(days, end_date)
+
+    def vwap(self, end_date=None, days=30):
+        "Volume weighted close over the last ``days`` bars up to end_date."
+        start, end = self._windows(days, end_date)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            vwap = (self._pv[end] - self._pv[start]) / (
+                self._volume[end] - self._volume[start]
+            )
+        return self._result(vwap, days, end_date)
@@ -1,30 +1,42 @@
 import datetime
 import math
-import json
+import threading
 
 import pandas as pd
 from pandas import DataFrame, Series
-from pandas_datareader.yahoo.quotes import YahooQuotesReader
-import yfinance as yf
 
-import pandas_datareader.data as pdr
-import requests_cache
-import empyrical
-
-TRADING_DAYS = 252
-CACHE_HRS = 1
+from .actions import CorporateActions
+from .analytics import TRADING_DAYS, AsOfIndex, hist_vol_by_days
+from .cache import TTLCache
+from .compact import compact as compact_history, nbytes
+from . import instrument, pricing
+from .session import (
+    CACHE_HRS,
+    HEADERS,
+    OPTIONS_TTL,
+    PROFILE_TTL,
+    QUOTE_TTL,
+    get_provider,
+)
+from .snapshot import QuoteSnapshot
+from .store import ACTION_COLUMNS, PriceStore
+from .streaming import EquityStream
+from .surface import VolSurface
+
+HISTORY_TTL = datetime.timedelta(hours=CACHE_HRS)
+# Memoized responses expire with their endpoint's HTTP cache lifetime.
+MEMO_TTLS = {
+    "quotes": QUOTE_TTL,
+    "snapshot": QUOTE_TTL,
+    "fundamentals": PROFILE_TTL,
+    "profile": PROFILE_TTL,
+    # The chain expires its own quotes; keeping it keeps its vol surface.
+    "options": None,
+}
 START_DATE = datetime.date(1990, 1, 1)
+VOL_DAYS = 30
 QUERY_STRING = "https://query1.finance.yahoo.com/v10/finance/quoteSummary/{ticker}?lang=en-US&region=US&modules={modules}&corsDomain=finance.yahoo.com"
-HEADERS = {
-    "Connection": "keep-alive",
-    "Expires": str(-1),
-    "Upgrade-Insecure-Requests": str(1),
-    # Google Chrome:
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-        "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    ),
-}
+FUNDAMENTALS_MODULES = ("assetProfile", "summaryDetail", "defaultKeyStatistics", "price")
 _DEFAULT_PARAMS = {
     "lang": "en-US",
     "corsDomain": "finance.yahoo.com",
@@ -32,118 +44,276 @@ _DEFAULT_PARAMS = {
 }
 
 
-class FixedYahooQuotesReader(YahooQuotesReader):
-    def __init__(self, *args, crumb=None, **kwargs):
-        super(FixedYahooQuotesReader, self).__init__(*args, **kwargs)
-        self.crumb = crumb
-    def params(self, symbol):
-        params = super().params(symbol)
-        params.update({"crumb": self.crumb})
-        return params
-    def _read_lines(self, out):
-        data = json.loads(out.read())["quoteResponse"]["result"][0]
-        idx = data.pop('symbol')
-        data["price"] = data["regularMarketPrice"]
-        return Series(data)
+def _option_types(frame):
+    # pandas-datareader labels contracts "call"/"put"; the chain uses the plural.
+    return frame.rename(index={"call": "calls", "put": "puts"}, level="Type")
+
+
+def __getattr__(name):
+    # The reader subclasses pandas-datareader's, which is only imported on use.
+    if name == "FixedYahooQuotesReader":
+        from .quotes import FixedYahooQuotesReader
+
+        return FixedYahooQuotesReader
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def _raw(value):
+    if isinstance(value, dict) and ("raw" in value or not value):
+        return value.get("raw")
+    return value
+
+
+_benchmarks_lock = threading.Lock()
 
 
+@instrument.trace_members(
+    "_load_trading_data",
+    "_load_fundamentals",
+    "_load_quotes",
+    "_alpha_beta",
+)
 class Equity(object):
-    def __init__(self, ticker, session=None):
+    _HISTORY_KEYS = (
+        "trading_data",
+        "corporate_actions",
+        "close",
+        "adj_close",
+        "returns",
+        "alpha_beta",
+        "asof",
+    )
+
+    def __init__(
+        self, ticker, session=None, ttl=HISTORY_TTL, crumb=None, store=None, compact=False
+    ):
         self.ticker = ticker
-        self.yf_ticker = yf.Ticker(self.ticker)
-
-        if session:
-            self._session = session
-        else:
-            self._session = self._get_session()
-            with self._session.cache_disabled():
-                self.crumb = self._session.get(
-                    'https://query1.finance.yahoo.com/v1/test/getcrumb').text
+        self._cache = TTLCache(ttl, MEMO_TTLS)
+        self._compact = compact
+        if isinstance(store, str):
+            store = PriceStore(store)
+        self._store = store
+        self._stream = None
+        self._session = session or self._get_session()
+        self._provider = get_provider(self._session)
+        if crumb:
+            # Other Equities on the session may hold a fresher crumb.
+            self._provider.set_crumb(crumb, replace=False)
+
+    def __getattr__(self, name):
+        # yfinance is slow to import; build the Ticker when history is needed.
+        if name == "yf_ticker":
+            self.yf_ticker = self._make_ticker()
+            return self.yf_ticker
+        raise AttributeError(name)
 
     def _get_session(self):
-        session = requests_cache.CachedSession(
-            cache_name="pf-cache",
-            backend="sqlite",
-            expire_after=datetime.timedelta(hours=CACHE_HRS),
-        )
-        session.headers.update(HEADERS)
-        with session.cache_disabled():
-            session.get('https://fc.yahoo.com')
-        return session
+        return get_provider().session
+
+    def _make_ticker(self):
+        # Sessions that serve Yahoo themselves (see replay) also serve history.
+        ticker = getattr(self._session, "ticker", None)
+        if ticker:
+            return ticker(self.ticker)
+        import yfinance as yf
+
+        return yf.Ticker(self.ticker)
+
+    @property
+    def crumb(self):
+        "Yahoo crumb shared by every Equity on this session, fetched on first use."
+        return self._provider.crumb
+
+    def refresh(self):
+        "Drops memoized price history and downloads it again."
+        self.invalidate()
+        return self._cache.get("trading_data", lambda: self._load_trading_data(max_age=0))
+
+    def invalidate(self):
+        "Drops all memoized data so the next access refetches it."
+        self._cache.invalidate()
+
+    def memory_usage(self):
+        """Bytes held by each memoized value, as a Series indexed by key.
+
+        The ``index`` row is the date index of trading_data, which compact
+        Equities share. Series taken from trading_data (close, adj_close)
+        may be views on it and are counted at full size.
+        """
+        usage = dict((key, nbytes(value)) for key, value in self._cache.items())
+        if "trading_data" in usage:
+            usage["index"] = self.trading_data.index.nbytes
+        return pd.Series(usage, dtype="int64", name=self.ticker)
+
+    @property
+    def cache_stats(self):
+        "Hit/miss counters of the memoized data."
+        return self._cache.stats
+
+    @classmethod
+    def benchmark(cls, ticker, session=None):
+        """Returns the Equity shared by everything benchmarked against ticker.
+
+        Benchmarks are kept on their session, so they go away with it.
+        """
+        session = session or get_provider().session
+        with _benchmarks_lock:
+            benchmarks = getattr(session, "_pf_benchmarks", None)
+            if benchmarks is None:
+                benchmarks = session._pf_benchmarks = {}
+            if ticker not in benchmarks:
+                benchmarks[ticker] = cls(ticker, session=session)
+            return benchmarks[ticker]
+
+    @classmethod
+    def aload(cls, tickers, fields=("quotes", "trading_data"), **kwargs):
+        """Coroutine loading fields for many tickers concurrently.
+
+        ``universe = await Equity.aload(["AAPL", "MSFT"])``; see
+        ``pandas_finance.aio.aload`` for the options.
+        """
+        from .aio import aload
+
+        return aload(tickers, fields, **kwargs)
 
     @property
     def options(self):
-        return OptionChain(self)
+        return self._cache.get("options", lambda: OptionChain(self))
 
     @property
     def close(self):
         """Returns pandas series of closing price"""
-        return self.trading_data["Close"]
+        return self._cache.get("close", lambda: self.trading_data["Close"])
 
     @property
     def adj_close(self):
-        """Returns pandas series of closing price"""
-        return self.trading_data["Adj Close"]
+        """Returns pandas series of closing price adjusted for dividends.
+
+        Computed from Close and the dividends in the same history.
+        """
+        return self._cache.get(
+            "adj_close", lambda: self.corporate_actions.adjust(self.close)
+        )
 
     @property
     def returns(self):
-        return self.adj_close.pct_change()
+        return self._cache.get("returns", lambda: self.adj_close.pct_change())
+
+    @property
+    def asof(self):
+        """AsOfIndex over the price history, for vol and VWAP as of any date.
+
+        Use it to sweep many end dates: ``aapl.asof.hist_vol(30, dates)``
+        is one vectorised lookup instead of a slice per date.
+        """
+        return self._cache.get(
+            "asof", lambda: AsOfIndex(self.trading_data, self.returns)
+        )
 
     @property
     def trading_data(self):
-        return self.yf_ticker.history(start=START_DATE)
+        return self._cache.get("trading_data", self._load_trading_data)
+
+    def _load_trading_data(self, max_age=None, fetch=None):
+        # Series derived from the previous snapshot must not outlive it.
+        self._cache.invalidate(*self._HISTORY_KEYS)
+        fetch = fetch or self._fetch_history
+        if self._store is not None:
+            if max_age is None:
+                max_age = self._cache.ttl
+            history = self._store.load(self.ticker, fetch, START_DATE, max_age=max_age)
+        else:
+            history = fetch(START_DATE)
+        # Read the actions now: compact histories drop their columns.
+        self._cache.set("corporate_actions", CorporateActions(history))
+        if self._compact:
+            history = compact_history(history)
+        return history
+
+    def _prime_history(self, history):
+        """Sets trading_data from history downloaded elsewhere, e.g. in bulk.
+
+        A PriceStore is updated from it as if it had been fetched here.
+        """
+
+        def fetch(start):
+            start = pd.Timestamp(start)
+            if history.index.tz is not None and start.tz is None:
+                start = start.tz_localize(history.index.tz)
+            return history.iloc[history.index.searchsorted(start) :]
+
+        self._cache.set("trading_data", self._load_trading_data(max_age=0, fetch=fetch))
+
+    @instrument.traced("Equity._fetch_history", kind="io")
+    def _fetch_history(self, start):
+        # Unadjusted, with dividends and splits; adj_close is computed here.
+        return self.yf_ticker.history(start=start, auto_adjust=False, actions=True)
 
     @property
-    def actions(self):
-        return pdr.get_data_yahoo_actions(
-            self.ticker, session=self._session, start=START_DATE
+    def corporate_actions(self):
+        "Dividends and splits read from the price history, without another request."
+        # Loading the history reads them. A compact history has dropped
+        # their columns, so it is reloaded to read them again.
+        if (
+            self._compact
+            and "corporate_actions" not in self._cache
+            and "trading_data" in self._cache
+            and not set(ACTION_COLUMNS).intersection(self.trading_data.columns)
+        ):
+            self._cache.invalidate("trading_data")
+        self.trading_data
+        return self._cache.get(
+            "corporate_actions", lambda: CorporateActions(self.trading_data)
         )
 
+    @property
+    def actions(self):
+        "Dividends and splits as action/value rows, newest first."
+        return self.corporate_actions.table
+
     @property
     def dividends(self):
-        dividends = self.yf_ticker.get_dividends()
-        dividends.name = "Dividends"
-        return dividends
+        return self.corporate_actions.dividends
 
     @property
     def splits(self):
-        splits = self.yf_ticker.get_splits()
-        splits.name = "Splits"
-        return splits
+        return self.corporate_actions.splits
+
+    @property
+    def trailing_annual_dividend(self):
+        "Dividends paid over the last year of the price history."
+        return self.corporate_actions.trailing_annual_dividend()
 
     @property
     def annual_dividend(self):
-        if "forwardAnnualDividendRate" in self.quotes.index:
-            return self.quotes["forwardAnnualDividendRate"]
-        elif "trailingAnnualDividendRate" in self.quotes.index:
-            return self.quotes["trailingAnnualDividendRate"]
-        else:
-            return 0
+        return self.snapshot().annual_dividend
 
     @property
     def dividend_yield(self):
-        return self.annual_dividend / self.price
+        return self.snapshot().dividend_yield
 
     @property
     def price(self):
-        return self.quotes["price"]
+        return self.snapshot().price
 
     @property
     def closed(self):
         "Market is closed or open"
-        return self.quotes["marketState"].lower() == "closed"
+        return self.snapshot().closed
 
     @property
     def currency(self):
-        return self.quotes["currency"]
+        return self._field("currency", "price", "currency")
 
     @property
     def market_cap(self):
-        return float(self.quotes["marketCap"])
+        return float(self._field("market_cap", "price", "marketCap"))
 
     @property
     def shares_os(self):
-        return int(self.quotes["sharesOutstanding"])
+        return int(
+            self._field("shares_os", "defaultKeyStatistics", "sharesOutstanding")
+        )
 
     def hist_vol(self, days, end_date=None):
         days = int(days)
@@ -163,12 +333,40 @@ class Equity(object):
         return data.rolling(days).std() * math.sqrt(TRADING_DAYS)
 
     @property
-    def profile(self):
-        response = self._session.get(
-            QUERY_STRING.format(ticker=self.ticker, modules="assetProfile")
+    def fundamentals(self):
+        """quoteSummary modules (FUNDAMENTALS_MODULES) from a single request.
+
+        Returns a dict of module name to fields, with Yahoo's
+        ``{"raw": ..., "fmt": ...}`` values reduced to the raw value.
+        """
+        return self._cache.get("fundamentals", self._load_fundamentals)
+
+    def _load_fundamentals(self):
+        self._cache.invalidate("profile")
+        response = self._provider.get(
+            QUERY_STRING.format(ticker=self.ticker, modules=",".join(FUNDAMENTALS_MODULES))
         ).json()
-        asset_profile = response["quoteSummary"]["result"][0]["assetProfile"]
-        del asset_profile["companyOfficers"]
+        result = response["quoteSummary"]["result"][0]
+        return dict(
+            (module, dict((key, _raw(value)) for key, value in fields.items()))
+            for module, fields in result.items()
+        )
+
+    def _field(self, attr, module, key):
+        # Read from the snapshot, so every quote field is from one point in
+        # time; quoteSummary only fills in what the quote lacks.
+        value = getattr(self.snapshot(), attr)
+        if value is not None:
+            return value
+        return self.fundamentals[module][key]
+
+    @property
+    def profile(self):
+        return self._cache.get("profile", self._load_profile)
+
+    def _load_profile(self):
+        asset_profile = dict(self.fundamentals["assetProfile"])
+        asset_profile.pop("companyOfficers", None)
         profile = pd.DataFrame.from_dict(asset_profile, orient="index")[0]
         profile.name = ""
         profile.index = [name.capitalize() for name in profile.index]
@@ -179,7 +377,29 @@ class Equity(object):
 
     @property
     def quotes(self):
-        return FixedYahooQuotesReader(self.ticker, session=self._session, crumb=self.crumb).read()
+        return self._cache.get("quotes", self._load_quotes)
+
+    def _load_quotes(self):
+        self._cache.invalidate("snapshot")
+        return self._quotes_reader(self.ticker).read()
+
+    def snapshot(self):
+        """Returns the quote fields as one immutable QuoteSnapshot.
+
+        Every field comes from the same quote response, which is fetched at
+        most once per ``QUOTE_TTL``. ``price``, ``closed``, ``market_cap``
+        etc. read from it.
+        """
+        return self._cache.get(
+            "snapshot", lambda: QuoteSnapshot.from_quote(self.ticker, self.quotes)
+        )
+
+    def _quotes_reader(self, symbols):
+        from .quotes import FixedYahooQuotesReader
+
+        return FixedYahooQuotesReader(
+            symbols, session=self._session, crumb=self.crumb, provider=self._provider
+        )
 
     @property
     def quote(self):
@@ -199,10 +419,32 @@ class Equity(object):
 
     @property
     def name(self):
-        return self.quotes["longName"]
+        return self._field("name", "price", "longName")
+
+    def _index_returns(self, index):
+        if isinstance(index, Series):
+            return index
+        if not isinstance(index, Equity):
+            index = self.benchmark(index, self._session)
+        return index.returns
 
     def alpha_beta(self, index, start=None, end=None):
-        index_rets = Equity(index).returns
+        """Returns alpha and beta against index.
+
+        index is a ticker, an Equity or a Series of benchmark returns.
+        Results for tickers and Equities are memoized with the price history.
+        """
+        if isinstance(index, Series):
+            return self._alpha_beta(index, start, end)
+        # Load the history first: a reload resets the memoized results.
+        self.returns
+        results = self._cache.get("alpha_beta", dict)
+        key = (getattr(index, "ticker", index), start, end)
+        if key not in results:
+            results[key] = self._alpha_beta(self._index_returns(index), start, end)
+        return results[key]
+
+    def _alpha_beta(self, index_rets, start, end):
         rets = self.returns
         data = pd.DataFrame()
         data["Index"] = index_rets
@@ -214,6 +456,8 @@ class Equity(object):
         if end:
             data = data[start:end]
 
+        import empyrical
+
         return empyrical.alpha_beta(data["Rets"], data["Index"])
 
     def beta(self, index, start=None, end=None):
@@ -233,56 +477,191 @@ class Equity(object):
         data = data.iloc[-days:]
         return (data["Close"] * data["Volume"]).sum() / data["Volume"].sum()
 
+    def stream(self, days=20, vwap_days=30):
+        """Starts streaming analytics seeded from the price history.
+
+        Feed new bars or quotes with push(); the returned EquityStream keeps
+        hist_vol over ``days`` returns, vwap over ``vwap_days`` bars and the
+        cumulative return up to date in O(1) per update.
+        """
+        self._stream = EquityStream(days, vwap_days).seed(self.trading_data)
+        return self._stream
+
+    def push(self, price, volume=0, date=None):
+        "Pushes a bar or quote into the stream, starting one if needed."
+        if self._stream is None:
+            self.stream()
+        return self._stream.push(price, volume, date)
+
     def hist_vol_by_days(self, end_date=None, min_days=10, max_days=600):
         "Returns the historical vol for a range of trading days ending on end_date."
-        min_days = int(min_days)
-        max_days = int(max_days)
         if end_date:
             returns = self.returns[:end_date]
         else:
             returns = self.returns
+        return hist_vol_by_days(returns, min_days, max_days)
 
-        output = {}
-        for i in range(min_days, max_days):
-            output[i] = returns[-i:].std() * math.sqrt(TRADING_DAYS)
 
-        return pd.Series(output)
+class Option(object):
+    """A single contract on an Equity, priced with Black-Scholes.
 
+    Spot and dividend yield come from the underlying; vol defaults to its
+    ``hist_vol(VOL_DAYS)``. kind is "calls" or "puts", as in OptionChain.
+    """
 
-class Option(object):
-    def __init__(self):
-        pass
+    def __init__(self, underlying=None, strike=None, expiry=None, kind="calls"):
+        self.underlying = underlying
+        self.strike = strike
+        self.expiry = expiry
+        self.kind = kind
+
+    @property
+    def tenor(self):
+        "Years to expiry."
+        days = (pd.Timestamp(self.expiry) - pd.Timestamp.today().normalize()).days
+        return days / pricing.DAYS_PER_YEAR
+
+    def _args(self):
+        return (self.underlying.price, self.strike, self.tenor)
+
+    def _kwargs(self, rate):
+        return dict(
+            rate=rate,
+            dividend_yield=self.underlying.dividend_yield,
+            is_call=self.kind == "calls",
+        )
+
+    def price(self, vol=None, rate=pricing.RISK_FREE_RATE):
+        if vol is None:
+            vol = self.underlying.hist_vol(VOL_DAYS)
+        return float(pricing.black_scholes(*self._args(), vol, **self._kwargs(rate)))
+
+    def implied_vol(self, price, rate=pricing.RISK_FREE_RATE):
+        return float(pricing.implied_vol(price, *self._args(), **self._kwargs(rate)))
+
+    def greeks(self, vol=None, rate=pricing.RISK_FREE_RATE):
+        if vol is None:
+            vol = self.underlying.hist_vol(VOL_DAYS)
+        values = pricing.greeks(*self._args(), vol, **self._kwargs(rate))
+        return Series(dict((name, float(value)) for name, value in values.items()))
 
 
 class OptionChain(object):
+    """Option chain of an Equity, downloaded at most once per ``OPTIONS_TTL``.
+
+    Data is indexed by expiry as it arrives, so single-expiry lookups such
+    as ``near_calls`` only download the expiry they need.
+    """
+
     def __init__(self, underlying):
         self.underlying = underlying
         self._session = self.underlying._session
-        self._pdr = pdr.Options(self.underlying.ticker, "yahoo", session=self._session)
+        # pdr.Options refuses the yahoo source outright; use the reader directly.
+        # Import the package first, as in quotes.py, so concurrent lazy
+        # imports do not deadlock.
+        import pandas_datareader  # noqa: F401
+        from pandas_datareader.yahoo.options import Options as YahooOptions
+
+        self._pdr = YahooOptions(self.underlying.ticker, session=self._session)
+        # Option quotes expire with the HTTP cache's OPTIONS_TTL.
+        self._cache = TTLCache(OPTIONS_TTL)
+        self._surface = None
+
+    def invalidate(self):
+        "Drops the downloaded chain so the next access refetches it."
+        self._cache.invalidate()
 
     @property
     def all_data(self):
-        return self._pdr.get_all_data()
+        return self._cache.get("all_data", self._load_all_data)
+
+    def _load_all_data(self):
+        data = _option_types(self._pdr.get_all_data())
+        self._cache.invalidate()
+        for expiry, frame in data.groupby(level="Expiry"):
+            self._cache.set(("expiry", expiry), frame)
+        return data
+
+    @property
+    def expiry_dates(self):
+        return self._pdr.expiry_dates
+
+    def expiry_data(self, expiry):
+        "Calls and puts for one expiry, downloading only that expiry if needed."
+        expiry = pd.Timestamp(expiry)
+        return self._cache.get(
+            ("expiry", expiry),
+            lambda: _option_types(self._pdr._load_data([expiry.date()])),
+        )
+
+    def _of_type(self, key, data, kind):
+        # Split on the Type level once per snapshot instead of masking per access.
+        frames = self._cache.get(
+            ("types", key), lambda: dict(list(data.groupby(level="Type", sort=False)))
+        )
+        return frames.get(kind, data.iloc[:0])
 
     @property
     def calls(self):
-        data = self.all_data
-        mask = data.index.get_level_values("Type") == "calls"
-        return data[mask]
+        return self._of_type("all", self.all_data, "calls")
 
     @property
     def puts(self):
-        data = self.all_data
-        mask = data.index.get_level_values("Type") == "puts"
-        return data[mask]
+        return self._of_type("all", self.all_data, "puts")
+
+    def _front(self, kind):
+        expiry = pd.Timestamp(self.expiry_dates[0])
+        return self._of_type(expiry, self.expiry_data(expiry), kind)
+
+    def analytics(self, rate=pricing.RISK_FREE_RATE, valuation_date=None, data=None):
+        """Implied vols and Greeks for every contract of the chain at once.
+
+        data defaults to all_data. Spot, dividend yield and the model vol
+        (hist_vol over VOL_DAYS) come from the underlying.
+        """
+        if data is None:
+            data = self.all_data
+        underlying = self.underlying
+        return pricing.chain_analytics(
+            data,
+            underlying.price,
+            underlying.hist_vol(VOL_DAYS),
+            rate=rate,
+            dividend_yield=underlying.dividend_yield,
+            valuation_date=valuation_date,
+        )
+
+    def vol_surface(self, rate=pricing.RISK_FREE_RATE, valuation_date=None):
+        """Implied vol surface of all_data, see ``surface.VolSurface``.
+
+        The surface persists across refreshes of the chain: while all_data is
+        cached it is returned as is, and after a refresh only the expiries
+        whose quotes changed are refit.
+        """
+        surface = self._surface
+        if (
+            surface is None
+            or surface.rate != rate
+            or surface.valuation_date != valuation_date
+        ):
+            surface = self._surface = VolSurface(rate, valuation_date)
+
+        def build():
+            underlying = self.underlying
+            surface.update(
+                self.all_data, underlying.price, underlying.dividend_yield
+            )
+            return surface
+
+        return self._cache.get(("surface", rate, valuation_date), build)
 
     @property
     def near_puts(self):
-        return self._pdr._chop_data(self.puts, 5, self.underlying.price)
+        return self._pdr._chop_data(self._front("puts"), 5, self.underlying.price)
 
     @property
     def near_calls(self):
-        return self._pdr._chop_data(self.calls, 5, self.underlying.price)
+        return self._pdr._chop_data(self._front("calls"), 5, self.underlying.price)
 
     def __getattr__(self, key):
         if hasattr(self._pdr, key):
@@ -0,0 +1,83 @@
+import datetime
+import time
+
+from .throttle import SingleFlight
+
+
+def _seconds(ttl):
+    if isinstance(ttl, datetime.timedelta):
+        return ttl.total_seconds()
+    return ttl
+
+
+class TTLCache(object):
+    """Memoizes values by key and expires them ``ttl`` after they were loaded.
+
+    ``ttl`` may be a number of seconds, a ``datetime.timedelta`` or None to
+    keep values until they are invalidated. ``ttls`` maps keys that need
+    their own lifetime to one. Threads missing on the same key at once share
+    one loader call.
+    """
+
+    def __init__(self, ttl=None, ttls=None):
+        self.ttl = ttl
+        self.ttls = {key: _seconds(value) for key, value in (ttls or {}).items()}
+        self.hits = 0
+        self.misses = 0
+        self._data = {}
+        self._flight = SingleFlight()
+
+    @property
+    def ttl(self):
+        return self._ttl
+
+    @ttl.setter
+    def ttl(self, ttl):
+        self._ttl = _seconds(ttl)
+
+    def _fresh(self, entry):
+        expires, value = entry
+        return expires is None or expires > time.monotonic()
+
+    def get(self, key, loader):
+        "Returns the cached value for key, calling loader() on a miss."
+        entry = self._data.get(key)
+        if entry is not None and self._fresh(entry):
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return self._flight.do(key, lambda: self._load(key, loader))
+
+    def _load(self, key, loader):
+        # A caller that waited on another thread's load may find it done.
+        entry = self._data.get(key)
+        if entry is not None and self._fresh(entry):
+            return entry[1]
+        value = loader()
+        self.set(key, value)
+        return value
+
+    def set(self, key, value):
+        ttl = self.ttls.get(key, self.ttl)
+        expires = None if ttl is None else time.monotonic() + ttl
+        self._data[key] = (expires, value)
+
+    def invalidate(self, *keys):
+        "Drops the given keys, or everything when called without arguments."
+        if not keys:
+            self._data.clear()
+        for key in keys:
+            self._data.pop(key, None)
+
+    def items(self):
+        "(key, value) pairs of every value that has not expired."
+        entries = list(self._data.items())
+        return [(key, entry[1]) for key, entry in entries if self._fresh(entry)]
+
+    def __contains__(self, key):
+        entry = self._data.get(key)
+        return entry is not None and self._fresh(entry)
+
+    @property
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
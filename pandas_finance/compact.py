@@ -0,0 +1,99 @@
+"""Compact price history for holding many Equity objects in memory.
+
+``Equity(..., compact=True)`` keeps only the columns the analytics read,
+stores prices as float32 and volume as integers where it fits, and puts
+the history on a calendar index shared with every other compact Equity.
+"""
+
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Everything the Equity analytics read from trading_data; dividends and
+# splits are kept apart, in Equity.corporate_actions.
+COMPACT_COLUMNS = ("Close", "Volume")
+
+
+class Calendar(object):
+    """Shares one date index between histories with the same trading days.
+
+    ``share(index)`` returns a view on the longest index seen so far when
+    ``index`` is a contiguous run of it, so a thousand histories on the same
+    exchange hold one copy of their dates.
+    """
+
+    def __init__(self):
+        self._masters = {}
+        self._lock = threading.Lock()
+
+    def share(self, index):
+        if not isinstance(index, pd.DatetimeIndex) or not len(index):
+            return index
+        key = (str(index.tz), index.name)
+        with self._lock:
+            master = self._masters.get(key)
+            if master is not None:
+                shared = self._run(master, index)
+                if shared is not None:
+                    return shared
+            if master is None or len(index) >= len(master):
+                self._masters[key] = index
+            return index
+
+    @staticmethod
+    def _run(master, index):
+        "master[i:j] if it holds exactly the dates of index, else None."
+        start = master.searchsorted(index[0])
+        stop = start + len(index)
+        values = master.asi8
+        if stop > len(values) or not np.array_equal(values[start:stop], index.asi8):
+            return None
+        return master if len(index) == len(master) else master[start:stop]
+
+    def clear(self):
+        with self._lock:
+            self._masters.clear()
+
+
+calendar = Calendar()
+
+
+def _volume(values):
+    "Volume as uint32 or int64 when whole and present, float32 otherwise."
+    if np.isnan(values).any() or (values != np.floor(values)).any():
+        return values.astype(np.float32)
+    if len(values) and (values.min() < 0 or values.max() > np.iinfo(np.uint32).max):
+        return values.astype(np.int64)
+    return values.astype(np.uint32)
+
+
+def compact(history, columns=COMPACT_COLUMNS):
+    """Returns history with only ``columns``, float32 prices and integer volume.
+
+    The index is shared through ``calendar``.
+    """
+    data = {}
+    for name in columns:
+        if name not in history.columns:
+            continue
+        values = history[name].to_numpy(dtype=float)
+        data[name] = _volume(values) if name == "Volume" else values.astype(np.float32)
+    return pd.DataFrame(data, index=calendar.share(history.index))
+
+
+def nbytes(value):
+    "Approximate bytes held by a memoized value, excluding any date index."
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=False, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=False, deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    # Objects built on arrays, e.g. AsOfIndex.
+    attrs = getattr(value, "__dict__", {}).values()
+    arrays = [v for v in attrs if isinstance(v, np.ndarray)]
+    if arrays:
+        return sum(array.nbytes for array in arrays)
+    return sys.getsizeof(value)
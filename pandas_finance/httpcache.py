@@ -0,0 +1,226 @@
+"""HTTP cache backends and per-endpoint lifetimes for the default session.
+
+Pick a backend with ``make_session(backend=...)`` or the
+``PANDAS_FINANCE_CACHE`` environment variable; see ``make_cache``.
+"""
+
+from collections import OrderedDict
+import fnmatch
+import os
+import tempfile
+import threading
+import time
+
+from requests_cache.backends import BaseCache, BaseStorage, DictStorage
+from requests_cache.backends.filesystem import FileCache
+from requests_cache.backends.sqlite import SQLiteCache
+from requests_cache.serializers import pickle_serializer
+
+CACHE_ENV = "PANDAS_FINANCE_CACHE"
+DEFAULT_BACKEND = "sqlite"
+MEMORY_CACHE_BYTES = 256 * 1024 * 1024
+SHM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+class LRUStorage(DictStorage):
+    """In-memory response storage holding at most ``max_bytes`` of bodies.
+
+    The least recently read or written responses are evicted first.
+    """
+
+    def __init__(self, max_bytes=MEMORY_CACHE_BYTES):
+        super(LRUStorage, self).__init__()
+        self.data = OrderedDict()
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._sizes = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _size(item):
+        content = getattr(item, "content", None)
+        return len(content) if content is not None else len(str(item))
+
+    def __getitem__(self, key):
+        with self._lock:
+            item = super(LRUStorage, self).__getitem__(key)
+            self.data.move_to_end(key)
+            return item
+
+    def __setitem__(self, key, item):
+        with self._lock:
+            if key in self.data:
+                del self[key]
+            self.data[key] = item
+            self._sizes[key] = self._size(item)
+            self.size += self._sizes[key]
+            while self.size > self.max_bytes and len(self.data) > 1:
+                del self[next(iter(self.data))]
+
+    def __iter__(self):
+        # Reads reorder the dict, so iterate over a snapshot of the keys.
+        with self._lock:
+            return iter(list(self.data))
+
+    def __delitem__(self, key):
+        with self._lock:
+            del self.data[key]
+            self.size -= self._sizes.pop(key)
+
+    def clear(self):
+        with self._lock:
+            self.data.clear()
+            self._sizes.clear()
+            self.size = 0
+
+
+class LRUCache(BaseCache):
+    "Per-process cache bounded by the total size of the cached bodies."
+
+    def __init__(self, max_bytes=MEMORY_CACHE_BYTES, **kwargs):
+        super(LRUCache, self).__init__(cache_name="memory", **kwargs)
+        self.responses = LRUStorage(max_bytes)
+
+
+class LocalKeyValue(object):
+    """In-process stand-in for a Redis client, with expiring keys.
+
+    Implements the commands KeyValueStorage uses, so tests and single
+    machines can run the Redis backend without a server.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key):
+        entry = self._data.get(key)
+        if entry is not None and entry[0] is not None and entry[0] <= time.time():
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key)
+            return None if entry is None else entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (None, value)
+
+    def setex(self, key, seconds, value):
+        with self._lock:
+            self._data[key] = (time.time() + seconds, value)
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def exists(self, key):
+        with self._lock:
+            return int(self._live(key) is not None)
+
+    def scan_iter(self, match="*"):
+        with self._lock:
+            keys = [k for k in list(self._data) if self._live(k) is not None]
+        pattern = match.encode() if isinstance(match, str) else match
+        return iter([k for k in keys if fnmatch.fnmatchcase(k, pattern)])
+
+    def close(self):
+        pass
+
+
+class KeyValueStorage(BaseStorage):
+    """Response storage on a Redis-compatible client.
+
+    Entries get the store's own expiry, so responses are evicted server
+    side once stale.
+    """
+
+    def __init__(self, client, namespace, serializer=pickle_serializer):
+        super(KeyValueStorage, self).__init__(serializer=serializer)
+        self.client = client
+        self.namespace = namespace
+
+    def _key(self, key):
+        return ("%s:%s" % (self.namespace, key)).encode("utf-8")
+
+    def __getitem__(self, key):
+        value = self.client.get(self._key(key))
+        if value is None:
+            raise KeyError(key)
+        return self.deserialize(key, value)
+
+    def __setitem__(self, key, item):
+        expires = getattr(item, "expires_delta", None)
+        if expires is not None and expires > 0:
+            self.client.setex(self._key(key), expires, self.serialize(item))
+        else:
+            self.client.set(self._key(key), self.serialize(item))
+
+    def __delitem__(self, key):
+        if not self.client.delete(self._key(key)):
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return bool(self.client.exists(self._key(key)))
+
+    def __iter__(self):
+        prefix = len(self.namespace) + 1
+        for key in self.client.scan_iter(match="%s:*" % self.namespace):
+            yield key.decode("utf-8")[prefix:]
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def clear(self):
+        keys = [self._key(key) for key in self]
+        if keys:
+            self.client.delete(*keys)
+
+    def close(self):
+        self.client.close()
+
+
+class KeyValueCache(BaseCache):
+    "Cache shared by every process using the same Redis-compatible server."
+
+    def __init__(self, client, namespace="pf-cache", **kwargs):
+        super(KeyValueCache, self).__init__(cache_name=namespace, **kwargs)
+        self.responses = KeyValueStorage(client, namespace)
+        self.redirects = KeyValueStorage(client, namespace + ":redirects")
+
+
+def make_cache(backend=None, cache_name="pf-cache"):
+    """Returns the requests_cache backend described by ``backend``.
+
+    * ``"sqlite"`` (the default): ``<cache_name>.sqlite`` in the working
+      directory, in WAL mode so readers do not block the writer.
+    * ``"memory"``: a per-process LRU of at most ``MEMORY_CACHE_BYTES``.
+    * ``"shm"``: one file per response under ``SHM_DIR``, shared by every
+      process on the machine without a database lock.
+    * ``"redis://host:port/db"``: a Redis server (needs the redis package).
+    * A Redis-compatible client, e.g. ``LocalKeyValue()``, is used directly.
+    * A requests_cache ``BaseCache`` is returned as is.
+
+    ``backend`` defaults to ``$PANDAS_FINANCE_CACHE``, then ``"sqlite"``.
+    """
+    if backend is None:
+        backend = os.environ.get(CACHE_ENV) or DEFAULT_BACKEND
+    if isinstance(backend, BaseCache):
+        return backend
+    if not isinstance(backend, str):
+        return KeyValueCache(backend, cache_name)
+    if backend == "sqlite":
+        return SQLiteCache(cache_name, wal=True)
+    if backend == "memory":
+        return LRUCache()
+    if backend == "shm":
+        return FileCache(os.path.join(SHM_DIR, cache_name))
+    if backend.startswith(("redis://", "rediss://", "unix://")):
+        import redis
+
+        return KeyValueCache(redis.Redis.from_url(backend), cache_name)
+    raise ValueError("Unknown cache backend %r" % backend)
+
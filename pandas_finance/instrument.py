@@ -0,0 +1,252 @@
+"""Opt-in timing of Equity calls and the HTTP requests behind them.
+
+Nothing is measured until a hook is registered. ``record`` collects spans
+for a block of code::
+
+    with instrument.record() as recording:
+        aapl.beta("SPY")
+    recording.frame()
+
+Every public Equity property or method call, each load stage (crumb,
+history download, quotes, fundamentals, regression) and every HTTP request
+is a ``Span``. HTTP time, bytes and requests_cache hits roll up into the
+spans that caused them, so ``compute`` is a span's wall time minus the
+time spent waiting on the network. The history download is an ``io`` span:
+yfinance sends it on its own session, out of sight of the HTTP spans, so
+its whole wall time counts as network (with no bytes) unless HTTP spans
+were recorded inside it. ``add_hook`` takes any callable, called with each
+span as it ends, for exporting elsewhere.
+"""
+
+import contextlib
+import contextvars
+import functools
+import itertools
+import threading
+import time
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+FIELDS = (
+    "parent",
+    "depth",
+    "kind",
+    "name",
+    "ticker",
+    "start",
+    "wall",
+    "network",
+    "compute",
+    "bytes",
+    "requests",
+    "http_cache_hits",
+    "http_cache_misses",
+    "memo_hits",
+    "memo_misses",
+    "status",
+    "error",
+)
+_ROLLUP = ("network", "bytes", "requests", "http_cache_hits", "http_cache_misses")
+
+_hooks = ()
+_hooks_lock = threading.Lock()
+_ids = itertools.count()
+_current = contextvars.ContextVar("pandas_finance_span", default=None)
+
+
+class Span(object):
+    "One timed call: a property or method, a load stage or an HTTP request."
+
+    def __init__(self, name, kind="call", ticker=None, parent=None):
+        self.id = next(_ids)
+        self.name = name
+        self.kind = kind
+        self.ticker = ticker
+        self.parent = None if parent is None else parent.id
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.start = time.time()
+        self.wall = self.network = 0.0
+        self.bytes = self.requests = 0
+        self.http_cache_hits = self.http_cache_misses = 0
+        self.memo_hits = self.memo_misses = 0
+        self.status = self.error = None
+        self._started = time.perf_counter()
+
+    @property
+    def compute(self):
+        return max(self.wall - self.network, 0.0)
+
+    def as_dict(self):
+        return dict({name: getattr(self, name) for name in FIELDS}, id=self.id)
+
+    def __repr__(self):
+        return "<Span %s %s %.6fs>" % (self.kind, self.name, self.wall)
+
+
+def add_hook(hook):
+    "Calls hook(span) as every span ends, until remove_hook(hook)."
+    global _hooks
+    with _hooks_lock:
+        _hooks = _hooks + (hook,)
+
+
+def remove_hook(hook):
+    global _hooks
+    with _hooks_lock:
+        _hooks = tuple(h for h in _hooks if h != hook)
+
+
+def enabled():
+    return bool(_hooks)
+
+
+@contextlib.contextmanager
+def span(name, kind="call", ticker=None):
+    """Times the block as a span nested in the current one.
+
+    Yields the Span (or None when no hook is registered) so the block can
+    fill in bytes, status etc.
+    """
+    if not _hooks:
+        yield None
+        return
+    parent = _current.get()
+    current = Span(name, kind, ticker, parent)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.error = type(exc).__name__
+        raise
+    finally:
+        _current.reset(token)
+        current.wall = time.perf_counter() - current._started
+        if kind == "http" or (kind == "io" and not current.requests):
+            current.network = current.wall
+        if parent is not None:
+            for name in _ROLLUP:
+                setattr(parent, name, getattr(parent, name) + getattr(current, name))
+        for hook in _hooks:
+            hook(current)
+
+
+def _traced(func, name, kind="call"):
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not _hooks:
+            return func(self, *args, **kwargs)
+        cache = getattr(self, "_cache", None)
+        with span(name, kind, getattr(self, "ticker", None)) as current:
+            if cache is None or current is None:
+                return func(self, *args, **kwargs)
+            hits, misses = cache.hits, cache.misses
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                current.memo_hits = cache.hits - hits
+                current.memo_misses = cache.misses - misses
+
+    return wrapper
+
+
+def traced(name, kind="call"):
+    """Decorator recording each call of a method as a span called name.
+
+    Use ``kind="io"`` for calls that wait on I/O not sent through an
+    instrumented session.
+    """
+    return lambda func: _traced(func, name, kind)
+
+
+def trace_members(*private):
+    """Class decorator tracing every public property and method of a class.
+
+    Private members named in ``private`` are traced too. Spans are named
+    ``Class.member``.
+    """
+
+    def decorate(cls):
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("_") and attr not in private:
+                continue
+            name = "%s.%s" % (cls.__name__, attr)
+            if isinstance(value, property):
+                traced_property = property(
+                    _traced(value.fget, name), value.fset, value.fdel, value.__doc__
+                )
+                setattr(cls, attr, traced_property)
+            elif callable(value) and not isinstance(value, (type, staticmethod)):
+                setattr(cls, attr, _traced(value, name))
+        return cls
+
+    return decorate
+
+
+def instrument_session(session):
+    """Records each request sent through session as an ``http`` span.
+
+    Wraps ``session.send``, so requests_cache lookups are timed too and
+    cached responses count as HTTP cache hits.
+    """
+    if getattr(session, "_pf_instrumented", False):
+        return session
+    send = session.send
+
+    @functools.wraps(send)
+    def traced_send(request, **kwargs):
+        if not _hooks:
+            return send(request, **kwargs)
+        url = urlsplit(request.url)
+        name = "%s %s%s" % (request.method, url.netloc, url.path)
+        with span(name, kind="http") as current:
+            response = send(request, **kwargs)
+            current.status = response.status_code
+            current.requests = 1
+            if not kwargs.get("stream"):
+                current.bytes = len(response.content)
+            if getattr(response, "from_cache", False):
+                current.http_cache_hits = 1
+            else:
+                current.http_cache_misses = 1
+        return response
+
+    session.send = traced_send
+    session._pf_instrumented = True
+    return session
+
+
+class Recording(object):
+    "Collects spans while registered as a hook; see ``record``."
+
+    def __init__(self):
+        self.spans = []
+
+    def __call__(self, span):
+        self.spans.append(span)
+
+    def frame(self):
+        "One row per span, indexed by span id in start order."
+        rows = [span.as_dict() for span in self.spans]
+        frame = pd.DataFrame(rows, columns=("id",) + FIELDS)
+        return frame.set_index("id").sort_index()
+
+    def summary(self):
+        "Calls, wall, network and compute time and bytes totalled by span name."
+        frame = self.frame()
+        totals = frame.groupby(["kind", "name"])[
+            ["wall", "network", "compute", "bytes", "requests"]
+        ].sum()
+        totals.insert(0, "calls", frame.groupby(["kind", "name"]).size())
+        return totals.sort_values("wall", ascending=False)
+
+
+@contextlib.contextmanager
+def record():
+    "Collects every span that ends inside the block into a Recording."
+    recording = Recording()
+    add_hook(recording)
+    try:
+        yield recording
+    finally:
+        remove_hook(recording)
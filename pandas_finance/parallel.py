@@ -0,0 +1,208 @@
+"""Universe analytics fanned out over a process pool.
+
+Pandas work holds the GIL, so ``ParallelAnalytics`` splits the tickers of a
+returns panel into column chunks and runs each chunk in a worker process.
+The panel is copied once into shared memory; workers map it instead of
+unpickling a DataFrame, and write their results into a shared output block
+the same way. Each method returns one DataFrame (or Series), matching the
+EquityUniverse method of the same name.
+
+.. code-block:: python
+
+    with universe.parallel(processes=8) as pool:
+        vols = pool.hist_vol(30)
+        betas = pool.beta("SPY")
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import math
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .analytics import TRADING_DAYS, hist_vol_by_days, rolling_hist_vol, trailing
+
+# Chunks per worker, so a slow chunk does not leave the others idle.
+CHUNKS_PER_PROCESS = 4
+
+
+class SharedArray(object):
+    """A float64 array in a named shared memory block.
+
+    Pickles as its name and shape: unpickling maps the same block. Only the
+    process that created the block unlinks it on close.
+    """
+
+    def __init__(self, shape, name=None):
+        self.shape = tuple(shape)
+        if name is None:
+            size = max(int(np.prod(self.shape)) * 8, 1)
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self.name = self._shm.name
+        self._owner = name is None
+        self.array = np.ndarray(self.shape, dtype=np.float64, buffer=self._shm.buf)
+
+    @classmethod
+    def copy_of(cls, values):
+        shared = cls(values.shape)
+        shared.array[...] = values
+        return shared
+
+    def __reduce__(self):
+        return SharedArray, (self.shape, self.name)
+
+    def close(self):
+        # Drop the view first; the block cannot close while it is exported.
+        self.array = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+# Windows count each ticker's own returns, as in EquityUniverse.
+
+
+def _hist_vol(values, days):
+    window = trailing(pd.DataFrame(values), days)
+    return window.std().to_numpy() * math.sqrt(TRADING_DAYS)
+
+
+def _rolling_hist_vol(values, days):
+    return rolling_hist_vol(pd.DataFrame(values), days).to_numpy()
+
+
+def _hist_vol_by_days(values, min_days, max_days):
+    vols = hist_vol_by_days(pd.DataFrame(values), min_days, max_days, skipna=True)
+    return vols.to_numpy()
+
+
+def _alpha_beta(values, index_rets, positions):
+    data = values.take(positions, axis=0)
+    data[positions < 0] = np.nan
+    data = np.where(np.isnan(data), 0.0, data)
+
+    import empyrical
+
+    return empyrical.alpha_beta_aligned(data, index_rets[:, np.newaxis]).T
+
+
+_TASKS = {
+    "hist_vol": _hist_vol,
+    "rolling_hist_vol": _rolling_hist_vol,
+    "hist_vol_by_days": _hist_vol_by_days,
+    "alpha_beta": _alpha_beta,
+}
+
+
+def _run(task, panel, out, rows, cols, kwargs):
+    "Worker: runs task on panel[rows, cols] and stores it in out[:, cols]."
+    try:
+        out.array[:, cols] = _TASKS[task](panel.array[rows, cols], **kwargs)
+    finally:
+        panel.close()
+        out.close()
+
+
+class ParallelAnalytics(object):
+    """Runs universe analytics on ``processes`` workers (default: all cores).
+
+    ``returns`` is a dates x tickers panel of daily returns. ``index_returns``
+    turns a ticker or Equity into benchmark returns for ``alpha_beta``. Call
+    ``close`` (or use as a context manager) to stop the workers and free the
+    shared panel.
+    """
+
+    def __init__(self, returns, processes=None, index_returns=None):
+        self.index = returns.index
+        self.tickers = list(returns.columns)
+        self.processes = processes or os.cpu_count()
+        self._index_returns = index_returns
+        self._panel = SharedArray.copy_of(returns.to_numpy(dtype=float))
+        self._pool = ProcessPoolExecutor(self.processes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._pool.shutdown()
+        if self._panel is not None:
+            self._panel.close()
+            self._panel = None
+
+    def _chunks(self):
+        count = min(len(self.tickers), self.processes * CHUNKS_PER_PROCESS)
+        bounds = np.linspace(0, len(self.tickers), max(count, 1) + 1).astype(int)
+        return [slice(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+    def _map(self, task, rows, out_rows, **kwargs):
+        "Runs task over every column chunk; returns the out_rows x tickers result."
+        out = SharedArray((out_rows, len(self.tickers)))
+        try:
+            futures = [
+                self._pool.submit(_run, task, self._panel, out, rows, cols, kwargs)
+                for cols in self._chunks()
+            ]
+            for future in futures:
+                future.result()
+            return out.array.copy()
+        finally:
+            out.close()
+
+    def _rows(self, end_date):
+        if not end_date:
+            return slice(None)
+        return slice(0, self.index.slice_indexer(None, end_date).stop)
+
+    def hist_vol(self, days, end_date=None):
+        "Annualized vol over each ticker's last ``days`` returns."
+        result = self._map("hist_vol", self._rows(end_date), 1, days=int(days))
+        return pd.Series(result[0], index=self.tickers)
+
+    def rolling_hist_vol(self, days, end_date=None):
+        rows = self._rows(end_date)
+        index = self.index[rows]
+        result = self._map("rolling_hist_vol", rows, len(index), days=int(days))
+        return pd.DataFrame(result, index=index, columns=self.tickers)
+
+    def hist_vol_by_days(self, end_date=None, min_days=10, max_days=600):
+        "Returns a days x ticker frame of historical vols ending on end_date."
+        days = np.arange(int(min_days), int(max_days))
+        result = self._map(
+            "hist_vol_by_days",
+            self._rows(end_date),
+            len(days),
+            min_days=min_days,
+            max_days=max_days,
+        )
+        return pd.DataFrame(result, index=days, columns=self.tickers)
+
+    def alpha_beta(self, index, start=None, end=None):
+        "Returns alpha and beta of every ticker against index."
+        if not isinstance(index, pd.Series):
+            index = self._index_returns(index)
+        index_rets = index.fillna(0)
+        if start:
+            index_rets = index_rets[start:]
+        if end:
+            index_rets = index_rets[:end]
+        result = self._map(
+            "alpha_beta",
+            slice(None),
+            2,
+            index_rets=index_rets.to_numpy(dtype=float),
+            positions=self.index.get_indexer(index_rets.index),
+        )
+        return pd.DataFrame(result.T, index=self.tickers, columns=["alpha", "beta"])
+
+    def beta(self, index, start=None, end=None):
+        return self.alpha_beta(index, start, end)["beta"]
+
+    def alpha(self, index, start=None, end=None):
+        return self.alpha_beta(index, start, end)["alpha"]
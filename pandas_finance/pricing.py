@@ -0,0 +1,211 @@
+import numpy as np
+import pandas as pd
+
+RISK_FREE_RATE = 0.0
+DAYS_PER_YEAR = 365.0
+MIN_VOL = 1e-6
+MAX_VOL = 5.0
+
+
+def _ndtr(x):
+    "Standard normal CDF, from scipy.special (imported on first use)."
+    from scipy.special import ndtr
+
+    return ndtr(x)
+
+
+def _norm_pdf(x):
+    return np.exp(-0.5 * x * x) / np.sqrt(2 * np.pi)
+
+
+def _inputs(spot, strike, tenor, vol, rate, dividend_yield, is_call):
+    return np.broadcast_arrays(
+        np.asarray(spot, dtype=float),
+        np.asarray(strike, dtype=float),
+        np.asarray(tenor, dtype=float),
+        np.asarray(vol, dtype=float),
+        np.asarray(rate, dtype=float),
+        np.asarray(dividend_yield, dtype=float),
+        np.asarray(is_call, dtype=bool),
+    )
+
+
+def _d1_d2(spot, strike, tenor, vol, rate, dividend_yield):
+    sqrt_t = np.sqrt(tenor)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (
+            np.log(spot / strike) + (rate - dividend_yield + 0.5 * vol * vol) * tenor
+        ) / (vol * sqrt_t)
+    return d1, d1 - vol * sqrt_t
+
+
+def black_scholes(
+    spot, strike, tenor, vol, rate=RISK_FREE_RATE, dividend_yield=0.0, is_call=True
+):
+    """Black-Scholes price with a continuous dividend yield.
+
+    Every argument broadcasts, so whole chains price in one call. ``tenor``
+    is in years.
+    """
+    spot, strike, tenor, vol, rate, q, is_call = _inputs(
+        spot, strike, tenor, vol, rate, dividend_yield, is_call
+    )
+    d1, d2 = _d1_d2(spot, strike, tenor, vol, rate, q)
+    forward = spot * np.exp(-q * tenor)
+    discounted = strike * np.exp(-rate * tenor)
+    call = forward * _ndtr(d1) - discounted * _ndtr(d2)
+    put = discounted * _ndtr(-d2) - forward * _ndtr(-d1)
+    return np.where(is_call, call, put)
+
+
+def greeks(
+    spot, strike, tenor, vol, rate=RISK_FREE_RATE, dividend_yield=0.0, is_call=True
+):
+    """Returns a dict of delta, gamma, vega, theta and rho arrays.
+
+    vega and rho are per unit change in vol and rate, theta per year.
+    """
+    spot, strike, tenor, vol, rate, q, is_call = _inputs(
+        spot, strike, tenor, vol, rate, dividend_yield, is_call
+    )
+    d1, d2 = _d1_d2(spot, strike, tenor, vol, rate, q)
+    sqrt_t = np.sqrt(tenor)
+    carry = np.exp(-q * tenor)
+    discount = np.exp(-rate * tenor)
+    pdf = _norm_pdf(d1)
+    sign = np.where(is_call, 1.0, -1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma = carry * pdf / (spot * vol * sqrt_t)
+        decay = -spot * carry * pdf * vol / (2 * sqrt_t)
+    return {
+        "delta": sign * carry * _ndtr(sign * d1),
+        "gamma": gamma,
+        "vega": spot * carry * pdf * sqrt_t,
+        "theta": decay
+        - sign * rate * strike * discount * _ndtr(sign * d2)
+        + sign * q * spot * carry * _ndtr(sign * d1),
+        "rho": sign * strike * tenor * discount * _ndtr(sign * d2),
+    }
+
+
+def implied_vol(
+    price,
+    spot,
+    strike,
+    tenor,
+    rate=RISK_FREE_RATE,
+    dividend_yield=0.0,
+    is_call=True,
+    tol=1e-8,
+    max_iter=100,
+):
+    """Solves Black-Scholes for vol, for every price at once.
+
+    Runs Newton steps on all contracts together and falls back to bisection
+    inside a bracket wherever a step would leave it, so every contract
+    converges. Prices outside the no-arbitrage bounds give NaN. A scalar
+    price gives a float.
+    """
+    arrays = np.broadcast_arrays(
+        np.asarray(price, dtype=float),
+        *_inputs(spot, strike, tenor, 0.0, rate, dividend_yield, is_call)
+    )
+    shape = arrays[0].shape
+    price, spot, strike, tenor, _, rate, q, is_call = [
+        np.array(a, ndmin=1) for a in arrays
+    ]
+    forward = spot * np.exp(-q * tenor)
+    discounted = strike * np.exp(-rate * tenor)
+    lower = np.where(
+        is_call,
+        np.maximum(forward - discounted, 0),
+        np.maximum(discounted - forward, 0),
+    )
+    upper = np.where(is_call, forward, discounted)
+    valid = (price > lower) & (price < upper) & (tenor > 0)
+
+    lo = np.full(spot.shape, MIN_VOL)
+    hi = np.full(spot.shape, MAX_VOL)
+    # Brenner-Subrahmanyam starting point.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vol = np.sqrt(2 * np.pi / tenor) * price / spot
+    vol = np.where(np.isfinite(vol), np.clip(vol, 0.05, 1.0), 0.3)
+    active = valid.copy()
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        idx = np.flatnonzero(active)
+        args = (spot[idx], strike[idx], tenor[idx])
+        diff = (
+            black_scholes(*args, vol[idx], rate[idx], q[idx], is_call[idx]) - price[idx]
+        )
+        vega = greeks(*args, vol[idx], rate[idx], q[idx], is_call[idx])["vega"]
+        lo[idx] = np.where(diff < 0, vol[idx], lo[idx])
+        hi[idx] = np.where(diff > 0, vol[idx], hi[idx])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = vol[idx] - diff / vega
+        inside = np.isfinite(step) & (step > lo[idx]) & (step < hi[idx])
+        # Contracts already within tol keep their vol, or refine it with a
+        # small last Newton step. Where vega is ~0 the step (or a bisection)
+        # would move them far from their price.
+        converged = np.abs(diff) <= tol
+        refine = inside & (np.abs(step - vol[idx]) < 0.01 * vol[idx])
+        step = np.where(inside, step, 0.5 * (lo[idx] + hi[idx]))
+        vol[idx] = np.where(converged & ~refine, vol[idx], step)
+        active[idx] = ~converged & (hi[idx] - lo[idx] > tol * 1e-3)
+    result = np.where(valid, vol, np.nan).reshape(shape)
+    return float(result) if result.ndim == 0 else result
+
+
+def tenors(expiry, valuation_date=None):
+    "Years from valuation_date (default: today) to each expiry."
+    if valuation_date is None:
+        valuation_date = pd.Timestamp.today().normalize()
+    days = (pd.DatetimeIndex(expiry) - pd.Timestamp(valuation_date)).days
+    return days.to_numpy() / DAYS_PER_YEAR
+
+
+def chain_inputs(chain, valuation_date=None):
+    """Returns strike, tenor, is_call and price arrays for a chain frame.
+
+    The price is the Bid/Ask mid where both are quoted, else Last.
+    """
+    index = chain.index
+    strike = index.get_level_values("Strike").to_numpy(dtype=float)
+    tenor = tenors(index.get_level_values("Expiry"), valuation_date)
+    is_call = index.get_level_values("Type") == "calls"
+    bid = chain["Bid"].to_numpy(dtype=float)
+    ask = chain["Ask"].to_numpy(dtype=float)
+    mid = np.where(
+        (bid > 0) & (ask > 0), 0.5 * (bid + ask), chain["Last"].to_numpy(dtype=float)
+    )
+    return strike, tenor, is_call, mid
+
+
+def chain_analytics(
+    chain, spot, vol, rate=RISK_FREE_RATE, dividend_yield=0.0, valuation_date=None
+):
+    """Implied vols and Greeks for an OptionChain-style frame.
+
+    Uses the Bid/Ask mid where both are quoted, else Last, with tenors
+    measured from valuation_date (default: today). ``vol`` prices the
+    ``Model`` column; Greeks are taken at each contract's implied vol.
+    """
+    strike, tenor, is_call, mid = chain_inputs(chain, valuation_date)
+    iv = implied_vol(mid, spot, strike, tenor, rate, dividend_yield, is_call)
+    result = pd.DataFrame(
+        {
+            "Mid": mid,
+            "Tenor": tenor,
+            "Implied_Vol": iv,
+            "Model": black_scholes(
+                spot, strike, tenor, vol, rate, dividend_yield, is_call
+            ),
+        },
+        index=chain.index,
+    )
+    for name, values in greeks(
+        spot, strike, tenor, iv, rate, dividend_yield, is_call
+    ).items():
+        result[name.capitalize()] = values
+    return result
@@ -0,0 +1,60 @@
+import json
+
+import pandas as pd
+from pandas import DataFrame, Series
+# The package first: its __init__ imports the yahoo readers, and a thread
+# importing a reader directly meanwhile would deadlock on the import locks.
+import pandas_datareader  # noqa: F401
+from pandas_datareader.yahoo.quotes import YahooQuotesReader
+import requests
+
+QUOTE_BATCH_SIZE = 200
+
+
+class FixedYahooQuotesReader(YahooQuotesReader):
+    def __init__(self, *args, crumb=None, provider=None, **kwargs):
+        super(FixedYahooQuotesReader, self).__init__(*args, **kwargs)
+        self.crumb = crumb
+        self.provider = provider
+    def params(self, symbol):
+        params = super().params(symbol)
+        params.update({"crumb": self.crumb})
+        return params
+    def _get_response(self, url, params=None, headers=None):
+        response = self.session.get(
+            url, params=params, headers=headers or self.headers, timeout=self.timeout
+        )
+        if response.status_code == requests.codes.ok:
+            return response
+        if response.status_code == requests.codes.unauthorized and self.provider:
+            # Stale crumb: get a new one and retry with it.
+            self.crumb = self.provider.refresh_crumb(self.crumb)
+            params = dict(params, crumb=self.crumb)
+        return super()._get_response(url, params=params, headers=headers)
+    def read(self):
+        if isinstance(self.symbols, str):
+            return self._read_one_data(self.url, self.params(self.symbols))
+        # The quote endpoint takes a comma separated symbol list, so request
+        # whole chunks instead of one symbol at a time.
+        symbols = list(self.symbols)
+        frames = []
+        for i in range(0, len(symbols), QUOTE_BATCH_SIZE):
+            chunk = ",".join(symbols[i:i + QUOTE_BATCH_SIZE])
+            out = self._read_url_as_StringIO(self.url, params=self.params(chunk))
+            frames.append(self._read_frame(out))
+        return pd.concat(frames) if frames else DataFrame()
+
+    def _parse_results(self, out):
+        results = json.loads(out.read())["quoteResponse"]["result"]
+        for data in results:
+            data["price"] = data["regularMarketPrice"]
+        return results
+
+    def _read_frame(self, out):
+        results = self._parse_results(out)
+        return DataFrame(results).set_index("symbol") if results else DataFrame()
+
+    def _read_lines(self, out):
+        data = self._parse_results(out)[0]
+        idx = data.pop('symbol')
+        return Series(data)
@@ -0,0 +1,552 @@
+"""Yahoo without the network: fixture record/replay and a local stand-in.
+
+``ReplaySession`` is a drop-in for the session ``Equity`` uses. Pointed at
+a fixture directory it answers every request from responses recorded
+there; pointed at a ``YahooStandIn`` it talks to a local HTTP server that
+serves deterministic synthetic quotes, quoteSummary, crumb, chart history
+and option chains. Either way price history is read through the same
+session, so nothing reaches Yahoo.
+"""
+
+import base64
+import datetime
+import hashlib
+import http.server
+import json
+import os
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit
+import zlib
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from . import pricing
+from .session import HEADERS, POOL_CONNECTIONS, POOL_MAXSIZE
+
+CHART_URL = "https://query2.finance.yahoo.com/v8/finance/chart/{ticker}"
+# Crumbs differ per process and period2 is "now"; neither identifies a fixture.
+IGNORED_PARAMETERS = ("crumb", "period2")
+STANDIN_START = "2010-01-04"
+STANDIN_END = "2024-12-31"
+STANDIN_VOL = 0.3
+STANDIN_TZ = "America/New_York"
+
+
+class MissingFixture(LookupError):
+    "Raised in replay mode for a request that was never recorded."
+
+
+def fixture_key(request, ignored=IGNORED_PARAMETERS):
+    "Identifies a request by method, host, path and query minus ``ignored``."
+    url = urlsplit(request.url)
+    params = sorted(
+        (k, v)
+        for k, v in parse_qsl(url.query, keep_blank_values=True)
+        if k not in ignored
+    )
+    query = urlencode(params)
+    return "%s %s%s?%s" % (request.method, url.netloc, url.path, query)
+
+
+class RecordReplayAdapter(BaseAdapter):
+    """Serves responses from JSON fixtures in ``path``.
+
+    With an ``upstream`` adapter, requests without a fixture are forwarded
+    to it and the response is recorded; without one they raise
+    ``MissingFixture``.
+    """
+
+    def __init__(self, path, upstream=None, ignored=IGNORED_PARAMETERS):
+        super(RecordReplayAdapter, self).__init__()
+        self.path = os.path.expanduser(path)
+        self.upstream = upstream
+        self.ignored = ignored
+
+    def _file(self, key):
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+        return os.path.join(self.path, name + ".json")
+
+    def send(self, request, **kwargs):
+        key = fixture_key(request, self.ignored)
+        path = self._file(key)
+        try:
+            with open(path) as f:
+                fixture = json.load(f)
+        except IOError:
+            if self.upstream is None:
+                raise MissingFixture(key)
+            response = self.upstream.send(request, **kwargs)
+            self._record(path, key, response)
+            return response
+        return self._response(request, fixture)
+
+    def _record(self, path, key, response):
+        try:
+            body, encoding = response.content.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(response.content).decode(), "base64"
+        fixture = {
+            "key": key,
+            "status": response.status_code,
+            "headers": {"Content-Type": response.headers.get("Content-Type", "")},
+            "encoding": encoding,
+            "body": body,
+        }
+        os.makedirs(self.path, exist_ok=True)
+        with open(path + ".tmp", "w") as f:
+            json.dump(fixture, f)
+        os.replace(path + ".tmp", path)
+
+    @staticmethod
+    def _response(request, fixture):
+        response = requests.Response()
+        response.status_code = fixture["status"]
+        response.headers.update(fixture["headers"])
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+        if fixture["encoding"] == "base64":
+            response._content = base64.b64decode(fixture["body"])
+        else:
+            response._content = fixture["body"].encode("utf-8")
+        return response
+
+    def close(self):
+        if self.upstream is not None:
+            self.upstream.close()
+
+
+class StandInAdapter(HTTPAdapter):
+    "Sends every request to a YahooStandIn instead of the host in its URL."
+
+    def __init__(self, standin):
+        super(StandInAdapter, self).__init__(
+            pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE
+        )
+        self.standin = standin
+
+    def send(self, request, **kwargs):
+        url = urlsplit(request.url)
+        request = request.copy()
+        request.url = (
+            self.standin.url + url.path + ("?" + url.query if url.query else "")
+        )
+        return super(StandInAdapter, self).send(request, **kwargs)
+
+
+class ReplaySession(requests.Session):
+    """Session that answers Yahoo requests without the network.
+
+    ``path`` replays fixtures recorded there; with ``record=True`` missing
+    ones are fetched (from ``standin`` if given, else Yahoo) and saved.
+    ``standin`` alone sends everything to a local YahooStandIn.
+    """
+
+    def __init__(self, path=None, record=False, standin=None):
+        if path is None and standin is None:
+            raise ValueError("ReplaySession needs a fixture path or a stand-in")
+        super(ReplaySession, self).__init__()
+        self.headers.update(HEADERS)
+        if standin is not None:
+            adapter = StandInAdapter(standin)
+        else:
+            adapter = HTTPAdapter(
+                pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE
+            )
+        if path is not None:
+            adapter = RecordReplayAdapter(path, upstream=adapter if record else None)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def ticker(self, symbol):
+        "Price history source for Equity, read through this session."
+        return ChartTicker(symbol, self)
+
+
+class ChartTicker(object):
+    """The parts of ``yf.Ticker`` Equity uses, read from the v8 chart API.
+
+    ``history`` returns the unadjusted bars plus ``Adj Close``, like
+    ``yf.Ticker.history(auto_adjust=False, actions=True)``.
+    """
+
+    def __init__(self, ticker, session):
+        self.ticker = ticker
+        self.session = session
+
+    def _chart(self, start=None):
+        period1 = 0 if start is None else int(pd.Timestamp(start).timestamp())
+        response = self.session.get(
+            CHART_URL.format(ticker=self.ticker),
+            params={
+                "period1": period1,
+                "period2": int(time.time()),
+                "interval": "1d",
+                "events": "div,splits",
+            },
+        )
+        response.raise_for_status()
+        return response.json()["chart"]["result"][0]
+
+    @staticmethod
+    def _dates(timestamps, tz):
+        index = pd.to_datetime(timestamps, unit="s", utc=True).tz_convert(tz)
+        return index.normalize().rename("Date")
+
+    def _events(self, chart, kind, value):
+        tz = chart["meta"]["exchangeTimezoneName"]
+        events = sorted(
+            chart.get("events", {}).get(kind, {}).values(), key=lambda e: e["date"]
+        )
+        return pd.Series(
+            [value(e) for e in events],
+            index=self._dates([e["date"] for e in events], tz),
+            dtype=float,
+        )
+
+    @staticmethod
+    def _split_ratio(event):
+        return event["numerator"] / event["denominator"]
+
+    def history(self, start=None, **kwargs):
+        chart = self._chart(start)
+        index = self._dates(
+            chart.get("timestamp", []), chart["meta"]["exchangeTimezoneName"]
+        )
+        quote = chart["indicators"]["quote"][0]
+        frame = pd.DataFrame(
+            {
+                "Open": quote["open"],
+                "High": quote["high"],
+                "Low": quote["low"],
+                "Close": quote["close"],
+                "Adj Close": chart["indicators"]["adjclose"][0]["adjclose"],
+                "Volume": quote["volume"],
+            },
+            index=index,
+            dtype=float,
+        )
+        frame["Dividends"] = self._events(chart, "dividends", lambda e: e["amount"])
+        frame["Stock Splits"] = self._events(chart, "splits", self._split_ratio)
+        return frame.fillna({"Dividends": 0.0, "Stock Splits": 0.0})
+
+    def get_dividends(self):
+        return self._events(self._chart(), "dividends", lambda e: e["amount"])
+
+    def get_splits(self):
+        return self._events(self._chart(), "splits", self._split_ratio)
+
+
+def _third_friday(year, month):
+    first = datetime.date(year, month, 1)
+    return first + datetime.timedelta(days=(4 - first.weekday()) % 7 + 14)
+
+
+class YahooStandIn(object):
+    """Local HTTP server answering the Yahoo endpoints pandas_finance uses.
+
+    Every symbol gets deterministic synthetic data: daily bars from
+    ``STANDIN_START`` to ``STANDIN_END`` with a quarterly dividend, and an
+    option chain over the three monthly expiries after today, priced at
+    ``STANDIN_VOL`` and the quote's dividend yield as of today, so option
+    analytics work at their default valuation date. Symbols in ``non_payers`` pay no dividend.
+    ``delay`` adds a fixed latency per request. Request paths are recorded
+    in ``requests``. Use as a context manager, or call ``start`` and
+    ``stop``.
+    """
+
+    def __init__(self, delay=0.0, non_payers=()):
+        self.delay = delay
+        self.non_payers = frozenset(non_payers)
+        self.requests = []
+        self._histories = {}
+        self._lock = threading.Lock()
+        self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        standin = self
+
+        class Handler(_Handler):
+            pass
+
+        Handler.standin = standin
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return "http://%s:%d" % (host, port)
+
+    def session(self):
+        "A ReplaySession sending every request to this server."
+        return ReplaySession(standin=self)
+
+    def history(self, symbol):
+        "The synthetic daily bars served for symbol."
+        with self._lock:
+            if symbol not in self._histories:
+                self._histories[symbol] = self._make_history(
+                    symbol, symbol not in self.non_payers
+                )
+            return self._histories[symbol]
+
+    @staticmethod
+    def _make_history(symbol, pays_dividends=True):
+        rng = np.random.RandomState(zlib.crc32(symbol.encode("utf-8")))
+        # Weekdays by mask: bdate_range builds business days one at a time.
+        index = pd.date_range(STANDIN_START, STANDIN_END, name="Date")
+        index = index[index.dayofweek < 5].tz_localize(STANDIN_TZ)
+        days = len(index)
+        close = 50 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, days)))
+        dividends = np.zeros(days)
+        if pays_dividends:
+            dividends[63::63] = np.round(close[62:-1:63] * 0.005, 2)
+        # Back-adjust for each dividend, as Yahoo's adjclose does.
+        factor = np.cumprod((1 - dividends / np.roll(close, 1))[::-1])[::-1]
+        adj_close = close * np.append(factor[1:], 1.0)
+        return pd.DataFrame(
+            {
+                "Open": close * (1 + rng.normal(0, 0.005, days)),
+                "High": close * 1.01,
+                "Low": close * 0.99,
+                "Close": close,
+                "Adj Close": adj_close,
+                "Volume": rng.randint(1000000, 5000000, days).astype(float),
+                "Dividends": dividends,
+                "Stock Splits": 0.0,
+            },
+            index=index,
+        )
+
+    def respond(self, path, params):
+        "Returns (status, content type, body) for a request."
+        self.requests.append(path)
+        if self.delay:
+            time.sleep(self.delay)
+        parts = path.strip("/").split("/")
+        if path.startswith("/v1/test/getcrumb"):
+            return 200, "text/plain", "standin-crumb"
+        if path.startswith("/v7/finance/quote"):
+            return self._json(self._quotes(params["symbols"].split(",")))
+        if path.startswith("/v10/finance/quoteSummary/"):
+            return self._json(self._quote_summary(parts[-1]))
+        if path.startswith("/v8/finance/chart/"):
+            return self._json(self._chart(parts[-1], params))
+        if path.startswith("/v7/finance/options/"):
+            return self._json(self._options(parts[-1], params.get("date")))
+        if path == "/":
+            return 200, "text/plain", ""
+        return 404, "application/json", json.dumps({"error": "not found"})
+
+    @staticmethod
+    def _json(payload):
+        return 200, "application/json", json.dumps(payload)
+
+    def _quote(self, symbol):
+        history = self.history(symbol)
+        last = history.iloc[-1]
+        yearly = history["Dividends"].iloc[-252:].sum()
+        return {
+            "symbol": symbol,
+            "regularMarketPrice": float(last["Close"]),
+            "regularMarketTime": int(history.index[-1].timestamp()) + 57600,
+            "marketCap": float(last["Close"]) * 1e9,
+            "sharesOutstanding": 1000000000,
+            "currency": "USD",
+            "longName": symbol + " Inc.",
+            "marketState": "CLOSED",
+            "forwardAnnualDividendRate": float(yearly),
+            "trailingAnnualDividendRate": float(yearly),
+        }
+
+    def _quotes(self, symbols):
+        return {
+            "quoteResponse": {
+                "result": [self._quote(s) for s in symbols],
+                "error": None,
+            }
+        }
+
+    def _quote_summary(self, symbol):
+        quote = self._quote(symbol)
+
+        def raw(value):
+            return {"raw": value, "fmt": str(value)}
+
+        return {
+            "quoteSummary": {
+                "result": [
+                    {
+                        "assetProfile": {
+                            "sector": "Technology",
+                            "industry": "Consumer Electronics",
+                            "fullTimeEmployees": 100000,
+                            "companyOfficers": [],
+                        },
+                        "summaryDetail": {
+                            "dividendRate": raw(quote["forwardAnnualDividendRate"]),
+                            "trailingAnnualDividendRate": raw(
+                                quote["trailingAnnualDividendRate"]
+                            ),
+                        },
+                        "defaultKeyStatistics": {
+                            "sharesOutstanding": raw(quote["sharesOutstanding"]),
+                        },
+                        "price": {
+                            "longName": quote["longName"],
+                            "currency": quote["currency"],
+                            "marketCap": raw(quote["marketCap"]),
+                        },
+                    }
+                ],
+                "error": None,
+            }
+        }
+
+    def _chart(self, symbol, params):
+        history = self.history(symbol)
+        stamps = history.index.asi8 // 10**9 + 34200  # the 9:30 open
+        period1 = int(params.get("period1", 0))
+        period2 = int(params.get("period2", stamps[-1] + 1))
+        bars = history[(stamps >= period1) & (stamps < period2)]
+        stamps = stamps[(stamps >= period1) & (stamps < period2)]
+        dividends = {
+            str(ts): {"amount": float(amount), "date": int(ts)}
+            for ts, amount in zip(stamps, bars["Dividends"])
+            if amount
+        }
+        return {
+            "chart": {
+                "result": [
+                    {
+                        "meta": {
+                            "currency": "USD",
+                            "symbol": symbol,
+                            "exchangeTimezoneName": STANDIN_TZ,
+                            "instrumentType": "EQUITY",
+                        },
+                        "timestamp": stamps.tolist(),
+                        "events": {"dividends": dividends},
+                        "indicators": {
+                            "quote": [
+                                {
+                                    "open": bars["Open"].tolist(),
+                                    "high": bars["High"].tolist(),
+                                    "low": bars["Low"].tolist(),
+                                    "close": bars["Close"].tolist(),
+                                    "volume": bars["Volume"].astype(int).tolist(),
+                                }
+                            ],
+                            "adjclose": [{"adjclose": bars["Adj Close"].tolist()}],
+                        },
+                    }
+                ],
+                "error": None,
+            }
+        }
+
+    @staticmethod
+    def _expiries():
+        today = pd.Timestamp.today().normalize()
+        months = [today + pd.DateOffset(months=i) for i in range(1, 4)]
+        return [_third_friday(m.year, m.month) for m in months]
+
+    def _options(self, symbol, date=None):
+        quote = self._quote(symbol)
+        spot = quote["regularMarketPrice"]
+        expiries = self._expiries()
+        epoch = [int(pd.Timestamp(e, tz="UTC").timestamp()) for e in expiries]
+        expiry = expiries[epoch.index(int(date))] if date else expiries[0]
+        tenor = (expiry - datetime.date.today()).days / pricing.DAYS_PER_YEAR
+        step = max(round(spot / 20), 1)
+        strikes = step * np.arange(round(spot / step) - 5, round(spot / step) + 6)
+
+        # At the dividend yield the quote implies, as Equity.dividend_yield.
+        dividend_yield = quote["forwardAnnualDividendRate"] / spot
+
+        def contracts(kind):
+            prices = pricing.black_scholes(
+                spot,
+                strikes,
+                tenor,
+                STANDIN_VOL,
+                dividend_yield=dividend_yield,
+                is_call=kind == "calls",
+            )
+            return [
+                {
+                    "contractSymbol": "%s%s%s%08d"
+                    % (symbol, expiry.strftime("%y%m%d"), kind[0].upper(), k * 1000),
+                    "strike": float(k),
+                    "lastPrice": float(p),
+                    "bid": float(max(p - 0.05, 0)),
+                    "ask": float(p + 0.05),
+                    "change": 0.0,
+                    "percentChange": 0.0,
+                    "volume": 10,
+                    "openInterest": 100,
+                    "impliedVolatility": STANDIN_VOL,
+                    "lastTradeDate": quote["regularMarketTime"],
+                    "expiration": int(pd.Timestamp(expiry, tz="UTC").timestamp()),
+                }
+                for k, p in zip(strikes, prices)
+            ]
+
+        return {
+            "optionChain": {
+                "result": [
+                    {
+                        "underlyingSymbol": symbol,
+                        "expirationDates": epoch,
+                        "strikes": [float(k) for k in strikes],
+                        "quote": quote,
+                        "options": [
+                            {
+                                "expirationDate": epoch[expiries.index(expiry)],
+                                "calls": contracts("calls"),
+                                "puts": contracts("puts"),
+                            }
+                        ],
+                    }
+                ],
+                "error": None,
+            }
+        }
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    standin = None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        status, content_type, body = self.standin.respond(url.path, params)
+        body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
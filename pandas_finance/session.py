@@ -0,0 +1,202 @@
+import contextlib
+import copy
+import datetime
+import functools
+import os
+import threading
+
+from .instrument import instrument_session, traced
+from .throttle import HOST_RATE, SingleFlight, ThrottledAdapter
+
+CACHE_HRS = 1
+CACHE_NAME = "pf-cache"
+QUOTE_TTL = datetime.timedelta(seconds=15)
+OPTIONS_TTL = datetime.timedelta(minutes=5)
+PROFILE_TTL = datetime.timedelta(days=1)
+# HTTP cache lifetime per Yahoo endpoint; everything else gets CACHE_HRS.
+EXPIRE_AFTER = {
+    "*/v7/finance/quote": QUOTE_TTL,
+    "*/v7/finance/options/": OPTIONS_TTL,
+    "*/v10/finance/quoteSummary/": PROFILE_TTL,
+}
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 32
+WARMUP_URL = "https://fc.yahoo.com"
+CRUMB_URL = "https://query1.finance.yahoo.com/v1/test/getcrumb"
+UNAUTHORIZED = 401
+# Fixture directory to replay Yahoo from instead of the network (see replay).
+REPLAY_ENV = "PANDAS_FINANCE_REPLAY"
+RECORD_ENV = "PANDAS_FINANCE_RECORD"
+HEADERS = {
+    "Connection": "keep-alive",
+    "Expires": str(-1),
+    "Upgrade-Insecure-Requests": str(1),
+    # Google Chrome:
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    ),
+}
+
+
+def make_session(backend=None, rate=HOST_RATE):
+    """Builds the cached, connection pooled session used by default.
+
+    ``backend`` picks where responses are cached; see
+    ``httpcache.make_cache``. Responses expire per ``EXPIRE_AFTER``.
+    Requests reaching the network are limited to ``rate`` per second per
+    host and retried on 429s; see ``throttle.ThrottledAdapter``.
+
+    If ``PANDAS_FINANCE_REPLAY`` names a fixture directory, returns a
+    ``ReplaySession`` on it instead, recording missing fixtures when
+    ``PANDAS_FINANCE_RECORD`` is set.
+    """
+    replay = os.environ.get(REPLAY_ENV)
+    if replay:
+        from .replay import ReplaySession
+
+        return ReplaySession(replay, record=bool(os.environ.get(RECORD_ENV)))
+    from requests_cache import CachedSession
+
+    from .httpcache import make_cache
+
+    session = CachedSession(
+        backend=make_cache(backend, CACHE_NAME),
+        expire_after=datetime.timedelta(hours=CACHE_HRS),
+        urls_expire_after=EXPIRE_AFTER,
+        # Crumbs differ per process; keep them out of the cache key.
+        ignored_parameters=["crumb"],
+    )
+    adapter = ThrottledAdapter(
+        rate, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+def coalesce_session(session):
+    """Makes concurrent identical GETs through session share one request.
+
+    Wraps ``session.send``: while a GET for a URL is in flight, other
+    threads asking for the same URL wait for it and get a copy of its
+    response instead of sending their own.
+    """
+    if getattr(session, "_pf_coalesced", False):
+        return session
+    send = session.send
+    flight = SingleFlight()
+
+    @functools.wraps(send)
+    def coalesced_send(request, **kwargs):
+        if request.method != "GET" or kwargs.get("stream"):
+            return send(request, **kwargs)
+        return copy.copy(flight.do(request.url, lambda: send(request, **kwargs)))
+
+    session.send = coalesced_send
+    session._pf_coalesced = True
+    return session
+
+
+def _prepare(session):
+    # Coalesce outside the instrumentation, so only the request actually
+    # sent is recorded as an http span.
+    return coalesce_session(instrument_session(session))
+
+
+def _cache_disabled(session):
+    if hasattr(session, "cache_disabled"):
+        return session.cache_disabled()
+    return contextlib.nullcontext()
+
+
+class SessionProvider(object):
+    """Hands out one session and its Yahoo crumb to every Equity using it.
+
+    Nothing touches the network until the crumb is first needed, and the
+    crumb is fetched once no matter how many threads ask for it.
+    """
+
+    def __init__(self, session=None):
+        self._session = session if session is None else _prepare(session)
+        self._crumb = None
+        self._lock = threading.RLock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = _prepare(make_session())
+        return self._session
+
+    @property
+    def crumb(self):
+        if self._crumb is None:
+            with self._lock:
+                if self._crumb is None:
+                    self._crumb = self._fetch_crumb()
+        return self._crumb
+
+    def set_crumb(self, crumb, replace=True):
+        "Uses crumb from now on; with ``replace=False``, only if none is set."
+        with self._lock:
+            if replace or self._crumb is None:
+                self._crumb = crumb
+
+    def refresh_crumb(self, stale=None):
+        """Fetches a new crumb, unless another caller already replaced ``stale``."""
+        with self._lock:
+            if self._crumb is None or self._crumb == stale:
+                self._crumb = self._fetch_crumb()
+            return self._crumb
+
+    def get(self, url, params=None, **kwargs):
+        """GETs url on the session with the crumb.
+
+        A 401 means the crumb went stale: it is refreshed and the request
+        retried once, as ``FixedYahooQuotesReader`` does for quotes.
+        """
+        params = dict(params or {}, crumb=self.crumb)
+        response = self.session.get(url, params=params, **kwargs)
+        if response.status_code == UNAUTHORIZED:
+            params["crumb"] = self.refresh_crumb(params["crumb"])
+            response = self.session.get(url, params=params, **kwargs)
+        return response
+
+    @traced("SessionProvider.crumb")
+    def _fetch_crumb(self):
+        session = self.session
+        with _cache_disabled(session):
+            # The warm-up request sets the cookie the crumb is tied to.
+            session.get(WARMUP_URL)
+            return session.get(CRUMB_URL).text
+
+
+_lock = threading.Lock()
+_default_provider = None
+
+
+def get_provider(session=None):
+    "Returns the provider for session, or the process-wide default one."
+    global _default_provider
+    with _lock:
+        if session is None:
+            if _default_provider is None:
+                _default_provider = SessionProvider()
+            return _default_provider
+        if _default_provider is not None and session is _default_provider._session:
+            return _default_provider
+        # Kept on the session, so it is collected along with it.
+        provider = getattr(session, "_pf_provider", None)
+        if provider is None:
+            provider = session._pf_provider = SessionProvider(session)
+        return provider
+
+
+def set_default_session(session):
+    "Makes session the one used by every Equity not given its own."
+    global _default_provider
+    with _lock:
+        _default_provider = SessionProvider(session)
@@ -0,0 +1,103 @@
+import math
+
+import pandas as pd
+
+
+def _get(quote, key, default=None):
+    value = quote.get(key, default)
+    if isinstance(value, float) and math.isnan(value):
+        return default
+    return value
+
+
+class QuoteSnapshot(object):
+    """Immutable quote fields of one ticker, all from the same response.
+
+    Built by ``Equity.snapshot()``. Fields missing from the quote are None.
+    """
+
+    __slots__ = (
+        "ticker",
+        "price",
+        "market_state",
+        "currency",
+        "market_cap",
+        "shares_os",
+        "name",
+        "annual_dividend",
+        "time",
+    )
+
+    def __init__(
+        self,
+        ticker,
+        price,
+        market_state=None,
+        currency=None,
+        market_cap=None,
+        shares_os=None,
+        name=None,
+        annual_dividend=0,
+        time=None,
+    ):
+        fields = locals()
+        for attr in self.__slots__:
+            object.__setattr__(self, attr, fields[attr])
+
+    @classmethod
+    def from_quote(cls, ticker, quote):
+        "Reads the fields out of a quote Series (or dict) from the v7 endpoint."
+        if "forwardAnnualDividendRate" in quote:
+            annual_dividend = quote["forwardAnnualDividendRate"]
+        elif "trailingAnnualDividendRate" in quote:
+            annual_dividend = quote["trailingAnnualDividendRate"]
+        else:
+            annual_dividend = 0
+        market_cap = _get(quote, "marketCap")
+        shares_os = _get(quote, "sharesOutstanding")
+        time = _get(quote, "regularMarketTime")
+        return cls(
+            ticker,
+            quote["price"],
+            _get(quote, "marketState"),
+            _get(quote, "currency"),
+            None if market_cap is None else float(market_cap),
+            None if shares_os is None else int(shares_os),
+            _get(quote, "longName"),
+            annual_dividend,
+            None if time is None else pd.Timestamp(time, unit="s", tz="UTC"),
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError("QuoteSnapshot is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("QuoteSnapshot is immutable")
+
+    def __reduce__(self):
+        return QuoteSnapshot, tuple(getattr(self, attr) for attr in self.__slots__)
+
+    def __eq__(self, other):
+        if not isinstance(other, QuoteSnapshot):
+            return NotImplemented
+        return self.__reduce__() == other.__reduce__()
+
+    def __hash__(self):
+        return hash(self.__reduce__()[1])
+
+    def __repr__(self):
+        return "<QuoteSnapshot %s %s>" % (self.ticker, self.price)
+
+    @property
+    def closed(self):
+        "Market is closed or open"
+        return (self.market_state or "").lower() == "closed"
+
+    @property
+    def dividend_yield(self):
+        return self.annual_dividend / self.price
+
+    def as_series(self):
+        return pd.Series(
+            [getattr(self, attr) for attr in self.__slots__], index=self.__slots__
+        )
@@ -0,0 +1,152 @@
+import json
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+STORE_PATH = os.path.join(os.path.expanduser("~"), ".pandas_finance", "prices")
+ACTION_COLUMNS = ("Dividends", "Stock Splits")
+
+
+def _utc_nanos(index):
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.asi8
+
+
+class PriceStore(object):
+    """Daily price history kept on disk, one directory per ticker.
+
+    Each column is a flat binary file read back through ``np.memmap``, so
+    new bars are appended to the end of the files instead of rewriting the
+    whole history. ``meta.json`` records the dtypes, the row count and when
+    the ticker was last brought up to date.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+
+    def _dir(self, ticker):
+        return os.path.join(self.path, ticker)
+
+    def _meta(self, ticker):
+        try:
+            with open(os.path.join(self._dir(ticker), "meta.json")) as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return None
+
+    def _write_meta(self, ticker, meta):
+        path = os.path.join(self._dir(ticker), "meta.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(path + ".tmp", path)
+
+    def __contains__(self, ticker):
+        return self._meta(ticker) is not None
+
+    def read(self, ticker):
+        "Returns the stored history for ticker, or None if nothing is stored."
+        meta = self._meta(ticker)
+        if meta is None:
+            return None
+        rows = meta["rows"]
+        directory = self._dir(ticker)
+
+        def column(name, dtype):
+            if rows == 0:
+                return np.empty(0, dtype=dtype)
+            return np.memmap(
+                os.path.join(directory, name + ".bin"), dtype=dtype, mode="r", shape=(rows,)
+            )
+
+        index = pd.DatetimeIndex(column("index", "int64").astype("datetime64[ns]"))
+        if meta["tz"]:
+            index = index.tz_localize("UTC").tz_convert(meta["tz"])
+        index.name = meta["index_name"]
+        return pd.DataFrame(
+            {name: column(name, dtype) for name, dtype in meta["columns"]}, index=index
+        )
+
+    def write(self, ticker, frame):
+        "Replaces everything stored for ticker with frame."
+        with self._lock:
+            directory = self._dir(ticker)
+            shutil.rmtree(directory, ignore_errors=True)
+            os.makedirs(directory)
+            meta = {
+                "columns": [[str(c), frame[c].dtype.str] for c in frame.columns],
+                "tz": str(frame.index.tz) if frame.index.tz is not None else None,
+                "index_name": frame.index.name,
+                "rows": 0,
+            }
+            self._append(ticker, meta, frame)
+
+    def append(self, ticker, frame):
+        "Appends bars newer than the stored ones, replacing any that overlap."
+        with self._lock:
+            meta = self._meta(ticker)
+            if len(frame) and meta["rows"]:
+                index = np.memmap(
+                    os.path.join(self._dir(ticker), "index.bin"),
+                    dtype="int64", mode="r", shape=(meta["rows"],),
+                )
+                first = _utc_nanos(frame.index[:1])[0]
+                meta["rows"] = int(np.searchsorted(index, first))
+            self._append(ticker, meta, frame)
+
+    def _append(self, ticker, meta, frame):
+        directory = self._dir(ticker)
+        rows = meta["rows"]
+        columns = [("index", "int64", _utc_nanos(frame.index))]
+        columns += [
+            (name, dtype, frame[name].to_numpy(dtype=dtype)) for name, dtype in meta["columns"]
+        ]
+        for name, dtype, values in columns:
+            path = os.path.join(directory, name + ".bin")
+            with open(path, "ab") as f:
+                # Drop rows past the committed count (overlap or a torn write).
+                f.truncate(rows * np.dtype(dtype).itemsize)
+                f.write(np.ascontiguousarray(values).tobytes())
+        meta["rows"] = rows + len(frame)
+        meta["updated"] = time.time()
+        self._write_meta(ticker, meta)
+
+    def delete(self, ticker):
+        with self._lock:
+            shutil.rmtree(self._dir(ticker), ignore_errors=True)
+
+    def load(self, ticker, fetch, start, max_age=None):
+        """Returns the history for ticker, downloading only what is missing.
+
+        ``fetch(start)`` downloads bars from ``start`` onwards. Data refreshed
+        less than ``max_age`` seconds ago is served from disk as is. Otherwise
+        the bars since the last stored date are fetched and appended; if they
+        carry a dividend or split the adjusted history changed, so the whole
+        series is downloaded and rewritten.
+        """
+        meta = self._meta(ticker)
+        if meta is None or meta["rows"] == 0:
+            frame = fetch(start)
+            self.write(ticker, frame)
+            return frame
+        stored = self.read(ticker)
+        if max_age is not None and time.time() - meta.get("updated", 0) < max_age:
+            return stored
+
+        last = stored.index[-1]
+        new = fetch(last.date())
+        new = new[new.index >= last]
+        # The last stored bar is fetched again to be replaced, but its
+        # actions are already in the stored history.
+        actions = [c for c in ACTION_COLUMNS if c in new.columns]
+        if (new.loc[new.index > last, actions].fillna(0) != 0).any().any():
+            frame = fetch(start)
+            self.write(ticker, frame)
+            return frame
+        self.append(ticker, new.reindex(columns=[name for name, _ in meta["columns"]]))
+        return self.read(ticker)
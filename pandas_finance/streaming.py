@@ -0,0 +1,171 @@
+from collections import deque
+import math
+
+from .analytics import TRADING_DAYS
+
+
+class RollingStats(object):
+    """Mean and sample standard deviation of the last ``window`` values.
+
+    Uses Welford's update for values entering the window and its inverse
+    for values leaving it, so each push is O(1). Like ``rolling().std()``,
+    the result is NaN until the window is full or while it holds a NaN.
+    """
+
+    def __init__(self, window):
+        self.window = int(window)
+        self._values = deque()
+        self._nans = 0
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def _add(self, value):
+        if math.isnan(value):
+            self._nans += 1
+            return
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
+
+    def _remove(self, value):
+        if math.isnan(value):
+            self._nans -= 1
+            return
+        self._count -= 1
+        if self._count == 0:
+            self._mean = self._m2 = 0.0
+            return
+        delta = value - self._mean
+        self._mean -= delta / self._count
+        self._m2 -= delta * (value - self._mean)
+
+    def push(self, value):
+        value = float(value)
+        self._values.append(value)
+        self._add(value)
+        if len(self._values) > self.window:
+            self._remove(self._values.popleft())
+
+    def replace_last(self, value):
+        "Replaces the newest value, e.g. when a quote revises the current bar."
+        self._remove(self._values.pop())
+        self._values.append(float(value))
+        self._add(float(value))
+
+    @property
+    def mean(self):
+        if self._nans or len(self._values) < self.window:
+            return math.nan
+        return self._mean
+
+    @property
+    def std(self):
+        if self._nans or len(self._values) < self.window or self._count < 2:
+            return math.nan
+        return math.sqrt(max(self._m2, 0.0) / (self._count - 1))
+
+
+class RollingVWAP(object):
+    "Volume weighted average price of the last ``window`` bars, updated in O(1)."
+
+    def __init__(self, window):
+        self.window = int(window)
+        self._bars = deque()
+        self._value = 0.0
+        self._volume = 0.0
+
+    def push(self, price, volume):
+        bar = (float(price) * float(volume), float(volume))
+        self._bars.append(bar)
+        self._value += bar[0]
+        self._volume += bar[1]
+        if len(self._bars) > self.window:
+            value, volume = self._bars.popleft()
+            self._value -= value
+            self._volume -= volume
+
+    def replace_last(self, price, volume):
+        value, old_volume = self._bars.pop()
+        self._value -= value
+        self._volume -= old_volume
+        self.push(price, volume)
+
+    @property
+    def vwap(self):
+        if not self._volume:
+            return math.nan
+        return self._value / self._volume
+
+
+class EquityStream(object):
+    """Rolling vol, VWAP and cumulative return maintained as bars arrive.
+
+    Seed it with history, then push each new bar or quote. A push carrying
+    the date of the latest bar revises that bar instead of adding one.
+    """
+
+    def __init__(self, days=20, vwap_days=30):
+        self.days = int(days)
+        self.vwap_days = int(vwap_days)
+        self._returns = RollingStats(self.days)
+        self._vwap = RollingVWAP(self.vwap_days)
+        self._base = None
+        self._prev = None
+        self._last = None
+        self.last_date = None
+
+    def seed(self, trading_data):
+        "Loads the trailing windows from a trading_data style frame."
+        if "Adj Close" in trading_data:
+            prices = trading_data["Adj Close"]
+        else:
+            prices = trading_data["Close"]
+        if len(prices):
+            self._base = float(prices.iloc[0])
+        returns = prices.pct_change().iloc[-self.days:]
+        for value in returns:
+            self._returns.push(value)
+        bars = trading_data.iloc[-self.vwap_days:]
+        for price, volume in zip(bars["Close"], bars["Volume"]):
+            self._vwap.push(price, volume)
+        if len(prices) > 1:
+            self._prev = float(prices.iloc[-2])
+        if len(prices):
+            self._last = float(prices.iloc[-1])
+            self.last_date = prices.index[-1]
+        return self
+
+    def push(self, price, volume=0, date=None):
+        "Adds a bar, or revises the latest one if date matches it."
+        price = float(price)
+        if date is not None and date == self.last_date:
+            if self._prev is not None:
+                self._returns.replace_last(price / self._prev - 1)
+            self._vwap.replace_last(price, volume)
+        else:
+            if self._last is not None:
+                self._returns.push(price / self._last - 1)
+            self._vwap.push(price, volume)
+            self._prev = self._last
+            self.last_date = date
+        if self._base is None:
+            self._base = price
+        self._last = price
+        return self
+
+    @property
+    def hist_vol(self):
+        return self._returns.std * math.sqrt(TRADING_DAYS)
+
+    @property
+    def vwap(self):
+        return self._vwap.vwap
+
+    @property
+    def cumulative_return(self):
+        "Return since the first seeded or pushed price."
+        if self._base is None:
+            return math.nan
+        return self._last / self._base - 1
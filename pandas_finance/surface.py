@@ -0,0 +1,139 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from . import pricing
+
+
+class VolSurface(object):
+    """Implied vol surface built from an option chain.
+
+    Each expiry's smile is fitted once from out-of-the-money contracts as a
+    piecewise linear curve in log forward moneyness, flat beyond the quoted
+    strikes. Between expiries, total variance is interpolated linearly in
+    tenor. ``update`` refits only the expiries whose quotes changed, and
+    queries only interpolate between the stored fits.
+
+    Each expiry is fitted against the ``Underlying_Price`` of its own rows,
+    the spot its quotes were taken at, so a spot that moves between
+    refreshes does not refit expiries whose quotes did not move with it.
+    Queries take the forward from the latest ``spot``.
+    """
+
+    def __init__(self, rate=pricing.RISK_FREE_RATE, valuation_date=None):
+        self.rate = rate
+        self.valuation_date = valuation_date
+        self.spot = None
+        self.dividend_yield = None
+        self._fits = {}
+
+    @property
+    def expiries(self):
+        return sorted(self._fits)
+
+    def _forward(self, tenor, spot=None):
+        spot = self.spot if spot is None else spot
+        carry = self.rate - self.dividend_yield
+        return spot * np.exp(carry * np.asarray(tenor, dtype=float))
+
+    def update(self, chain, spot, dividend_yield=0.0):
+        """Refits the expiries of chain whose quotes changed; returns them.
+
+        Expiries are fitted against the chain's Underlying_Price, or
+        ``spot`` where it has none. A new dividend yield moves every
+        implied vol, so it refits everything. Expiries missing from chain
+        are dropped.
+        """
+        if dividend_yield != self.dividend_yield:
+            self._fits = {}
+        self.spot = spot
+        self.dividend_yield = dividend_yield
+        if "Underlying_Price" not in chain.columns:
+            chain = chain.assign(Underlying_Price=spot)
+        elif chain["Underlying_Price"].isna().any():
+            chain = chain.assign(
+                Underlying_Price=chain["Underlying_Price"].fillna(spot)
+            )
+
+        refit = []
+        expiries = set()
+        for expiry, frame in chain.groupby(level="Expiry"):
+            expiry = pd.Timestamp(expiry)
+            expiries.add(expiry)
+            digest = _digest(frame)
+            fit = self._fits.get(expiry)
+            if fit is None or fit[0] != digest:
+                self._fits[expiry] = (digest,) + self._fit(frame)
+                refit.append(expiry)
+        for expiry in set(self._fits) - expiries:
+            del self._fits[expiry]
+        return refit
+
+    def _fit(self, frame):
+        strike, tenor, is_call, mid = pricing.chain_inputs(frame, self.valuation_date)
+        tenor = tenor[0]
+        spot = frame["Underlying_Price"].to_numpy(dtype=float)
+        forward = self._forward(tenor, spot)
+        iv = pricing.implied_vol(
+            mid, spot, strike, tenor, self.rate, self.dividend_yield, is_call
+        )
+        # Out-of-the-money contracts carry the smile: puts below, calls above.
+        use = np.where(strike < forward, ~is_call, is_call) & ~np.isnan(iv)
+        moneyness = np.log(strike[use] / forward[use])
+        order = np.argsort(moneyness)
+        return tenor, moneyness[order], iv[use][order]
+
+    def _smiles(self, moneyness):
+        "Total variance of each fitted expiry at moneyness; expiries x points."
+        fits = [self._fits[expiry] for expiry in self.expiries]
+        fits = [fit for fit in fits if len(fit[2]) and fit[1] > 0]
+        if not fits:
+            raise ValueError("Vol surface has no fitted expiries")
+        tenors = np.array([fit[1] for fit in fits])
+        variance = np.array(
+            [np.interp(moneyness, fit[2], fit[3]) ** 2 * fit[1] for fit in fits]
+        )
+        return tenors, variance
+
+    def vol_by_moneyness(self, moneyness, tenor):
+        """Vol at log forward moneyness ``log(K / F)`` and tenor in years.
+
+        Both arguments broadcast.
+        """
+        moneyness, tenor = np.broadcast_arrays(
+            np.asarray(moneyness, dtype=float), np.asarray(tenor, dtype=float)
+        )
+        shape = moneyness.shape
+        moneyness, tenor = moneyness.ravel(), tenor.ravel()
+        tenors, variance = self._smiles(moneyness)
+        points = np.arange(len(moneyness))
+        # Flat vol outside the fitted tenors, linear total variance inside.
+        clipped = np.clip(tenor, tenors[0], tenors[-1])
+        upper = np.clip(np.searchsorted(tenors, clipped), 1, len(tenors) - 1)
+        if len(tenors) == 1:
+            total = variance[0]
+        else:
+            t0, t1 = tenors[upper - 1], tenors[upper]
+            w0, w1 = variance[upper - 1, points], variance[upper, points]
+            total = w0 + (w1 - w0) * (clipped - t0) / (t1 - t0)
+        vol = np.sqrt(total / clipped)
+        return vol.reshape(shape) if shape else float(vol[0])
+
+    def vol(self, strike, expiry):
+        "Vol at strike and expiry; both broadcast."
+        expiry = pd.DatetimeIndex(np.atleast_1d(expiry))
+        tenor = pricing.tenors(expiry, self.valuation_date)
+        strike = np.asarray(strike, dtype=float)
+        if np.ndim(strike) == 0 and len(tenor) == 1:
+            tenor = tenor[0]
+        moneyness = np.log(strike / self._forward(tenor))
+        return self.vol_by_moneyness(moneyness, tenor)
+
+
+def _digest(frame):
+    columns = frame.reindex(columns=["Bid", "Ask", "Last", "Underlying_Price"])
+    keys = frame.index.droplevel("Expiry").to_frame(index=False).astype(str)
+    digest = hashlib.sha1(columns.to_numpy(dtype=float).tobytes())
+    digest.update(pd.util.hash_pandas_object(keys, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
@@ -0,0 +1,220 @@
+import json
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import BaseAdapter
+from urllib3 import HTTPResponse
+
+from pandas_finance import Equity, EquityUniverse, pricing
+
+
+def make_trading_data(days=500, seed=0, start="2010-01-04"):
+    "Synthetic daily bars shaped like ``yf.Ticker.history`` output."
+    rng = np.random.RandomState(seed)
+    index = pd.bdate_range(start, periods=days, name="Date")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+    return pd.DataFrame(
+        {
+            "Open": close * (1 + rng.normal(0, 0.005, days)),
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Close": close,
+            "Adj Close": close,
+            "Volume": rng.randint(1000000, 5000000, days).astype(float),
+            "Dividends": 0.0,
+            "Stock Splits": 0.0,
+        },
+        index=index,
+    )
+
+
+def offline_equity(ticker="AAPL", data=None, **kwargs):
+    "An Equity whose price history comes from ``data`` instead of Yahoo."
+    session, _ = fake_session({})
+    equity = Equity(ticker, session=session, crumb="crumb", **kwargs)
+    if data is None:
+        data = make_trading_data()
+    equity.yf_ticker = mock.Mock()
+    equity.yf_ticker.history.return_value = data
+    return equity
+
+
+def offline_universe(tickers, routes=None, **kwargs):
+    """An EquityUniverse on a fake session with synthetic price histories.
+
+    Returns the universe and the FakeYahooAdapter serving its requests.
+    """
+    session, adapter = fake_session(routes or {"/v7/finance/quote": quote_route})
+    universe = EquityUniverse(tickers, session=session, crumb="crumb", **kwargs)
+    for seed, equity in enumerate(universe):
+        equity.yf_ticker = mock.Mock()
+        equity.yf_ticker.history.return_value = make_trading_data(seed=seed)
+    return universe, adapter
+
+
+class FakeYahooAdapter(BaseAdapter):
+    """Transport that answers requests from ``routes`` without the network.
+
+    ``routes`` maps a URL path prefix to a callable taking the prepared
+    request and returning ``(status, payload)``. Every request is recorded
+    in ``requests``.
+    """
+
+    def __init__(self, routes):
+        super(FakeYahooAdapter, self).__init__()
+        self.routes = routes
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        path = requests.utils.urlparse(request.url).path
+        status, payload = 404, {}
+        for prefix, handler in self.routes.items():
+            if path.startswith(prefix):
+                status, payload = handler(request)
+                break
+        response = requests.Response()
+        response.status_code = status
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+        if isinstance(payload, str):
+            response._content = payload.encode("utf-8")
+        else:
+            response._content = json.dumps(payload).encode("utf-8")
+        # requests_cache reads the urllib3 response when storing.
+        response.raw = HTTPResponse(
+            body=response._content, status=status, request_url=request.url
+        )
+        return response
+
+    def close(self):
+        pass
+
+
+def fake_session(routes):
+    "A requests.Session that routes every request through FakeYahooAdapter."
+    session = requests.Session()
+    adapter = FakeYahooAdapter(routes)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session, adapter
+
+
+def quote_response(symbols, price=100.0):
+    "A v7 quote endpoint payload for ``symbols``."
+    return {
+        "quoteResponse": {
+            "result": [
+                {
+                    "symbol": symbol,
+                    "regularMarketPrice": price + i,
+                    "marketCap": 1e9 * (i + 1),
+                    "sharesOutstanding": 1000000 * (i + 1),
+                    "currency": "USD",
+                    "longName": symbol + " Inc.",
+                    "marketState": "CLOSED",
+                }
+                for i, symbol in enumerate(symbols)
+            ],
+            "error": None,
+        }
+    }
+
+
+def quote_route(request):
+    query = requests.utils.urlparse(request.url).query
+    params = dict(p.split("=", 1) for p in query.split("&"))
+    symbols = requests.utils.unquote(params["symbols"]).split(",")
+    return 200, quote_response(symbols)
+
+
+def quote_summary_response(symbol):
+    "A v10 quoteSummary payload carrying FUNDAMENTALS_MODULES."
+    return {
+        "quoteSummary": {
+            "result": [
+                {
+                    "assetProfile": {
+                        "sector": "Technology",
+                        "industry": "Consumer Electronics",
+                        "fullTimeEmployees": 150000,
+                        "companyOfficers": [],
+                    },
+                    "summaryDetail": {
+                        "dividendRate": {"raw": 1.0, "fmt": "1.00"},
+                        "trailingAnnualDividendRate": {"raw": 0.96, "fmt": "0.96"},
+                    },
+                    "defaultKeyStatistics": {
+                        "sharesOutstanding": {"raw": 16000000000, "fmt": "16B"},
+                        "lastSplitFactor": {},
+                    },
+                    "price": {
+                        "longName": symbol + " Inc.",
+                        "currency": "USD",
+                        "marketCap": {"raw": 3.0e12, "fmt": "3T"},
+                    },
+                }
+            ],
+            "error": None,
+        }
+    }
+
+
+def quote_summary_route(request):
+    symbol = requests.utils.urlparse(request.url).path.rsplit("/", 1)[-1]
+    return 200, quote_summary_response(symbol)
+
+
+def make_option_chain(
+    symbol="AAPL",
+    price=100.0,
+    expiries=None,
+    strikes=None,
+    vol=0.3,
+    valuation_date="2029-12-01",
+):
+    """Synthetic chain shaped like ``pdr.Options.get_all_data`` output.
+
+    Bid and Ask straddle the Black-Scholes price at ``vol`` as of
+    ``valuation_date``.
+    """
+    if expiries is None:
+        expiries = pd.to_datetime(["2030-01-18", "2030-02-15", "2030-03-15"])
+    if strikes is None:
+        strikes = np.arange(80.0, 121.0, 5.0)
+    rows, index = [], []
+    for expiry in expiries:
+        tenor = (expiry - pd.Timestamp(valuation_date)).days / pricing.DAYS_PER_YEAR
+        for kind in ("calls", "puts"):
+            for strike in strikes:
+                last = float(
+                    pricing.black_scholes(
+                        price, strike, tenor, vol, is_call=kind == "calls"
+                    )
+                )
+                code = "%s%s%s%08d" % (
+                    symbol,
+                    expiry.strftime("%y%m%d"),
+                    kind[0].upper(),
+                    strike * 1000,
+                )
+                index.append((strike, expiry, kind, code))
+                rows.append(
+                    {
+                        "Last": last,
+                        "Bid": last - 0.05,
+                        "Ask": last + 0.05,
+                        "Vol": 10.0,
+                        "Open_Int": 100.0,
+                        "IV": vol,
+                        "Underlying": symbol,
+                        "Underlying_Price": price,
+                    }
+                )
+    index = pd.MultiIndex.from_tuples(
+        index, names=["Strike", "Expiry", "Type", "Symbol"]
+    )
+    return pd.DataFrame(rows, index=index).sort_index()
@@ -0,0 +1,90 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from pandas_finance.actions import CorporateActions
+from pandas_finance.replay import YahooStandIn
+from pandas_finance.tests.common import make_trading_data, offline_equity
+
+
+def history_with_actions():
+    data = make_trading_data(300)
+    data.iloc[100, data.columns.get_loc("Dividends")] = 0.5
+    data.iloc[200, data.columns.get_loc("Dividends")] = 0.6
+    data.iloc[150, data.columns.get_loc("Stock Splits")] = 2.0
+    return data
+
+
+class TestCorporateActions(unittest.TestCase):
+    def setUp(self):
+        self.data = history_with_actions()
+        self.actions = CorporateActions(self.data)
+
+    def test_table(self):
+        table = self.actions.table
+        self.assertEqual(list(table.columns), ["action", "value"])
+        self.assertEqual(list(table["action"]), ["DIVIDEND", "SPLIT", "DIVIDEND"])
+        self.assertEqual(list(table["value"]), [0.6, 2.0, 0.5])
+        self.assertEqual(self.actions.dividends.name, "Dividends")
+        self.assertEqual(self.actions.splits.name, "Splits")
+
+    def test_adjust(self):
+        close = self.data["Close"]
+        adjusted = self.actions.adjust(close)
+        first = 1 - 0.5 / close.iloc[99]
+        second = 1 - 0.6 / close.iloc[199]
+        np.testing.assert_allclose(
+            adjusted.iloc[:100], close.iloc[:100] * first * second
+        )
+        np.testing.assert_allclose(adjusted.iloc[100:200], close.iloc[100:200] * second)
+        np.testing.assert_allclose(adjusted.iloc[200:], close.iloc[200:])
+        raw = self.actions.adjust(close, splits=True)
+        np.testing.assert_allclose(raw.iloc[:150], adjusted.iloc[:150] / 2)
+        np.testing.assert_allclose(raw.iloc[150:], adjusted.iloc[150:])
+
+    def test_trailing_annual_dividend(self):
+        self.assertEqual(self.actions.trailing_annual_dividend(), 1.1)
+        as_of = self.data.index[150]
+        self.assertEqual(self.actions.trailing_annual_dividend(as_of), 0.5)
+        self.assertEqual(self.actions.trailing_annual_dividend("2009-01-01"), 0)
+
+    def test_no_action_columns(self):
+        actions = CorporateActions(self.data[["Close", "Volume"]])
+        self.assertEqual(len(actions.table), 0)
+        pd.testing.assert_series_equal(
+            actions.adjust(self.data["Close"]), self.data["Close"].rename("Adj Close")
+        )
+
+
+class TestEquityActions(unittest.TestCase):
+    def test_read_from_history(self):
+        equity = offline_equity(data=history_with_actions(), compact=True)
+        self.assertEqual(len(equity.actions), 3)
+        self.assertEqual(list(equity.splits), [2.0])
+        self.assertAlmostEqual(equity.trailing_annual_dividend, 1.1)
+        self.assertLess(equity.adj_close.iloc[0], equity.close.iloc[0])
+        equity.yf_ticker.get_dividends.assert_not_called()
+        equity.yf_ticker.history.assert_called_once()
+
+    def test_primed_history_not_refetched(self):
+        equity = offline_equity()
+        equity._cache.set("trading_data", history_with_actions())
+        self.assertEqual(len(equity.dividends), 2)
+        self.assertLess(equity.adj_close.iloc[0], equity.close.iloc[0])
+        equity.yf_ticker.history.assert_not_called()
+
+    def test_compact_history_reloaded_for_actions(self):
+        equity = offline_equity(data=history_with_actions(), compact=True)
+        equity.trading_data
+        equity._cache.invalidate("corporate_actions")
+        self.assertEqual(len(equity.dividends), 2)
+        self.assertEqual(equity.yf_ticker.history.call_count, 2)
+
+    def test_matches_yahoo_adj_close(self):
+        with YahooStandIn() as standin:
+            expected = standin.history("AAPL")
+            equity = offline_equity(data=expected)
+            pd.testing.assert_series_equal(
+                equity.adj_close, expected["Adj Close"], check_freq=False, rtol=1e-10
+            )
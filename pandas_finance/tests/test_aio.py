@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+from pandas_finance import Equity
+from pandas_finance.throttle import TokenBucket
+from pandas_finance.tests.common import make_trading_data, offline_universe
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_wait(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1, places=2)
+
+
+class TestAload(unittest.TestCase):
+    def setUp(self):
+        self.tickers = ["T%d" % i for i in range(20)]
+        self.universe, self.adapter = offline_universe(self.tickers)
+
+    def run_aload(self, **kwargs):
+        kwargs.setdefault("rate", 1000)
+        return asyncio.run(Equity.aload(self.universe, **kwargs))
+
+    def test_fills_caches(self):
+        result = self.run_aload(fields=["quotes", "trading_data"])
+        self.assertIs(result, self.universe)
+        self.assertEqual(len(self.adapter.requests), 1)
+        for equity in self.universe:
+            equity.close
+            equity.price
+            equity.yf_ticker.history.assert_called_once()
+        self.assertEqual(len(self.adapter.requests), 1)
+
+    def test_bounded_concurrency(self):
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def history(**kwargs):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.01)
+            with lock:
+                active.pop()
+            return make_trading_data()
+
+        for equity in self.universe:
+            equity.yf_ticker.history.side_effect = history
+        self.run_aload(fields=["trading_data"], concurrency=3)
+        self.assertLessEqual(max(peak), 3)
+
+    def test_retries_with_backoff(self):
+        equity = self.universe["T0"]
+        equity.yf_ticker.history.side_effect = [IOError("reset"), make_trading_data()]
+        with mock.patch("asyncio.sleep", side_effect=asyncio.sleep) as sleep:
+            self.run_aload(fields=["trading_data"], backoff=0.001)
+        self.assertIn(mock.call(0.001), sleep.call_args_list)
+        self.assertEqual(equity.yf_ticker.history.call_count, 2)
+
+    def test_gives_up(self):
+        self.universe["T0"].yf_ticker.history.side_effect = IOError("down")
+        with self.assertRaises(IOError):
+            self.run_aload(fields=["trading_data"], retries=1, backoff=0)
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            self.run_aload(fields=["nope"])
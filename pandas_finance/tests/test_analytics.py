@@ -0,0 +1,126 @@
+import math
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from pandas_finance.analytics import TRADING_DAYS, AsOfIndex, hist_vol_by_days
+from pandas_finance.tests.common import make_trading_data, offline_equity
+
+
+def looped_hist_vol_by_days(returns, min_days, max_days):
+    output = {}
+    for i in range(min_days, max_days):
+        output[i] = returns[-i:].std() * math.sqrt(TRADING_DAYS)
+    return pd.Series(output)
+
+
+class TestHistVolByDays(unittest.TestCase):
+    def setUp(self):
+        self.returns = make_trading_data(300)["Close"].pct_change()
+
+    def test_matches_loop(self):
+        expected = looped_hist_vol_by_days(self.returns, 10, 600)
+        pd.testing.assert_series_equal(
+            hist_vol_by_days(self.returns, 10, 600), expected, rtol=1e-10
+        )
+
+    def test_nan_handling(self):
+        returns = self.returns.copy()
+        returns.iloc[[5, 100, 297]] = np.nan
+        expected = looped_hist_vol_by_days(returns, 0, 20)
+        pd.testing.assert_series_equal(
+            hist_vol_by_days(returns, 0, 20), expected, rtol=1e-10
+        )
+
+    def test_short_series(self):
+        result = hist_vol_by_days(self.returns[:2], 1, 5)
+        self.assertTrue(result.isnull().all())
+
+    def test_batch(self):
+        returns = pd.DataFrame(
+            {
+                "A": self.returns,
+                "B": make_trading_data(300, seed=1)["Close"].pct_change(),
+            }
+        )
+        returns.iloc[:50, 1] = np.nan
+        result = hist_vol_by_days(returns, 10, 400)
+        self.assertEqual(result.shape, (390, 2))
+        for column in returns:
+            expected = looped_hist_vol_by_days(returns[column], 10, 400)
+            pd.testing.assert_series_equal(
+                result[column], expected, rtol=1e-10, check_names=False
+            )
+
+    def test_equity(self):
+        equity = offline_equity()
+        result = equity.hist_vol_by_days(equity.returns.index[200], 10, 100)
+        expected = looped_hist_vol_by_days(equity.returns[:201], 10, 100)
+        pd.testing.assert_series_equal(result, expected, rtol=1e-10)
+
+
+class TestAsOfIndex(unittest.TestCase):
+    def setUp(self):
+        data = make_trading_data(600)
+        data.index = data.index.tz_localize("America/New_York")
+        # A missing bar and a missing volume, as Yahoo sometimes returns.
+        data.iloc[250, data.columns.get_loc("Close")] = np.nan
+        data.iloc[260, data.columns.get_loc("Volume")] = np.nan
+        self.equity = offline_equity(data=data)
+        self.asof = self.equity.asof
+        self.ends = self.equity.returns.index[[5, 100, 251, 300, 599]]
+
+    def test_hist_vol(self):
+        for days in (0, 1, 2, 30, 400):
+            expected = [self.equity.hist_vol(days, end) for end in self.ends]
+            np.testing.assert_allclose(
+                self.asof.hist_vol(days, self.ends), expected, rtol=1e-9
+            )
+        self.assertAlmostEqual(self.asof.hist_vol(30), self.equity.hist_vol(30))
+
+    def test_naive_date_strings(self):
+        end = "2010-06-01"
+        self.assertAlmostEqual(
+            self.asof.hist_vol(30, end), self.equity.hist_vol(30, end)
+        )
+        self.assertTrue(np.isnan(self.asof.hist_vol(30, "2000-01-01")))
+
+    def test_vwap(self):
+        for days in (1, 30, 700):
+            expected = [self.equity.vwap(end, days) for end in self.ends]
+            result = self.asof.vwap(self.ends, days)
+            self.assertIsInstance(result, pd.Series)
+            np.testing.assert_allclose(result, expected, rtol=1e-9)
+
+    def test_rolling_hist_vol(self):
+        end = self.ends[3]
+        pd.testing.assert_series_equal(
+            self.asof.rolling_hist_vol(20, end),
+            self.equity.rolling_hist_vol(20, end),
+            rtol=1e-8,
+            check_names=False,
+            check_freq=False,
+        )
+
+    def test_hist_vol_by_days(self):
+        end = self.ends[3]
+        pd.testing.assert_series_equal(
+            self.asof.hist_vol_by_days(end, 10, 100),
+            self.equity.hist_vol_by_days(end, 10, 100),
+            rtol=1e-9,
+            check_index_type=False,
+        )
+
+    def test_reload_rebuilds(self):
+        asof = self.equity.asof
+        self.assertIs(self.equity.asof, asof)
+        self.equity.refresh()
+        self.assertIsNot(self.equity.asof, asof)
+
+
+class TestAsOfIndexEmpty(unittest.TestCase):
+    def test_no_history(self):
+        asof = AsOfIndex(make_trading_data(0))
+        self.assertTrue(np.isnan(asof.hist_vol(30)))
+        self.assertTrue(np.isnan(asof.vwap()))
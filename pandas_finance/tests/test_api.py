@@ -1,38 +1,47 @@
-import datetime
 import unittest
 
 import pandas as pd
 
 from pandas_finance import Equity, OptionChain
+from pandas_finance.replay import YahooStandIn
+
+
+def setUpModule():
+    # Every test here reads the deterministic data of a local stand-in.
+    global standin
+    standin = YahooStandIn(non_payers=["TSLA"]).start()
+
+
+def tearDownModule():
+    standin.stop()
 
 
 class TestEquity(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        cls.aapl = Equity("AAPL")
-        cls.date = datetime.date(2013, 1, 25)
-        cls.tsla = Equity("TSLA")
+        cls.aapl = Equity("AAPL", session=standin.session())
+        cls.date = "2013-01-25"
+        cls.tsla = Equity("TSLA", session=standin.session())
 
     def test_equity_price(self):
-        self.assertAlmostEqual(self.aapl.close[self.date], 62.84, 2)
+        self.assertAlmostEqual(self.aapl.close[self.date], 45.93, 2)
 
     def test_historical_vol(self):
         vol = self.aapl.hist_vol(30, end_date=self.date)
-        self.assertAlmostEqual(vol, 0.484, 3)
+        self.assertAlmostEqual(vol, 0.303, 3)
 
-    @unittest.skip("Yahoo options api broken")
     def test_options(self):
         self.assertIsInstance(self.aapl.options, OptionChain)
 
     def test_annual_dividend(self):
-        self.assertEqual(self.aapl.annual_dividend, 3.00)
+        self.assertAlmostEqual(self.aapl.annual_dividend, 5.30, 2)
         self.assertEqual(self.tsla.annual_dividend, 0)
 
     def test_dividends(self):
-        self.assertEqual(self.aapl.dividends[datetime.date(2015, 11, 5)], 0.52)
+        self.assertEqual(self.aapl.dividends["2015-01-29"], 0.39)
 
     def test_splits(self):
-        self.assertAlmostEqual(self.aapl.splits[datetime.date(2014, 6, 9)], 0.142857, 5)
+        self.assertEqual(len(self.aapl.splits), 0)
 
     def test_dividends_no_data(self):
         self.assertEqual(len(self.tsla.dividends), 0)
@@ -50,7 +59,7 @@ class TestEquity(unittest.TestCase):
         self.assertEqual(self.aapl.industry, "Consumer Electronics")
 
     def test_name(self):
-        self.assertEqual(self.aapl.name, "Apple Inc.")
+        self.assertEqual(self.aapl.name, "AAPL Inc.")
 
     def test_quotes(self):
         self.assertIsInstance(self.aapl.quotes["price"], float)
@@ -72,18 +81,17 @@ class TestEquity(unittest.TestCase):
 
     def test_rolling_hist_vol(self):
         self.assertIsInstance(self.aapl.rolling_hist_vol(20), pd.Series)
-        self.assertAlmostEqual(self.aapl.rolling_hist_vol(20)[self.date], 0.562, 3)
+        self.assertAlmostEqual(self.aapl.rolling_hist_vol(20)[self.date], 0.294, 3)
 
     def test_hist_vol_by_days(self):
         self.assertIsInstance(self.aapl.hist_vol_by_days(), pd.Series)
-        self.assertAlmostEqual(self.aapl.hist_vol_by_days(self.date)[20], 0.562, 3)
+        self.assertAlmostEqual(self.aapl.hist_vol_by_days(self.date)[20], 0.294, 3)
 
 
 class TestOptionChain(unittest.TestCase):
     @classmethod
-    @unittest.skip("Skip option tests due to broken yahoo api")
     def setUpClass(cls):
-        cls.aapl = Equity("AAPL")
+        cls.aapl = Equity("AAPL", session=standin.session())
         cls.options = OptionChain(cls.aapl)
 
     def test_options(self):
@@ -116,9 +124,8 @@ class TestOptionChain(unittest.TestCase):
 
 class TestOption(unittest.TestCase):
     @classmethod
-    @unittest.skip("Skip option tests due to broken yahoo api")
     def setUpClass(cls):
-        cls.aapl = Equity("AAPL")
+        cls.aapl = Equity("AAPL", session=standin.session())
         cls.options = OptionChain(cls.aapl)
 
     def test_options(self):
@@ -0,0 +1,110 @@
+import datetime
+import threading
+import time
+import unittest
+from unittest import mock
+
+from pandas_finance.cache import TTLCache
+from pandas_finance.tests.common import offline_equity
+
+
+class TestTTLCache(unittest.TestCase):
+    def test_get_memoizes(self):
+        cache = TTLCache()
+        loader = mock.Mock(return_value=1)
+        self.assertEqual(cache.get("a", loader), 1)
+        self.assertEqual(cache.get("a", loader), 1)
+        self.assertEqual(loader.call_count, 1)
+        self.assertEqual(cache.stats, {"hits": 1, "misses": 1, "size": 1})
+
+    def test_expiry(self):
+        cache = TTLCache(ttl=60)
+        loader = mock.Mock(return_value=1)
+        cache.get("a", loader)
+        with mock.patch("time.monotonic", return_value=time.monotonic() + 61):
+            self.assertNotIn("a", cache)
+            cache.get("a", loader)
+        self.assertEqual(loader.call_count, 2)
+
+    def test_per_key_ttl(self):
+        cache = TTLCache(ttl=None, ttls={"quotes": datetime.timedelta(seconds=15)})
+        cache.set("quotes", 1)
+        cache.set("history", 2)
+        with mock.patch("time.monotonic", return_value=time.monotonic() + 16):
+            self.assertNotIn("quotes", cache)
+            self.assertIn("history", cache)
+
+    def test_concurrent_misses_load_once(self):
+        cache = TTLCache()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.1)
+            return len(calls)
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get("k", loader)))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [1] * 10)
+
+    def test_invalidate(self):
+        cache = TTLCache()
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.invalidate("a")
+        self.assertNotIn("a", cache)
+        self.assertIn("b", cache)
+        cache.invalidate()
+        self.assertNotIn("b", cache)
+
+
+class TestEquityMemoization(unittest.TestCase):
+    def setUp(self):
+        self.equity = offline_equity()
+
+    def test_trading_data_fetched_once(self):
+        self.equity.hist_vol(30)
+        self.equity.rolling_hist_vol(20)
+        self.equity.vwap()
+        self.equity.close
+        self.assertEqual(self.equity.yf_ticker.history.call_count, 1)
+
+    def test_derived_series_computed_once(self):
+        self.assertIs(self.equity.returns, self.equity.returns)
+        self.assertIs(self.equity.close, self.equity.close)
+
+    def test_refresh(self):
+        returns = self.equity.returns
+        self.equity.refresh()
+        self.assertEqual(self.equity.yf_ticker.history.call_count, 2)
+        self.assertIsNot(self.equity.returns, returns)
+
+    def test_ttl_expiry_drops_derived(self):
+        equity = offline_equity(ttl=60)
+        returns = equity.returns
+        with mock.patch("time.monotonic", return_value=time.monotonic() + 61):
+            self.assertIsNot(equity.returns, returns)
+        self.assertEqual(equity.yf_ticker.history.call_count, 2)
+
+    def test_quotes_expire_before_history(self):
+        equity = offline_equity(ttl=3600)
+        equity._cache.set("quotes", {"price": 1.0})
+        equity.close
+        with mock.patch("time.monotonic", return_value=time.monotonic() + 60):
+            self.assertNotIn("quotes", equity._cache)
+            self.assertIn("close", equity._cache)
+
+    def test_cache_stats(self):
+        self.equity.close
+        self.equity.close
+        self.assertGreaterEqual(self.equity.cache_stats["hits"], 1)
+        self.equity.invalidate()
+        self.assertEqual(self.equity.cache_stats["size"], 0)
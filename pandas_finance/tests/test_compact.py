@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from pandas_finance.compact import Calendar, calendar, compact
+from pandas_finance.tests.common import (
+    make_trading_data,
+    offline_equity,
+    offline_universe,
+)
+
+
+class TestCompact(unittest.TestCase):
+    def setUp(self):
+        calendar.clear()
+        self.full = offline_equity()
+        self.compact = offline_equity(compact=True)
+
+    def test_columns_and_dtypes(self):
+        data = self.compact.trading_data
+        self.assertEqual(list(data.columns), ["Close", "Volume"])
+        self.assertEqual(data["Close"].dtype, np.float32)
+        self.assertEqual(data["Volume"].dtype, np.uint32)
+
+    def test_analytics_match_full_history(self):
+        for method, args in [
+            ("hist_vol", (30,)),
+            ("vwap", ()),
+            ("beta", (self.full.returns,)),
+        ]:
+            self.assertAlmostEqual(
+                getattr(self.compact, method)(*args),
+                getattr(self.full, method)(*args),
+                places=5,
+            )
+        np.testing.assert_allclose(
+            self.compact.hist_vol_by_days(), self.full.hist_vol_by_days(), rtol=1e-4
+        )
+
+    def test_memory_usage(self):
+        self.full.trading_data
+        self.compact.trading_data
+        full = self.full.memory_usage()
+        usage = self.compact.memory_usage()
+        self.assertIn("index", usage)
+        self.assertLess(usage["trading_data"], full["trading_data"] / 4)
+
+    def test_volume_dtypes(self):
+        data = make_trading_data(10)
+        data["Volume"] = 5e9
+        self.assertEqual(compact(data)["Volume"].dtype, np.int64)
+        data.iloc[3, data.columns.get_loc("Volume")] = np.nan
+        self.assertEqual(compact(data)["Volume"].dtype, np.float32)
+
+
+class TestCalendar(unittest.TestCase):
+    def test_shared_between_histories(self):
+        calendar = Calendar()
+        long = make_trading_data(500).index
+        same = calendar.share(make_trading_data(500).index)
+        self.assertIs(calendar.share(long), same)
+        later = calendar.share(long[100:].copy())
+        self.assertTrue(np.shares_memory(later.asi8, same.asi8))
+        pd.testing.assert_index_equal(later, long[100:])
+
+    def test_different_dates_kept(self):
+        calendar = Calendar()
+        calendar.share(make_trading_data(500).index)
+        other = make_trading_data(50, start="2030-01-01").index
+        self.assertIs(calendar.share(other), other)
+
+    def test_universe_shares_index(self):
+        calendar.clear()
+        universe, _ = offline_universe(["A", "B", "C"], compact=True)
+        indexes = [equity.trading_data.index for equity in universe]
+        self.assertTrue(np.shares_memory(indexes[0].asi8, indexes[2].asi8))
+        usage = universe.memory_usage()
+        self.assertEqual(list(usage.columns), ["A", "B", "C"])
+        self.assertIn("trading_data", usage.index)
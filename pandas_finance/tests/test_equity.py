@@ -0,0 +1,154 @@
+import gc
+import pickle
+import unittest
+import weakref
+from unittest import mock
+
+import numpy as np
+
+from pandas_finance import Equity, QuoteSnapshot
+from pandas_finance.tests.common import (
+    fake_session,
+    make_trading_data,
+    offline_equity,
+    quote_route,
+    quote_summary_route,
+)
+
+
+class TestAlphaBeta(unittest.TestCase):
+    def setUp(self):
+        self.equity = offline_equity()
+        self.index = offline_equity("SPY", data=make_trading_data(seed=42))
+        self.equity._session._pf_benchmarks = {"SPY": self.index}
+
+    def test_benchmark_shared(self):
+        other = offline_equity("MSFT")
+        other._session = self.equity._session
+        self.assertIs(Equity.benchmark("SPY", self.equity._session), self.index)
+        self.equity.beta("SPY")
+        other.beta("SPY")
+        self.index.yf_ticker.history.assert_called_once()
+
+    def test_benchmark_collected_with_session(self):
+        session, _ = fake_session({})
+        index = weakref.ref(Equity.benchmark("SPY", session))
+        self.assertIs(Equity.benchmark("SPY", session), index())
+        del session
+        gc.collect()
+        self.assertIsNone(index())
+
+    def test_alpha_and_beta_share_one_computation(self):
+        with mock.patch("empyrical.alpha_beta", return_value=np.array([0.1, 1.2])) as ab:
+            self.assertEqual(self.equity.beta("SPY"), 1.2)
+            self.assertEqual(self.equity.alpha("SPY"), 0.1)
+            self.equity.alpha_beta("SPY")
+        ab.assert_called_once()
+
+    def test_cache_keyed_by_window(self):
+        start = self.equity.returns.index[100]
+        self.assertNotEqual(
+            self.equity.beta("SPY"), self.equity.beta("SPY", start=start)
+        )
+
+    def test_precomputed_returns(self):
+        expected = self.equity.alpha_beta("SPY")
+        np.testing.assert_allclose(self.equity.alpha_beta(self.index.returns), expected)
+        np.testing.assert_allclose(self.equity.alpha_beta(self.index), expected)
+
+    def test_refresh_drops_results(self):
+        with mock.patch("empyrical.alpha_beta", return_value=np.array([0.1, 1.2])) as ab:
+            self.equity.beta("SPY")
+            self.equity.refresh()
+            self.equity.beta("SPY")
+        self.assertEqual(ab.call_count, 2)
+
+
+class TestFundamentals(unittest.TestCase):
+    def setUp(self):
+        self.session, self.adapter = fake_session(
+            {
+                "/v10/finance/quoteSummary": quote_summary_route,
+                "/v7/finance/quote": quote_route,
+            }
+        )
+        self.equity = Equity("AAPL", session=self.session, crumb="crumb")
+
+    def test_one_request(self):
+        self.assertEqual(self.equity.sector, "Technology")
+        self.assertEqual(self.equity.industry, "Consumer Electronics")
+        self.assertEqual(self.equity.employees, 150000)
+        self.assertEqual(len(self.adapter.requests), 1)
+        url = self.adapter.requests[0].url
+        self.assertIn("modules=assetProfile,summaryDetail,defaultKeyStatistics,price", url)
+
+    def test_raw_values(self):
+        fundamentals = self.equity.fundamentals
+        self.assertEqual(fundamentals["summaryDetail"]["dividendRate"], 1.0)
+        self.assertIsNone(fundamentals["defaultKeyStatistics"]["lastSplitFactor"])
+        self.assertNotIn("Companyofficers", self.equity.profile.index)
+
+    def test_quote_fields_from_snapshot(self):
+        self.assertEqual(self.equity.market_cap, 1e9)
+        self.assertEqual(self.equity.shares_os, 1000000)
+        self.assertEqual(self.equity.name, "AAPL Inc.")
+        self.assertEqual(self.equity.currency, "USD")
+        self.assertEqual(len(self.adapter.requests), 1)
+        self.assertIn("/v7/finance/quote", self.adapter.requests[0].url)
+
+    def test_quote_fields_stable_across_quote_expiry(self):
+        self.equity.fundamentals
+        self.assertEqual(self.equity.market_cap, 1e9)
+        self.equity._cache.invalidate("quotes", "snapshot")
+        self.assertEqual(self.equity.market_cap, 1e9)
+
+    def test_fundamentals_fill_missing_quote_fields(self):
+        def route(request):
+            status, payload = quote_route(request)
+            del payload["quoteResponse"]["result"][0]["marketCap"]
+            return status, payload
+
+        self.adapter.routes["/v7/finance/quote"] = route
+        self.assertEqual(self.equity.market_cap, 3.0e12)
+        self.assertEqual(self.equity.name, "AAPL Inc.")
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.session, self.adapter = fake_session({"/v7/finance/quote": quote_route})
+        self.equity = Equity("AAPL", session=self.session, crumb="crumb")
+
+    def test_fields_from_one_request(self):
+        snapshot = self.equity.snapshot()
+        self.assertEqual(snapshot.price, 100.0)
+        self.assertTrue(snapshot.closed)
+        self.assertEqual(snapshot.market_cap, 1e9)
+        self.assertEqual(snapshot.shares_os, 1000000)
+        self.assertEqual(snapshot.name, "AAPL Inc.")
+        self.assertEqual(snapshot.annual_dividend, 0)
+        self.assertEqual(self.equity.price, 100.0)
+        self.assertEqual(self.equity.dividend_yield, 0)
+        self.assertEqual(self.equity.currency, "USD")
+        self.assertIs(self.equity.snapshot(), snapshot)
+        self.assertEqual(len(self.adapter.requests), 1)
+
+    def test_immutable(self):
+        snapshot = self.equity.snapshot()
+        with self.assertRaises(AttributeError):
+            snapshot.price = 1.0
+        with self.assertRaises(AttributeError):
+            snapshot.extra = 1.0
+        self.assertFalse(hasattr(snapshot, "__dict__"))
+        self.assertEqual(pickle.loads(pickle.dumps(snapshot)), snapshot)
+
+    def test_reloaded_quotes_replace_snapshot(self):
+        first = self.equity.snapshot()
+        self.equity.invalidate()
+        self.assertIsNot(self.equity.snapshot(), first)
+        self.assertEqual(len(self.adapter.requests), 2)
+
+    def test_dividend_rate_preference(self):
+        quote = {"price": 50.0, "trailingAnnualDividendRate": 1.0}
+        self.assertEqual(QuoteSnapshot.from_quote("X", quote).dividend_yield, 0.02)
+        quote["forwardAnnualDividendRate"] = 2.0
+        self.assertEqual(QuoteSnapshot.from_quote("X", quote).annual_dividend, 2.0)
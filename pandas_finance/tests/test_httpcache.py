@@ -0,0 +1,108 @@
+import datetime
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from requests_cache.backends.filesystem import FileCache
+from requests_cache.backends.sqlite import SQLiteCache
+
+from pandas_finance import session
+from pandas_finance.httpcache import (
+    CACHE_ENV,
+    KeyValueCache,
+    LocalKeyValue,
+    LRUCache,
+    make_cache,
+)
+from pandas_finance.tests.common import fake_session
+
+QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote?symbols=AAPL"
+SUMMARY_URL = "https://query1.finance.yahoo.com/v10/finance/quoteSummary/AAPL"
+CHART_URL = (
+    "https://query2.finance.yahoo.com/v8/finance/chart/AAPL?period1=0&period2=%d"
+)
+
+
+def cached_session(backend):
+    "make_session on backend, answering from a FakeYahooAdapter."
+    result = session.make_session(backend)
+    _, adapter = fake_session({"/": lambda request: (200, {"body": "x" * 100})})
+    result.mount("https://", adapter)
+    return result, adapter
+
+
+class TestMakeCache(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+
+    def test_backends(self):
+        name = os.path.join(self.path, "pf-cache")
+        self.assertIsInstance(make_cache("sqlite", name), SQLiteCache)
+        self.assertIsInstance(make_cache("memory"), LRUCache)
+        self.assertIsInstance(make_cache("shm", os.path.basename(self.path)), FileCache)
+        self.assertIsInstance(make_cache(LocalKeyValue()), KeyValueCache)
+        cache = LRUCache()
+        self.assertIs(make_cache(cache), cache)
+        with self.assertRaises(ValueError):
+            make_cache("mongo")
+
+    def test_environment_default(self):
+        with mock.patch.dict(os.environ, {CACHE_ENV: "memory"}):
+            self.assertIsInstance(make_cache(), LRUCache)
+            self.assertIsInstance(session.make_session().cache, LRUCache)
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_evicts_least_recently_used_by_size(self):
+        cached, adapter = cached_session(LRUCache(max_bytes=300))
+        for symbol in ("A", "B", "A", "C"):
+            cached.get(QUOTE_URL.replace("AAPL", symbol))
+        urls = [url.split("symbols=")[1] for url in cached.cache.urls()]
+        self.assertEqual(sorted(urls), ["A", "C"])
+        self.assertLessEqual(cached.cache.responses.size, 300)
+        self.assertEqual(len(adapter.requests), 3)
+
+
+class TestKeyValueCache(unittest.TestCase):
+    def test_shared_between_sessions(self):
+        store = LocalKeyValue()
+        first, first_adapter = cached_session(KeyValueCache(store))
+        second, second_adapter = cached_session(KeyValueCache(store))
+        first.get(QUOTE_URL)
+        response = second.get(QUOTE_URL)
+        self.assertTrue(response.from_cache)
+        self.assertEqual(len(first_adapter.requests), 1)
+        self.assertEqual(second_adapter.requests, [])
+
+    def test_entries_expire_in_store(self):
+        store = LocalKeyValue()
+        cached, _ = cached_session(KeyValueCache(store))
+        cached.get(QUOTE_URL)
+        self.assertEqual(len(list(store.scan_iter("pf-cache:*"))), 1)
+        with mock.patch("time.time", return_value=time.time() + 3600):
+            self.assertEqual(list(store.scan_iter("pf-cache:*")), [])
+
+
+class TestEndpointExpiry(unittest.TestCase):
+    def setUp(self):
+        self.session, self.adapter = cached_session("memory")
+
+    def expires_in(self, url):
+        expires = self.session.get(url).expires
+        if expires is None:
+            return None
+        return expires - datetime.datetime.now(datetime.timezone.utc)
+
+    def test_quotes_seconds_profile_days(self):
+        self.assertLessEqual(self.expires_in(QUOTE_URL), session.QUOTE_TTL)
+        self.assertGreater(self.expires_in(SUMMARY_URL), datetime.timedelta(hours=23))
+
+    def test_other_endpoints_expire_in_an_hour(self):
+        hour = datetime.timedelta(hours=session.CACHE_HRS)
+        expires_in = self.expires_in(CHART_URL % (time.time() - 2 * 86400))
+        self.assertLessEqual(expires_in, hour)
+        self.assertGreater(expires_in, hour - datetime.timedelta(minutes=1))
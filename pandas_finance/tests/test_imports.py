@@ -0,0 +1,71 @@
+import json
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = (
+    "yfinance",
+    "pandas_datareader",
+    "empyrical",
+    "scipy",
+    "requests_cache",
+)
+# Seconds ``import pandas_finance`` may take once pandas and requests are loaded.
+IMPORT_BUDGET = 0.3
+
+
+def run(code):
+    "Runs code in a fresh interpreter and returns what it prints as JSON."
+    return json.loads(subprocess.check_output([sys.executable, "-c", code]))
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_import_skips_heavy_modules(self):
+        loaded = run(
+            "import json, sys, pandas_finance;"
+            "print(json.dumps([m for m in %r if m in sys.modules]))" % (HEAVY_MODULES,)
+        )
+        self.assertEqual(loaded, [])
+
+    def test_import_time_budget(self):
+        seconds = min(
+            run(
+                "import time, pandas, requests;"
+                "start = time.perf_counter();"
+                "import pandas_finance;"
+                "print(time.perf_counter() - start)"
+            )
+            for _ in range(3)
+        )
+        self.assertLess(seconds, IMPORT_BUDGET)
+
+    def test_quote_does_not_load_history_or_analytics(self):
+        loaded = run(
+            "import json, sys\n"
+            "from pandas_finance import Equity\n"
+            "from pandas_finance.tests.common import fake_session, quote_route\n"
+            "session, _ = fake_session({'/v7/finance/quote': quote_route})\n"
+            "Equity('AAPL', session=session, crumb='crumb').price\n"
+            "print(json.dumps([m for m in %r if m in sys.modules]))" % (HEAVY_MODULES,)
+        )
+        self.assertEqual(loaded, ["pandas_datareader"])
+
+    def test_quotes_and_options_load_concurrently(self):
+        # Both import pandas_datareader lazily, from different threads.
+        loaded = run(
+            "import asyncio, json\n"
+            "from pandas_finance import Equity\n"
+            "from pandas_finance.replay import YahooStandIn\n"
+            "with YahooStandIn() as standin:\n"
+            "    universe = asyncio.run(Equity.aload(\n"
+            "        ['AAPL', 'MSFT', 'T'], fields=('quotes', 'options'),\n"
+            "        session=standin.session()))\n"
+            "print(json.dumps(universe.tickers))"
+        )
+        self.assertEqual(loaded, ["AAPL", "MSFT", "T"])
+
+    def test_reader_still_importable_from_api(self):
+        from pandas_finance.api import FixedYahooQuotesReader
+        from pandas_finance.quotes import FixedYahooQuotesReader as reader
+
+        self.assertIs(FixedYahooQuotesReader, reader)
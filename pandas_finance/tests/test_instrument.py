@@ -0,0 +1,98 @@
+import time
+import unittest
+
+from pandas_finance import Equity, instrument
+from pandas_finance.replay import YahooStandIn
+from pandas_finance.tests.common import make_trading_data, offline_equity
+
+
+class TestInstrument(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.standin = YahooStandIn().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.standin.stop()
+
+    def setUp(self):
+        self.aapl = Equity("AAPL", session=self.standin.session())
+
+    def test_nothing_recorded_without_hooks(self):
+        spans = []
+        self.aapl.price
+        instrument.add_hook(spans.append)
+        instrument.remove_hook(spans.append)
+        self.aapl.name
+        self.assertEqual(spans, [])
+        self.assertFalse(instrument.enabled())
+
+    def test_breakdown_of_alpha_beta(self):
+        with instrument.record() as recording:
+            self.aapl.alpha_beta("SPY")
+        frame = recording.frame()
+        root = frame[frame["name"] == "Equity.alpha_beta"].iloc[0]
+        self.assertEqual(root["depth"], 0)
+        self.assertEqual(root["ticker"], "AAPL")
+
+        http = frame[frame["kind"] == "http"]
+        self.assertEqual(set(http["status"]), {200})
+        self.assertEqual(root["requests"], 2)
+        self.assertEqual(root["bytes"], http["bytes"].sum())
+        self.assertAlmostEqual(root["network"], http["wall"].sum())
+        self.assertAlmostEqual(root["compute"], root["wall"] - root["network"])
+        self.assertEqual(set(frame[frame["kind"] == "http"]["http_cache_misses"]), {1})
+
+        fetches = frame[frame["name"] == "Equity._fetch_history"]
+        self.assertEqual(sorted(fetches["ticker"]), ["AAPL", "SPY"])
+        self.assertIn("Equity._alpha_beta", set(frame["name"]))
+
+    def test_history_download_counts_as_network(self):
+        equity = offline_equity()
+
+        def history(**kwargs):
+            time.sleep(0.05)
+            return make_trading_data()
+
+        equity.yf_ticker.history.side_effect = history
+        with instrument.record() as recording:
+            equity.trading_data
+        frame = recording.frame()
+        fetch = frame[frame["name"] == "Equity._fetch_history"].iloc[0]
+        self.assertEqual(fetch["kind"], "io")
+        self.assertGreaterEqual(fetch["network"], 0.05)
+        self.assertEqual(fetch["network"], fetch["wall"])
+        root = frame[frame["depth"] == 0].iloc[0]
+        self.assertEqual(root["network"], fetch["network"])
+
+    def test_crumb_and_warmup_spans(self):
+        with instrument.record() as recording:
+            self.aapl.quotes
+        frame = recording.frame()
+        crumb = frame[frame["name"] == "SessionProvider.crumb"].iloc[0]
+        children = frame[frame["parent"] == crumb.name]
+        self.assertEqual(len(children), 2)
+        self.assertTrue(children["name"].str.contains("fc.yahoo.com").any())
+        self.assertTrue(children["name"].str.contains("getcrumb").any())
+
+    def test_memo_hits_and_summary(self):
+        with instrument.record() as recording:
+            self.aapl.returns
+            self.aapl.returns
+        returns = recording.frame().query("name == 'Equity.returns'")
+        # The first call loads (adj_close reads the history it loaded).
+        self.assertEqual(list(returns["memo_misses"] > 0), [True, False])
+        self.assertGreater(returns["memo_hits"].iloc[1], 0)
+        summary = recording.summary()
+        self.assertEqual(summary.loc[("call", "Equity.returns"), "calls"], 2)
+
+    def test_error_recorded(self):
+        spans = []
+        instrument.add_hook(spans.append)
+        try:
+            with self.assertRaises(ValueError):
+                self.aapl.hist_vol("thirty")
+        finally:
+            instrument.remove_hook(spans.append)
+        self.assertEqual(spans[-1].name, "Equity.hist_vol")
+        self.assertEqual(spans[-1].error, "ValueError")
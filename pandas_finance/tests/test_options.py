@@ -0,0 +1,67 @@
+import time
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from pandas_finance import OptionChain
+from pandas_finance.session import OPTIONS_TTL
+from pandas_finance.tests.common import make_option_chain, offline_equity
+
+
+class TestOptionChainCaching(unittest.TestCase):
+    def setUp(self):
+        self.data = make_option_chain()
+        self.equity = offline_equity()
+        self.equity._cache.set("quotes", pd.Series({"price": 100.0}))
+        self.chain = self.equity.options
+        expiries = sorted(set(self.data.index.get_level_values("Expiry")))
+        self.chain._pdr._expiry_dates = [e.date() for e in expiries]
+        self.chain._pdr.get_all_data = mock.Mock(return_value=self.data)
+        self.chain._pdr._load_data = mock.Mock(side_effect=self.load_data)
+
+    def load_data(self, dates):
+        expiries = self.data.index.get_level_values("Expiry").date
+        return self.data[pd.Index(expiries).isin(dates)]
+
+    def test_chain_cached_on_equity(self):
+        self.assertIsInstance(self.chain, OptionChain)
+        self.assertIs(self.equity.options, self.chain)
+
+    def test_calls_and_puts_one_download(self):
+        calls, puts = self.chain.calls, self.chain.puts
+        self.assertTrue((calls.index.get_level_values("Type") == "calls").all())
+        self.assertTrue((puts.index.get_level_values("Type") == "puts").all())
+        self.assertEqual(len(calls) + len(puts), len(self.data))
+        self.assertIs(self.chain.calls, calls)
+        self.chain._pdr.get_all_data.assert_called_once()
+
+    def test_near_calls_loads_front_expiry_only(self):
+        near = self.chain.near_calls
+        self.chain.near_puts
+        self.chain._pdr._load_data.assert_called_once_with([self.chain.expiry_dates[0]])
+        self.chain._pdr.get_all_data.assert_not_called()
+        self.assertEqual(len(near), 9)
+        self.assertEqual(
+            set(near.index.get_level_values("Expiry")),
+            {pd.Timestamp(self.chain.expiry_dates[0])},
+        )
+
+    def test_all_data_indexes_expiries(self):
+        self.chain.all_data
+        front = self.chain.expiry_data(self.chain.expiry_dates[0])
+        self.chain._pdr._load_data.assert_not_called()
+        self.assertEqual(len(front), 18)
+
+    def test_invalidate(self):
+        self.chain.calls
+        self.chain.invalidate()
+        self.chain.calls
+        self.assertEqual(self.chain._pdr.get_all_data.call_count, 2)
+
+    def test_quotes_expire_with_options_ttl(self):
+        self.chain.calls
+        later = time.monotonic() + OPTIONS_TTL.total_seconds() + 1
+        with mock.patch("time.monotonic", return_value=later):
+            self.chain.calls
+        self.assertEqual(self.chain._pdr.get_all_data.call_count, 2)
@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+from pandas_finance.parallel import ParallelAnalytics, SharedArray
+from pandas_finance.tests.common import make_trading_data, offline_universe
+
+
+class TestSharedArray(unittest.TestCase):
+    def test_round_trip_through_pickle(self):
+        import pickle
+
+        shared = SharedArray.copy_of(np.arange(6.0).reshape(2, 3))
+        try:
+            attached = pickle.loads(pickle.dumps(shared))
+            attached.array[1, 2] = -1.0
+            self.assertEqual(shared.array[1, 2], -1.0)
+            attached.close()
+        finally:
+            shared.close()
+
+
+class TestParallelAnalytics(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        tickers = ["T%d" % i for i in range(11)]
+        cls.universe, _ = offline_universe(tickers)
+        # One ticker with a shorter, later starting history.
+        cls.universe["T3"].yf_ticker.history.return_value = make_trading_data(
+            seed=7
+        ).iloc[100:]
+        # And one missing dates the others have.
+        history = make_trading_data(seed=5)
+        cls.universe["T5"].yf_ticker.history.return_value = history.drop(
+            history.index[[250, 260, 400]]
+        )
+        cls.end_date = cls.universe["T0"].returns.index[300]
+        cls.index = make_trading_data(seed=99)["Close"].pct_change()
+        cls.pool = cls.universe.parallel(processes=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def test_hist_vol(self):
+        assert_series_equal(self.pool.hist_vol(30), self.universe.hist_vol(30))
+        assert_series_equal(
+            self.pool.hist_vol(30, self.end_date),
+            self.universe.hist_vol(30, self.end_date),
+        )
+
+    def test_rolling_hist_vol(self):
+        assert_frame_equal(
+            self.pool.rolling_hist_vol(20, self.end_date),
+            self.universe.rolling_hist_vol(20, self.end_date),
+            check_names=False,
+        )
+
+    def test_hist_vol_by_days(self):
+        assert_frame_equal(
+            self.pool.hist_vol_by_days(max_days=200),
+            self.universe.hist_vol_by_days(max_days=200),
+        )
+
+    def test_alpha_beta(self):
+        start = self.index.index[50]
+        assert_frame_equal(
+            self.pool.alpha_beta(self.index, start=start, end=self.end_date),
+            self.universe.alpha_beta(self.index, start=start, end=self.end_date),
+        )
+        assert_series_equal(self.pool.beta(self.index), self.universe.beta(self.index))
+
+    def test_more_processes_than_tickers(self):
+        with ParallelAnalytics(self.universe.returns[["T1", "T2"]], 4) as pool:
+            self.assertEqual(len(pool._chunks()), 2)
+            assert_series_equal(
+                pool.hist_vol(30), self.universe.hist_vol(30)[["T1", "T2"]]
+            )
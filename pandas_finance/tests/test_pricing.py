@@ -0,0 +1,127 @@
+import datetime
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from pandas_finance import Option, pricing
+from pandas_finance.tests.common import make_option_chain, offline_equity
+
+
+class TestBlackScholes(unittest.TestCase):
+    def test_known_value(self):
+        price = pricing.black_scholes(100, 100, 1.0, 0.2, rate=0.05)
+        self.assertAlmostEqual(float(price), 10.4506, places=4)
+
+    def test_put_call_parity(self):
+        strike = np.linspace(50, 150, 11)
+        args = (100, strike, 0.5, 0.25, 0.03, 0.01)
+        call = pricing.black_scholes(*args, is_call=True)
+        put = pricing.black_scholes(*args, is_call=False)
+        parity = 100 * np.exp(-0.01 * 0.5) - strike * np.exp(-0.03 * 0.5)
+        np.testing.assert_allclose(call - put, parity, atol=1e-10)
+
+    def test_greeks_match_finite_differences(self):
+        args = dict(rate=0.02, dividend_yield=0.01)
+        for is_call in (True, False):
+            g = pricing.greeks(100, 95, 0.75, 0.3, is_call=is_call, **args)
+
+            def bs(spot=100, vol=0.3, tenor=0.75, rate=0.02):
+                return float(
+                    pricing.black_scholes(
+                        spot, 95, tenor, vol, rate, 0.01, is_call=is_call
+                    )
+                )
+
+            h = 1e-4
+            self.assertAlmostEqual(
+                g["delta"], (bs(spot=100 + h) - bs(spot=100 - h)) / (2 * h), places=6
+            )
+            self.assertAlmostEqual(
+                g["gamma"],
+                (bs(spot=100 + h) - 2 * bs() + bs(spot=100 - h)) / h**2,
+                places=3,
+            )
+            self.assertAlmostEqual(
+                g["vega"], (bs(vol=0.3 + h) - bs(vol=0.3 - h)) / (2 * h), places=5
+            )
+            self.assertAlmostEqual(
+                g["theta"],
+                -(bs(tenor=0.75 + h) - bs(tenor=0.75 - h)) / (2 * h),
+                places=4,
+            )
+            self.assertAlmostEqual(
+                g["rho"], (bs(rate=0.02 + h) - bs(rate=0.02 - h)) / (2 * h), places=4
+            )
+
+
+class TestImpliedVol(unittest.TestCase):
+    def test_round_trip_large_chain(self):
+        rng = np.random.RandomState(0)
+        n = 5000
+        strike = rng.uniform(50, 150, n)
+        tenor = rng.uniform(0.02, 2.0, n)
+        vol = rng.uniform(0.05, 1.5, n)
+        is_call = rng.rand(n) > 0.5
+        price = pricing.black_scholes(100, strike, tenor, vol, 0.02, 0.01, is_call)
+        solved = pricing.implied_vol(price, 100, strike, tenor, 0.02, 0.01, is_call)
+        solved_ok = ~np.isnan(solved)
+        repriced = pricing.black_scholes(
+            100, strike, tenor, solved, 0.02, 0.01, is_call
+        )
+        np.testing.assert_allclose(
+            repriced[solved_ok], price[solved_ok], rtol=0, atol=1e-7
+        )
+        # Deep out of the money prices carry no information about vol.
+        vega = pricing.greeks(100, strike, tenor, vol, 0.02, 0.01, is_call)["vega"]
+        informative = vega > 1e-4
+        self.assertTrue(solved_ok[informative].all())
+        np.testing.assert_allclose(solved[informative], vol[informative], rtol=1e-5)
+
+    def test_converged_first_guess_kept(self):
+        solved = pricing.implied_vol(1e-9, 100, 60, 0.25, is_call=False)
+        self.assertIsInstance(solved, float)
+        repriced = pricing.black_scholes(100, 60, 0.25, solved, is_call=False)
+        self.assertLess(abs(repriced - 1e-9), 1e-8)
+
+    def test_arbitrage_bounds(self):
+        solved = pricing.implied_vol([0.5, 150.0, 12.0], 100, 90, 1.0)
+        self.assertTrue(np.isnan(solved[0]))
+        self.assertTrue(np.isnan(solved[1]))
+        self.assertFalse(np.isnan(solved[2]))
+
+
+class TestChainAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.equity = offline_equity()
+        self.equity._cache.set("quotes", pd.Series({"price": 100.0}))
+        self.chain = self.equity.options
+        self.chain._cache.set("all_data", make_option_chain(vol=0.3))
+
+    def test_analytics(self):
+        result = self.chain.analytics(valuation_date="2029-12-01")
+        np.testing.assert_allclose(result["Implied_Vol"], 0.3, rtol=1e-6)
+        self.assertEqual(
+            list(result.columns),
+            [
+                "Mid",
+                "Tenor",
+                "Implied_Vol",
+                "Model",
+                "Delta",
+                "Gamma",
+                "Vega",
+                "Theta",
+                "Rho",
+            ],
+        )
+        calls = result.xs("calls", level="Type")
+        self.assertTrue(((calls["Delta"] > 0) & (calls["Delta"] < 1)).all())
+
+    def test_option(self):
+        expiry = pd.Timestamp.today().normalize() + datetime.timedelta(days=365)
+        option = Option(self.equity, 100, expiry, "calls")
+        price = option.price(vol=0.2)
+        self.assertAlmostEqual(price, float(pricing.black_scholes(100, 100, 1.0, 0.2)))
+        self.assertAlmostEqual(option.implied_vol(price), 0.2, places=6)
+        self.assertAlmostEqual(option.greeks(vol=0.2)["delta"], 0.5398, places=4)
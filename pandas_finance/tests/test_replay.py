@@ -0,0 +1,113 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from pandas_finance import Equity, EquityUniverse, session
+from pandas_finance.replay import MissingFixture, ReplaySession, YahooStandIn
+
+
+class TestYahooStandIn(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.standin = YahooStandIn().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.standin.stop()
+
+    def setUp(self):
+        self.aapl = Equity("AAPL", session=self.standin.session())
+
+    def test_quotes_and_fundamentals(self):
+        self.assertEqual(self.aapl.crumb, "standin-crumb")
+        self.assertIsInstance(self.aapl.price, float)
+        self.assertEqual(self.aapl.name, "AAPL Inc.")
+        self.assertEqual(self.aapl.fundamentals["assetProfile"]["sector"], "Technology")
+
+    def test_history_matches_served_bars(self):
+        expected = self.standin.history("AAPL")
+        data = self.aapl.trading_data
+        pd.testing.assert_index_equal(data.index, expected.index)
+        pd.testing.assert_frame_equal(data, expected[data.columns], check_freq=False)
+        self.assertAlmostEqual(self.aapl.price, data["Close"].iloc[-1])
+        self.assertEqual(len(self.aapl.dividends), (expected["Dividends"] > 0).sum())
+        self.assertEqual(len(self.aapl.splits), 0)
+
+    def test_history_from_start(self):
+        data = self.aapl.yf_ticker.history(start="2024-01-02")
+        self.assertEqual(str(data.index[0].date()), "2024-01-02")
+
+    def test_option_chain(self):
+        chain = self.aapl.options
+        data = chain.all_data
+        self.assertEqual(len(chain.expiry_dates), 3)
+        self.assertEqual(
+            set(data.index.get_level_values("Expiry").date), set(chain.expiry_dates)
+        )
+        self.assertEqual(len(chain.calls), len(chain.puts))
+        self.assertTrue(
+            (chain.near_calls.index.get_level_values("Type") == "calls").all()
+        )
+        # Expiries are after today, so the default valuation date works.
+        iv = chain.analytics()["Implied_Vol"]
+        self.assertAlmostEqual(iv.median(), 0.3, 2)
+        surface = chain.vol_surface()
+        self.assertEqual(len(surface.expiries), 3)
+        self.assertAlmostEqual(surface.vol_by_moneyness(0.0, 0.1), 0.3, 2)
+
+    def test_universe_download(self):
+        universe = EquityUniverse(["AAPL", "MSFT"], session=self.standin.session())
+        wide = universe.download()
+        self.assertEqual(set(wide.columns.get_level_values(1)), {"AAPL", "MSFT"})
+        expected = self.standin.history("MSFT")
+        data = universe["MSFT"].trading_data
+        pd.testing.assert_frame_equal(
+            data, expected[data.columns], check_freq=False, check_names=False
+        )
+
+    def test_requests_counted(self):
+        before = len(self.standin.requests)
+        self.aapl.quotes
+        self.assertEqual(len(self.standin.requests), before + 3)
+
+
+class TestRecordReplay(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+
+    def test_replays_recorded_session(self):
+        with YahooStandIn() as standin:
+            recorder = ReplaySession(self.path, record=True, standin=standin)
+            live = Equity("MSFT", session=recorder)
+            quotes, data = live.quotes, live.trading_data
+        self.assertTrue(os.listdir(self.path))
+
+        replay = Equity("MSFT", session=ReplaySession(self.path))
+        pd.testing.assert_series_equal(replay.quotes, quotes)
+        pd.testing.assert_frame_equal(replay.trading_data, data)
+
+    def test_missing_fixture(self):
+        equity = Equity("MSFT", session=ReplaySession(self.path), crumb="crumb")
+        with self.assertRaises(MissingFixture):
+            equity.quotes
+
+    def test_crumb_not_part_of_key(self):
+        with YahooStandIn() as standin:
+            recorder = ReplaySession(self.path, record=True, standin=standin)
+            recorder.get(
+                "https://query1.finance.yahoo.com/v7/finance/quote?symbols=A&crumb=x"
+            )
+        replay = ReplaySession(self.path)
+        response = replay.get(
+            "https://query1.finance.yahoo.com/v7/finance/quote?symbols=A&crumb=y"
+        )
+        self.assertEqual(response.json()["quoteResponse"]["result"][0]["symbol"], "A")
+
+    def test_default_session_from_environment(self):
+        with mock.patch.dict(os.environ, {session.REPLAY_ENV: self.path}):
+            self.assertIsInstance(session.make_session(), ReplaySession)
@@ -0,0 +1,142 @@
+import gc
+import threading
+import time
+import unittest
+import weakref
+
+from pandas_finance import Equity
+from pandas_finance.session import SessionProvider, get_provider
+from pandas_finance.tests.common import (
+    fake_session,
+    quote_response,
+    quote_summary_response,
+)
+
+
+class TestSessionProvider(unittest.TestCase):
+    def setUp(self):
+        self.crumbs = iter(["crumb1", "crumb2", "crumb3"])
+        self.quote_status = [401]
+        self.session, self.adapter = fake_session(
+            {
+                "/v1/test/getcrumb": lambda r: (200, next(self.crumbs)),
+                "/v7/finance/quote": self.quote_route,
+                "/v10/finance/quoteSummary": self.quote_summary_route,
+                "/": lambda r: (404, ""),
+            }
+        )
+
+    def quote_route(self, request):
+        status = self.quote_status.pop(0) if self.quote_status else 200
+        return status, quote_response(["AAPL"])
+
+    def quote_summary_route(self, request):
+        status = self.quote_status.pop(0) if self.quote_status else 200
+        return status, quote_summary_response("AAPL")
+
+    def urls(self):
+        return [r.url for r in self.adapter.requests]
+
+    def test_equities_make_no_requests(self):
+        equities = [Equity("T%d" % i, session=self.session) for i in range(1000)]
+        self.assertEqual(self.adapter.requests, [])
+        self.assertIs(equities[0]._provider, equities[-1]._provider)
+
+    def test_crumb_fetched_once(self):
+        a = Equity("A", session=self.session)
+        b = Equity("B", session=self.session)
+        self.assertEqual(a.crumb, "crumb1")
+        self.assertEqual(b.crumb, "crumb1")
+        self.assertEqual(len(self.adapter.requests), 2)
+
+    def test_crumb_fetched_once_across_threads(self):
+        provider = SessionProvider(self.session)
+        threads = [threading.Thread(target=lambda: provider.crumb) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sum("getcrumb" in url for url in self.urls()), 1)
+
+    def test_refresh_crumb_on_401(self):
+        equity = Equity("AAPL", session=self.session)
+        self.assertEqual(equity.quotes["price"], 100.0)
+        self.assertEqual(equity.crumb, "crumb2")
+        self.assertIn("crumb=crumb2", self.urls()[-1])
+
+    def test_refresh_crumb_on_401_for_fundamentals(self):
+        equity = Equity("AAPL", session=self.session)
+        self.assertEqual(equity.sector, "Technology")
+        self.assertEqual(equity.crumb, "crumb2")
+        self.assertIn("crumb=crumb2", self.urls()[-1])
+
+    def test_refresh_crumb_skips_replaced(self):
+        provider = SessionProvider(self.session)
+        provider.set_crumb("fresh")
+        self.assertEqual(provider.refresh_crumb("stale"), "fresh")
+        self.assertEqual(self.adapter.requests, [])
+
+    def test_given_crumb_does_not_replace_shared_one(self):
+        a = Equity("A", session=self.session, crumb="first")
+        b = Equity("B", session=self.session, crumb="second")
+        self.assertEqual(a.crumb, "first")
+        self.assertEqual(b.crumb, "first")
+        self.assertEqual(self.adapter.requests, [])
+
+    def test_provider_collected_with_session(self):
+        session, _ = fake_session({})
+        provider = weakref.ref(get_provider(session))
+        self.assertIs(get_provider(session), provider())
+        del session
+        gc.collect()
+        self.assertIsNone(provider())
+
+    def test_default_provider_shared(self):
+        self.assertIs(get_provider(), get_provider())
+        self.assertIs(get_provider(get_provider().session), get_provider())
+
+
+class TestCoalescing(unittest.TestCase):
+    def setUp(self):
+        def slow_quote(request):
+            time.sleep(0.2)
+            return 200, quote_response(["AAPL"])
+
+        session, self.adapter = fake_session({"/v7/finance/quote": slow_quote})
+        self.session = SessionProvider(session).session
+
+    def get_concurrently(self, urls):
+        responses = []
+        threads = [
+            threading.Thread(target=lambda u=url: responses.append(self.session.get(u)))
+            for url in urls
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return responses
+
+    def test_identical_requests_share_one_call(self):
+        url = "https://query1.finance.yahoo.com/v7/finance/quote?symbols=AAPL"
+        responses = self.get_concurrently([url] * 8)
+        self.assertEqual(len(self.adapter.requests), 1)
+        self.assertEqual(
+            {r.json()["quoteResponse"]["result"][0]["symbol"] for r in responses},
+            {"AAPL"},
+        )
+        self.assertEqual(len({id(r) for r in responses}), 8)
+
+    def test_different_requests_not_shared(self):
+        url = "https://query1.finance.yahoo.com/v7/finance/quote?symbols=%s"
+        self.get_concurrently([url % "AAPL", url % "MSFT"])
+        self.assertEqual(len(self.adapter.requests), 2)
+
+    def test_equity_quotes_fetched_once_across_threads(self):
+        equity = Equity("AAPL", session=self.session, crumb="crumb")
+        threads = [threading.Thread(target=lambda: equity.price) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.adapter.requests), 1)
@@ -0,0 +1,81 @@
+import datetime
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from pandas_finance import PriceStore
+from pandas_finance.tests.common import make_trading_data, offline_equity
+
+START = datetime.date(1990, 1, 1)
+
+
+class TestPriceStore(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.store = PriceStore(self.path)
+        data = make_trading_data(300)
+        data.index = data.index.tz_localize("America/New_York")
+        data["Volume"] = data["Volume"].astype("int64")
+        self.data = data
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def fetcher(self, rows):
+        def fetch(start):
+            data = self.data.iloc[:rows]
+            return data[data.index.date >= start]
+
+        return mock.Mock(side_effect=fetch)
+
+    def test_round_trip(self):
+        self.store.write("AAPL", self.data)
+        self.assertIn("AAPL", self.store)
+        pd.testing.assert_frame_equal(self.store.read("AAPL"), self.data, check_freq=False)
+        self.assertIsNone(self.store.read("MSFT"))
+
+    def test_append_replaces_overlap(self):
+        self.store.write("AAPL", self.data.iloc[:200])
+        self.store.append("AAPL", self.data.iloc[150:])
+        pd.testing.assert_frame_equal(self.store.read("AAPL"), self.data, check_freq=False)
+
+    def test_load_fetches_only_new_bars(self):
+        self.store.load("AAPL", self.fetcher(200), START)
+        fetch = self.fetcher(300)
+        result = self.store.load("AAPL", fetch, START)
+        fetch.assert_called_once_with(self.data.index[199].date())
+        pd.testing.assert_frame_equal(result, self.data, check_freq=False)
+
+    def test_load_fresh_reads_disk(self):
+        self.store.load("AAPL", self.fetcher(200), START)
+        fetch = self.fetcher(300)
+        result = self.store.load("AAPL", fetch, START, max_age=60)
+        fetch.assert_not_called()
+        self.assertEqual(len(result), 200)
+
+    def test_load_rewrites_on_dividend(self):
+        self.store.load("AAPL", self.fetcher(200), START)
+        self.data.iloc[250, self.data.columns.get_loc("Dividends")] = 0.5
+        fetch = self.fetcher(300)
+        result = self.store.load("AAPL", fetch, START)
+        self.assertEqual(fetch.call_args_list[-1], mock.call(START))
+        pd.testing.assert_frame_equal(result, self.data, check_freq=False)
+
+    def test_load_appends_after_stored_dividend(self):
+        self.data.iloc[199, self.data.columns.get_loc("Dividends")] = 0.5
+        self.store.load("AAPL", self.fetcher(200), START)
+        fetch = self.fetcher(300)
+        result = self.store.load("AAPL", fetch, START)
+        fetch.assert_called_once_with(self.data.index[199].date())
+        pd.testing.assert_frame_equal(result, self.data, check_freq=False)
+
+    def test_equity_reads_store(self):
+        self.store.write("AAPL", self.data)
+        equity = offline_equity(data=self.data, store=self.store)
+        pd.testing.assert_frame_equal(equity.trading_data, self.data, check_freq=False)
+        equity.yf_ticker.history.assert_not_called()
+        equity.refresh()
+        equity.yf_ticker.history.assert_called_once()
@@ -0,0 +1,81 @@
+import math
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from pandas_finance.streaming import EquityStream, RollingStats, RollingVWAP
+from pandas_finance.tests.common import make_trading_data, offline_equity
+
+
+class TestRollingStats(unittest.TestCase):
+    def test_matches_pandas(self):
+        values = pd.Series(np.random.RandomState(0).normal(0, 0.02, 200))
+        values[50] = np.nan
+        expected = values.rolling(20).std()
+        stats = RollingStats(20)
+        for i, value in enumerate(values):
+            stats.push(value)
+            if math.isnan(expected[i]):
+                self.assertTrue(math.isnan(stats.std))
+            else:
+                self.assertAlmostEqual(stats.std, expected[i], places=12)
+
+    def test_replace_last(self):
+        stats = RollingStats(3)
+        for value in [1.0, 2.0, 5.0]:
+            stats.push(value)
+        stats.replace_last(3.0)
+        self.assertAlmostEqual(stats.mean, 2.0)
+        self.assertAlmostEqual(stats.std, 1.0)
+
+
+class TestRollingVWAP(unittest.TestCase):
+    def test_window(self):
+        vwap = RollingVWAP(2)
+        vwap.push(10, 100)
+        vwap.push(20, 100)
+        vwap.push(30, 300)
+        self.assertAlmostEqual(vwap.vwap, 27.5)
+        vwap.replace_last(40, 100)
+        self.assertAlmostEqual(vwap.vwap, 30.0)
+
+
+class TestEquityStream(unittest.TestCase):
+    def setUp(self):
+        self.data = make_trading_data(300)
+        self.equity = offline_equity(data=self.data.iloc[:250])
+
+    def test_seed_matches_equity(self):
+        stream = self.equity.stream(days=20, vwap_days=30)
+        self.assertAlmostEqual(stream.hist_vol, self.equity.rolling_hist_vol(20).iloc[-1])
+        self.assertAlmostEqual(stream.vwap, self.equity.vwap(days=30))
+
+    def test_push_bars(self):
+        self.equity.stream(days=20, vwap_days=30)
+        for date, bar in self.data.iloc[250:].iterrows():
+            stream = self.equity.push(bar["Close"], bar["Volume"], date)
+        full = offline_equity(data=self.data)
+        self.assertAlmostEqual(stream.hist_vol, full.rolling_hist_vol(20).iloc[-1])
+        self.assertAlmostEqual(stream.vwap, full.vwap(days=30))
+        self.assertAlmostEqual(
+            stream.cumulative_return, self.data["Close"].iloc[-1] / self.data["Close"].iloc[0] - 1
+        )
+
+    def test_quote_revises_last_bar(self):
+        date = self.data.index[250]
+        bar = self.data.iloc[250]
+        self.equity.push(bar["Close"] * 1.5, bar["Volume"] / 2, date)
+        stream = self.equity.push(bar["Close"], bar["Volume"], date)
+        full = offline_equity(data=self.data.iloc[:251])
+        self.assertAlmostEqual(stream.hist_vol, full.rolling_hist_vol(20).iloc[-1])
+        self.assertAlmostEqual(stream.vwap, full.vwap(days=30))
+
+    def test_empty_stream(self):
+        stream = EquityStream(days=2, vwap_days=2)
+        self.assertTrue(math.isnan(stream.vwap))
+        stream.push(10, 1)
+        stream.push(11, 1)
+        stream.push(12, 1)
+        self.assertAlmostEqual(stream.cumulative_return, 0.2)
+        self.assertFalse(math.isnan(stream.hist_vol))
@@ -0,0 +1,146 @@
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from pandas_finance.surface import VolSurface
+from pandas_finance.tests.common import make_option_chain, offline_equity
+
+VALUATION_DATE = "2029-12-01"
+
+
+def skewed_chain():
+    "Chain whose vol falls with strike and differs by expiry."
+    frames = []
+    for expiry, base in (("2030-01-18", 0.4), ("2030-03-15", 0.3)):
+        for strike in np.arange(80.0, 121.0, 5.0):
+            vol = base - 0.002 * (strike - 100)
+            frames.append(
+                make_option_chain(
+                    expiries=pd.to_datetime([expiry]), strikes=[strike], vol=vol
+                )
+            )
+    return pd.concat(frames)
+
+
+class TestVolSurface(unittest.TestCase):
+    def setUp(self):
+        self.surface = VolSurface(valuation_date=VALUATION_DATE)
+
+    def test_flat_vol_recovered(self):
+        self.surface.update(make_option_chain(vol=0.3), 100.0)
+        vols = self.surface.vol([85.0, 100.0, 117.5], "2030-02-01")
+        np.testing.assert_allclose(vols, 0.3, atol=5e-3)
+        self.assertAlmostEqual(self.surface.vol_by_moneyness(0.0, 0.25), 0.3, 2)
+
+    def test_strike_and_moneyness_queries_agree(self):
+        self.surface.update(skewed_chain(), 100.0)
+        expiry = pd.Timestamp("2030-03-15")
+        tenor = (expiry - pd.Timestamp(VALUATION_DATE)).days / 365.0
+        self.assertAlmostEqual(
+            self.surface.vol(90.0, expiry),
+            self.surface.vol_by_moneyness(np.log(90.0 / 100.0), tenor),
+        )
+        self.assertAlmostEqual(self.surface.vol(90.0, expiry), 0.32, 2)
+        self.assertAlmostEqual(self.surface.vol(110.0, "2030-01-18"), 0.38, 2)
+
+    def test_interpolates_total_variance_and_extrapolates_flat(self):
+        self.surface.update(skewed_chain(), 100.0)
+        near, far = self.surface.vol(100.0, ["2030-01-18", "2030-03-15"])
+        middle = self.surface.vol(100.0, "2030-02-15")
+        self.assertTrue(far < middle < near)
+        self.assertAlmostEqual(self.surface.vol(100.0, "2031-01-01"), far)
+        self.assertAlmostEqual(
+            self.surface.vol(200.0, "2030-03-15"), self.surface.vol(120.0, "2030-03-15")
+        )
+
+    def test_vol_broadcasts(self):
+        self.surface.update(make_option_chain(), 100.0)
+        vols = self.surface.vol_by_moneyness([[-0.1], [0.1]], [0.1, 0.2, 0.3])
+        self.assertEqual(vols.shape, (2, 3))
+
+    def test_only_changed_expiries_refit(self):
+        chain = make_option_chain()
+        refit = self.surface.update(chain, 100.0)
+        self.assertEqual(len(refit), 3)
+        self.assertEqual(self.surface.update(chain, 100.0), [])
+
+        changed = chain.copy()
+        front = changed.index.get_level_values("Expiry") == pd.Timestamp("2030-01-18")
+        changed.loc[front, ["Bid", "Ask"]] += 0.1
+        with mock.patch.object(self.surface, "_fit", wraps=self.surface._fit) as fit:
+            refit = self.surface.update(changed, 100.0)
+        self.assertEqual(refit, [pd.Timestamp("2030-01-18")])
+        self.assertEqual(fit.call_count, 1)
+
+    def test_dropped_expiry_and_new_spot(self):
+        chain = make_option_chain()
+        self.surface.update(chain, 100.0)
+        last = chain.index.get_level_values("Expiry") == pd.Timestamp("2030-03-15")
+        self.assertEqual(self.surface.update(chain[~last], 100.0), [])
+        self.assertEqual(len(self.surface.expiries), 2)
+        # The chain's Underlying_Price, not the live spot, sets the fits.
+        self.assertEqual(self.surface.update(chain[~last], 101.0), [])
+        self.assertEqual(self.surface.spot, 101.0)
+        moved = chain[~last].copy()
+        front = moved.index.get_level_values("Expiry") == pd.Timestamp("2030-01-18")
+        moved.loc[front, "Underlying_Price"] = 101.0
+        self.assertEqual(
+            self.surface.update(moved, 101.0), [pd.Timestamp("2030-01-18")]
+        )
+        self.assertEqual(len(self.surface.update(moved, 101.0, 0.01)), 2)
+
+    def test_fits_against_chain_spot(self):
+        self.surface.update(make_option_chain(price=110.0, vol=0.3), 100.0)
+        self.assertAlmostEqual(self.surface.vol_by_moneyness(0.0, 0.25), 0.3, 2)
+
+    def test_spot_used_without_underlying_price(self):
+        chain = make_option_chain(vol=0.3).drop(columns="Underlying_Price")
+        self.assertEqual(len(self.surface.update(chain, 100.0)), 3)
+        np.testing.assert_allclose(
+            self.surface.vol([85.0, 100.0], "2030-02-01"), 0.3, atol=5e-3
+        )
+        self.assertEqual(self.surface.update(chain, 100.0), [])
+        self.assertEqual(len(self.surface.update(chain, 101.0)), 3)
+
+
+class TestOptionChainVolSurface(unittest.TestCase):
+    def setUp(self):
+        self.data = make_option_chain()
+        self.equity = offline_equity()
+        self.equity._cache.set("quotes", pd.Series({"price": 100.0}))
+        self.chain = self.equity.options
+        self.chain._pdr.get_all_data = mock.Mock(return_value=self.data)
+
+    def test_surface_cached_and_reused_after_refresh(self):
+        surface = self.chain.vol_surface(valuation_date=VALUATION_DATE)
+        self.assertAlmostEqual(surface.vol(100.0, "2030-02-15"), 0.3, 2)
+        with mock.patch.object(surface, "update") as update:
+            self.assertIs(
+                self.chain.vol_surface(valuation_date=VALUATION_DATE), surface
+            )
+            update.assert_not_called()
+
+        self.chain.invalidate()
+        with mock.patch.object(surface, "_fit", wraps=surface._fit) as fit:
+            self.assertIs(
+                self.chain.vol_surface(valuation_date=VALUATION_DATE), surface
+            )
+        fit.assert_not_called()
+        self.assertEqual(self.chain._pdr.get_all_data.call_count, 2)
+
+    def test_surface_kept_across_equity_memo_expiry(self):
+        surface = self.chain.vol_surface(valuation_date=VALUATION_DATE)
+        later = time.monotonic() + 2 * self.equity._cache.ttl
+        with mock.patch("time.monotonic", return_value=later):
+            self.equity._cache.set("quotes", pd.Series({"price": 100.0}))
+            self.assertIs(self.equity.options, self.chain)
+            with mock.patch.object(surface, "_fit", wraps=surface._fit) as fit:
+                self.assertIs(
+                    self.equity.options.vol_surface(valuation_date=VALUATION_DATE),
+                    surface,
+                )
+        fit.assert_not_called()
+        self.assertEqual(self.chain._pdr.get_all_data.call_count, 2)
@@ -0,0 +1,119 @@
+import email.utils
+import threading
+import time
+import unittest
+from unittest import mock
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+from pandas_finance.throttle import (
+    SingleFlight,
+    ThrottledAdapter,
+    TokenBucket,
+    _retry_after,
+)
+
+
+def response(status, headers=None):
+    result = requests.Response()
+    result.status_code = status
+    result.headers.update(headers or {})
+    result._content = b"{}"
+    result.raw = HTTPResponse(body=b"{}", status=status)
+    return result
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_error_shared_by_waiters(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        errors = []
+
+        def fail():
+            started.set()
+            time.sleep(0.1)
+            raise ValueError("boom")
+
+        def call():
+            try:
+                flight.do("k", fail)
+            except ValueError as exc:
+                errors.append(exc)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait()
+        follower = threading.Thread(target=call)
+        follower.start()
+        leader.join()
+        follower.join()
+        self.assertEqual(len(errors), 2)
+        self.assertIs(errors[0], errors[1])
+        # The key is free again once the call ends.
+        self.assertEqual(flight.do("k", lambda: 1), 1)
+
+    def test_reentrant_call_runs(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do("k", lambda: flight.do("k", lambda: 2) + 1), 3)
+
+
+class TestThrottledAdapter(unittest.TestCase):
+    def setUp(self):
+        self.request = requests.Request(
+            "GET", "https://query1.finance.yahoo.com/v7/finance/quote"
+        ).prepare()
+
+    def test_retries_after_429(self):
+        adapter = ThrottledAdapter(rate=1000, backoff=0.01)
+        replies = [response(429), response(429, {"Retry-After": "0.05"}), response(200)]
+        start = time.monotonic()
+        with mock.patch.object(HTTPAdapter, "send", side_effect=replies) as send:
+            result = adapter.send(self.request)
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(send.call_count, 3)
+        self.assertGreaterEqual(time.monotonic() - start, 0.06)
+
+    def test_malformed_retry_after_backs_off(self):
+        adapter = ThrottledAdapter(rate=1000, backoff=0.01)
+        replies = [response(429, {"Retry-After": "soon"}), response(200)]
+        with mock.patch.object(HTTPAdapter, "send", side_effect=replies):
+            self.assertEqual(adapter.send(self.request).status_code, 200)
+
+    def test_retry_after_dates(self):
+        self.assertIsNone(_retry_after(response(429, {"Retry-After": "soon"})))
+        # A -0000 zone parses to a naive datetime.
+        past = {"Retry-After": "Wed, 21 Oct 2015 07:28:00 -0000"}
+        self.assertEqual(_retry_after(response(429, past)), 0.0)
+        soon = email.utils.formatdate(time.time() + 30, usegmt=True)
+        wait = _retry_after(response(429, {"Retry-After": soon}))
+        self.assertGreater(wait, 25)
+        self.assertLessEqual(wait, 30)
+
+    def test_gives_up_after_retries(self):
+        adapter = ThrottledAdapter(rate=1000, retries=1, backoff=0.01)
+        with mock.patch.object(HTTPAdapter, "send", side_effect=[response(429)] * 2):
+            self.assertEqual(adapter.send(self.request).status_code, 429)
+
+    def test_rate_per_host(self):
+        adapter = ThrottledAdapter(rate=20)
+        other = requests.Request("GET", "https://query2.finance.yahoo.com/").prepare()
+        start = time.monotonic()
+        with mock.patch.object(HTTPAdapter, "send", return_value=response(200)):
+            for _ in range(25):
+                adapter.send(self.request)
+            adapter.send(other)
+        # 20 in the first burst, then 5 more at 20 per second.
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+        self.assertEqual(
+            set(adapter._buckets),
+            {"query1.finance.yahoo.com", "query2.finance.yahoo.com"},
+        )
+
+
+class TestTokenBucketPause(unittest.TestCase):
+    def test_pause(self):
+        bucket = TokenBucket(rate=10, capacity=5)
+        bucket.pause(0.5)
+        self.assertAlmostEqual(bucket.reserve(), 0.6, places=2)
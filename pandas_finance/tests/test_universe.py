@@ -0,0 +1,216 @@
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from pandas_finance import EquityUniverse
+from pandas_finance.tests.common import (
+    fake_session,
+    make_trading_data,
+    offline_universe,
+    quote_route,
+)
+
+
+class TestEquityUniverse(unittest.TestCase):
+    def setUp(self):
+        self.session, self.adapter = fake_session({"/v7/finance/quote": quote_route})
+        self.tickers = ["T%d" % i for i in range(450)]
+        self.universe = EquityUniverse(self.tickers, session=self.session, crumb="c")
+
+    def test_quotes_batched(self):
+        quotes = self.universe.quotes
+        self.assertIsInstance(quotes, pd.DataFrame)
+        self.assertEqual(list(quotes.index), self.tickers)
+        self.assertEqual(len(self.adapter.requests), 3)
+
+    @mock.patch("pandas_finance.quotes.QUOTE_BATCH_SIZE", 1000)
+    def test_quotes_single_request(self):
+        self.universe.quotes
+        self.assertEqual(len(self.adapter.requests), 1)
+
+    def test_equities_read_shared_snapshot(self):
+        quotes = self.universe.quotes
+        n_requests = len(self.adapter.requests)
+        equity = self.universe["T5"]
+        self.assertEqual(equity.price, quotes.loc["T5", "price"])
+        self.assertEqual(equity.market_cap, quotes.loc["T5", "marketCap"])
+        self.assertEqual(equity.annual_dividend, 0)
+        self.assertEqual(len(self.adapter.requests), n_requests)
+
+    def test_equity_quotes_single(self):
+        quotes = self.universe["T1"].quotes
+        self.assertIsInstance(quotes, pd.Series)
+        self.assertEqual(quotes["longName"], "T1 Inc.")
+
+    def test_duplicates_dropped(self):
+        universe = EquityUniverse(["A", "B", "A"], session=self.session)
+        self.assertEqual(universe.tickers, ["A", "B"])
+        self.assertEqual(len(universe), 2)
+
+
+class TestPanelAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.universe, _ = offline_universe(["A", "B", "C"])
+        # Give one ticker a shorter, later starting history.
+        self.universe["C"].yf_ticker.history.return_value = make_trading_data(
+            seed=7
+        ).iloc[100:]
+        # And one missing dates the others have, e.g. trading halts.
+        history = make_trading_data(seed=1)
+        self.universe["B"].yf_ticker.history.return_value = history.drop(
+            history.index[[280, 290, 470, 490]]
+        )
+        self.end_date = self.universe["A"].returns.index[300]
+
+    def assert_matches(self, result, method, *args, **kwargs):
+        for equity in self.universe:
+            expected = getattr(equity, method)(*args, **kwargs)
+            self.assertAlmostEqual(result[equity.ticker], expected, places=10)
+
+    def test_returns_aligned(self):
+        returns = self.universe.returns
+        self.assertEqual(list(returns.columns), ["A", "B", "C"])
+        self.assertTrue(returns["C"].iloc[:101].isnull().all())
+        self.assertFalse(returns["C"].iloc[101:].isnull().any())
+
+    def test_hist_vol(self):
+        self.assert_matches(self.universe.hist_vol(30), "hist_vol", 30)
+        self.assert_matches(
+            self.universe.hist_vol(30, self.end_date), "hist_vol", 30, self.end_date
+        )
+
+    def test_rolling_hist_vol(self):
+        result = self.universe.rolling_hist_vol(20)
+        for ticker in ("B", "C"):
+            pd.testing.assert_series_equal(
+                result[ticker].dropna(),
+                self.universe[ticker].rolling_hist_vol(20).dropna(),
+                check_names=False,
+            )
+
+    def test_vwap(self):
+        self.assert_matches(self.universe.vwap(days=30), "vwap", days=30)
+        self.assert_matches(self.universe.vwap(self.end_date), "vwap", self.end_date)
+
+    def test_hist_vol_by_days(self):
+        result = self.universe.hist_vol_by_days(min_days=10, max_days=50)
+        self.assertEqual(result.shape, (40, 3))
+        for ticker in ("A", "B"):
+            pd.testing.assert_series_equal(
+                result[ticker], self.universe[ticker].hist_vol_by_days(None, 10, 50),
+                check_names=False,
+            )
+        result = self.universe.hist_vol_by_days(self.end_date, 10, 50)
+        pd.testing.assert_series_equal(
+            result["B"], self.universe["B"].hist_vol_by_days(self.end_date, 10, 50),
+            check_names=False,
+        )
+
+    @mock.patch("yfinance.Ticker")
+    def test_alpha_beta(self, ticker):
+        ticker.return_value.history.return_value = make_trading_data(seed=99)
+        result = self.universe.alpha_beta("SPY")
+        self.assertEqual(list(result.columns), ["alpha", "beta"])
+        for equity in self.universe:
+            expected = equity.alpha_beta("SPY", start=self.end_date)
+            actual = self.universe.alpha_beta("SPY", start=self.end_date).loc[equity.ticker]
+            np.testing.assert_allclose(actual, expected, rtol=1e-10)
+        pd.testing.assert_series_equal(
+            self.universe.beta("SPY"), result["beta"], check_names=False
+        )
+
+
+def exchange_history(seed=0):
+    "make_trading_data on the exchange time zone, as yf.Ticker.history returns."
+    return make_trading_data(seed=seed).tz_localize("America/New_York")
+
+
+def bulk_download(tickers, start=None, ignore_tz=True, **kwargs):
+    "Stands in for yf.download: (field, ticker) columns on a union index."
+    frames = [exchange_history(seed) for seed, _ in enumerate(tickers)]
+    if ignore_tz:
+        # yf.download drops the time zone of daily bars by default.
+        frames = [frame.tz_localize(None) for frame in frames]
+    # The last ticker listed later than the others.
+    frames[-1] = frames[-1].iloc[100:]
+    wide = pd.concat(frames, axis=1, keys=tickers).swaplevel(axis=1)
+    wide.columns.names = ["Price", "Ticker"]
+    return wide.sort_index(axis=1)
+
+
+class TestDownload(unittest.TestCase):
+    def setUp(self):
+        self.tickers = ["A", "B", "C"]
+        self.universe, _ = offline_universe(self.tickers)
+        patcher = mock.patch("yfinance.download", side_effect=bulk_download)
+        self.download = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_one_call_primes_every_equity(self):
+        wide = self.universe.download()
+        self.assertEqual(self.download.call_count, 1)
+        self.assertEqual(list(self.download.call_args[0][0]), self.tickers)
+        expected = bulk_download(self.tickers, ignore_tz=False)
+        for equity in self.universe:
+            history = equity.trading_data
+            self.assertEqual(list(history.columns), list(make_trading_data().columns))
+            pd.testing.assert_frame_equal(
+                history,
+                expected.xs(equity.ticker, axis=1, level=1)
+                .dropna(subset=["Close"])
+                .reindex(columns=history.columns),
+                check_names=False,
+                check_freq=False,
+            )
+            equity.yf_ticker.history.assert_not_called()
+        # Histories are views on the one wide index, not copies of it.
+        index = self.universe["A"].trading_data.index
+        self.assertTrue(np.shares_memory(index.asi8, wide.index.asi8))
+        self.assertEqual(len(self.universe["C"].trading_data), 400)
+
+    def test_float32(self):
+        wide = self.universe.download(float32=True)
+        self.assertTrue((wide.dtypes == np.float32).all())
+        self.assertEqual(self.universe["B"].close.dtype, np.float32)
+
+    def test_panels_rebuilt(self):
+        before = self.universe.close
+        self.universe.download()
+        self.assertIsNot(self.universe.close, before)
+
+    def test_missing_ticker_loads_alone(self):
+        self.download.side_effect = lambda tickers, **kwargs: bulk_download(tickers[:2])
+        self.universe.download()
+        self.universe["C"].trading_data
+        self.universe["C"].yf_ticker.history.assert_called_once()
+
+    def test_store_updated(self):
+        with tempfile.TemporaryDirectory() as path:
+            universe, _ = offline_universe(self.tickers, store=path)
+            universe.download()
+            self.assertIn("B", universe["B"]._store)
+            self.assertEqual(len(universe["B"]._store.read("B")), 500)
+
+    def test_store_with_history_updated(self):
+        with tempfile.TemporaryDirectory() as path:
+            universe, _ = offline_universe(self.tickers, store=path)
+            for seed, equity in enumerate(universe):
+                history = exchange_history(seed).iloc[:300]
+                equity.yf_ticker.history.return_value = history
+                equity.trading_data
+            universe, _ = offline_universe(self.tickers, store=path)
+            universe.download()
+            self.assertEqual(len(universe["B"]._store.read("B")), 500)
+            self.assertEqual(len(universe["B"].trading_data), 500)
+
+    @mock.patch("yfinance.Ticker")
+    def test_alpha_beta_against_ticker_history(self, ticker):
+        ticker.return_value.history.return_value = exchange_history(seed=0)
+        self.universe.download()
+        beta = self.universe.beta("SPY")
+        # A's history is SPY's.
+        self.assertAlmostEqual(beta["A"], 1.0)
+        self.assertTrue((beta != 0).all())
@@ -0,0 +1,157 @@
+import datetime
+import email.utils
+import threading
+import time
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+HOST_RATE = 10
+RETRIES = 3
+BACKOFF = 0.5
+TOO_MANY_REQUESTS = 429
+
+
+class TokenBucket(object):
+    """Thread-safe token bucket refilled at ``rate`` tokens per second.
+
+    ``capacity`` bounds the burst size and defaults to one second's worth
+    of tokens.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        "Takes tokens and returns how many seconds the caller must wait first."
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens=1):
+        "Blocks until tokens are available."
+        wait = self.reserve(tokens)
+        if wait:
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        "Hands out no tokens for the next ``seconds``, e.g. after a 429."
+        with self._lock:
+            self._tokens = min(self._tokens, 0) - seconds * self.rate
+
+
+class _Call(object):
+    def __init__(self):
+        self.owner = threading.get_ident()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Runs one call per key at a time; concurrent callers share its result.
+
+    ``do(key, func)`` calls func unless another thread is already running
+    the same key, in which case it waits for that call and returns its
+    result (or raises its exception). A thread calling ``do`` again for a
+    key it is running calls func itself instead of waiting on itself.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                leader = False
+        if not leader:
+            if call.owner == threading.get_ident():
+                return func()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+def _retry_after(response):
+    "Seconds asked for by a Retry-After header, or None."
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        # Malformed: fall back to the exponential backoff.
+        return None
+    if date.tzinfo is None:
+        # HTTP dates are GMT.
+        date = date.replace(tzinfo=datetime.timezone.utc)
+    return max(date.timestamp() - time.time(), 0.0)
+
+
+class ThrottledAdapter(HTTPAdapter):
+    """HTTPAdapter sending at most ``rate`` requests per second to each host.
+
+    A 429 response pauses that host for its Retry-After, or an exponential
+    backoff from ``backoff`` seconds, and is retried up to ``retries``
+    times. Only requests that reach the network pass through the adapter,
+    so cached responses are not rate limited.
+    """
+
+    def __init__(self, rate=HOST_RATE, retries=RETRIES, backoff=BACKOFF, **kwargs):
+        super(ThrottledAdapter, self).__init__(**kwargs)
+        self.rate = rate
+        self.retries = retries
+        self.backoff = backoff
+        self._buckets = {}
+        self._buckets_lock = threading.Lock()
+
+    def bucket(self, host):
+        with self._buckets_lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate)
+            return self._buckets[host]
+
+    def send(self, request, **kwargs):
+        bucket = self.bucket(urlsplit(request.url).netloc)
+        for attempt in range(self.retries + 1):
+            bucket.acquire()
+            response = super(ThrottledAdapter, self).send(request, **kwargs)
+            if response.status_code != TOO_MANY_REQUESTS or attempt == self.retries:
+                return response
+            delay = _retry_after(response)
+            if delay is None:
+                delay = self.backoff * 2**attempt
+            response.close()
+            # Every thread sending to this host waits, not just this one.
+            bucket.pause(delay)
@@ -0,0 +1,235 @@
+from collections import OrderedDict
+import math
+
+import numpy as np
+import pandas as pd
+
+from .analytics import TRADING_DAYS, hist_vol_by_days, rolling_hist_vol, trailing
+from .api import HISTORY_TTL, START_DATE, Equity
+from .cache import TTLCache
+from .store import PriceStore
+
+# Column order of yf.Ticker.history, which bulk downloads are split into.
+HISTORY_COLUMNS = (
+    "Open",
+    "High",
+    "Low",
+    "Close",
+    "Adj Close",
+    "Volume",
+    "Dividends",
+    "Stock Splits",
+)
+
+
+def _ticker_history(wide, ticker):
+    "One ticker's bars from a (field, ticker) frame, on the shared index."
+    frame = wide.xs(ticker, axis=1, level=1)
+    frame = frame[[name for name in HISTORY_COLUMNS if name in frame.columns]]
+    frame.columns.name = None
+    # The wide index is the union of every ticker's dates.
+    traded = frame["Close"].notna().to_numpy()
+    return frame if traded.all() else frame[traded]
+
+
+class EquityUniverse(object):
+    """A group of Equity objects that share one session and fetch in bulk."""
+
+    def __init__(self, tickers, session=None, crumb=None, store=None, compact=False):
+        if isinstance(store, str):
+            store = PriceStore(store)
+        self.equities = OrderedDict(
+            (
+                ticker,
+                Equity(
+                    ticker, session=session, crumb=crumb, store=store, compact=compact
+                ),
+            )
+            for ticker in OrderedDict.fromkeys(tickers)
+        )
+        self._cache = TTLCache(HISTORY_TTL)
+
+    @property
+    def tickers(self):
+        return list(self.equities)
+
+    def __getitem__(self, ticker):
+        return self.equities[ticker]
+
+    def __iter__(self):
+        return iter(self.equities.values())
+
+    def __len__(self):
+        return len(self.equities)
+
+    def memory_usage(self):
+        """Bytes held by each Equity's memoized values, one column per ticker.
+
+        Compact Equities share their date index, so the ``index`` row
+        overstates the total.
+        """
+        usage = pd.concat([equity.memory_usage() for equity in self], axis=1)
+        return usage.fillna(0).astype("int64")
+
+    def invalidate(self):
+        "Drops the aligned panels and every Equity's memoized data."
+        self._cache.invalidate()
+        for equity in self:
+            equity.invalidate()
+
+    @property
+    def quotes(self):
+        """Returns quotes for every ticker, indexed by symbol.
+
+        Symbols are requested in chunks of ``QUOTE_BATCH_SIZE`` and each
+        Equity's ``quotes`` is primed from the result, so ``price``,
+        ``market_cap`` etc. read from the same snapshot.
+        """
+        first = next(iter(self))
+        quotes = first._quotes_reader(self.tickers).read()
+        for ticker, row in quotes.iterrows():
+            if ticker in self.equities:
+                equity = self.equities[ticker]
+                equity._cache.set("quotes", row.dropna().rename(None))
+                equity._cache.invalidate("snapshot")
+        return quotes
+
+    def download(self, start=START_DATE, float32=False, threads=True):
+        """Downloads the price history of every ticker in one batched call.
+
+        Uses ``yf.download``, which fetches on yfinance's own threads, and
+        primes each Equity's ``trading_data`` (and PriceStore) with its
+        slice, so per-ticker analytics need no further requests. Tickers
+        Yahoo has no data for are left to load on their own.
+
+        Returns the wide frame, one column per (field, ticker) on a single
+        shared DatetimeIndex. With ``float32`` the frame, and every Equity's
+        history sliced from it, is stored in single precision.
+        """
+        wide = self._download(start, threads)
+        if float32:
+            wide = wide.astype(np.float32)
+        for ticker, equity in self.equities.items():
+            if ticker in wide.columns.get_level_values(1):
+                history = _ticker_history(wide, ticker)
+                if len(history):
+                    equity._prime_history(history)
+        self._cache.invalidate()
+        return wide
+
+    def _download(self, start, threads):
+        first = next(iter(self))
+        if getattr(first._session, "ticker", None):
+            # Sessions that serve history themselves (see replay) do not go
+            # through yf.download.
+            frames = [equity._fetch_history(start) for equity in self]
+            wide = pd.concat(frames, axis=1, keys=self.tickers)
+            return wide.swaplevel(axis=1)
+        import yfinance as yf
+
+        return yf.download(
+            self.tickers,
+            start=start,
+            actions=True,
+            # Like Equity._fetch_history: adj_close is computed locally.
+            auto_adjust=False,
+            # Keep the exchange time zone of Ticker.history, which stored
+            # and benchmark histories are compared against.
+            ignore_tz=False,
+            threads=threads,
+            group_by="column",
+            progress=False,
+            multi_level_index=True,
+        )
+
+    def _panel(self, key, getter):
+        def load():
+            return pd.concat([getter(e) for e in self], axis=1, keys=self.tickers)
+
+        return self._cache.get(key, load)
+
+    @property
+    def returns(self):
+        "Daily returns of every ticker, one column each on a shared date index."
+        return self._panel("returns", lambda equity: equity.returns)
+
+    @property
+    def close(self):
+        return self._panel("close", lambda equity: equity.close)
+
+    @property
+    def volume(self):
+        return self._panel("volume", lambda equity: equity.trading_data["Volume"])
+
+    def hist_vol(self, days, end_date=None):
+        """Annualized vol over each ticker's last ``days`` returns.
+
+        Windows count each ticker's own bars, not rows of the shared date
+        index, so tickers missing dates match ``Equity.hist_vol``.
+        """
+        days = int(days)
+        data = self.returns[:end_date] if end_date else self.returns
+        return trailing(data, days).std() * math.sqrt(TRADING_DAYS)
+
+    def rolling_hist_vol(self, days, end_date=None):
+        days = int(days)
+        data = self.returns[:end_date] if end_date else self.returns
+        return rolling_hist_vol(data, days)
+
+    def hist_vol_by_days(self, end_date=None, min_days=10, max_days=600):
+        "Returns a days x ticker frame of historical vols ending on end_date."
+        data = self.returns[:end_date] if end_date else self.returns
+        return hist_vol_by_days(data, min_days, max_days, skipna=True)
+
+    def vwap(self, end_date=None, days=30):
+        days = int(days)
+        close, volume = self.close, self.volume
+        if end_date:
+            close, volume = close[:end_date], volume[:end_date]
+        bars = close.notna()
+        close = trailing(close, days, bars).to_numpy(dtype=float)
+        volume = trailing(volume, days, bars).to_numpy(dtype=float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            vwap = np.nansum(close * volume, axis=0) / np.nansum(volume, axis=0)
+        return pd.Series(vwap, index=self.tickers)
+
+    def parallel(self, processes=None):
+        """Returns a ParallelAnalytics over this universe's returns.
+
+        It runs hist_vol, rolling_hist_vol, hist_vol_by_days and alpha_beta
+        on a pool of ``processes`` workers, sharing the returns panel
+        through shared memory. Close it (or use it in a with block) when
+        done.
+        """
+        from .parallel import ParallelAnalytics
+
+        return ParallelAnalytics(
+            self.returns, processes, next(iter(self))._index_returns
+        )
+
+    def alpha_beta(self, index, start=None, end=None):
+        """Returns alpha and beta of every ticker against index.
+
+        Matches Equity.alpha_beta column by column, with one regression over
+        the whole returns matrix instead of one per ticker.
+        """
+        index_rets = next(iter(self))._index_returns(index)
+        data = self.returns.reindex(index_rets.index).fillna(0)
+        index_rets = index_rets.fillna(0)
+        if start:
+            data, index_rets = data[start:], index_rets[start:]
+        if end:
+            data, index_rets = data[:end], index_rets[:end]
+
+        import empyrical
+
+        result = empyrical.alpha_beta_aligned(
+            data.to_numpy(dtype=float), index_rets.to_numpy(dtype=float)[:, np.newaxis]
+        )
+        return pd.DataFrame(result, index=self.tickers, columns=["alpha", "beta"])
+
+    def beta(self, index, start=None, end=None):
+        return self.alpha_beta(index, start, end)["beta"]
+
+    def alpha(self, index, start=None, end=None):
+        return self.alpha_beta(index, start, end)["alpha"]